@@ -1,11 +1,36 @@
 import argparse
-
-from pytoolbelt.cli.parsers import format, init, installed, ptvenv, release, releases, test, tool, toolbelt
+import importlib
+import sys
+from typing import List, Optional
 
 __version__ = "0.6.5"
 
+# the parser module of a command is only imported when that command runs, as the parser modules
+# pull in the controllers and their dependencies (GitPython, docker, rich, jinja2, pydantic...).
+COMMANDS = {
+    "bench": "Benchmark the startup time of pytoolbelt and installed tools.",
+    "format": "Format tools in a pytoolbelt.",
+    "init": "Initialize .pytoolbelt home directory",
+    "installed": "See installed components from any pytoolbelt",
+    "ptvenv": "Interact with pytoolbelt venv",
+    "release": "Make releases for a pytoolbelt.",
+    "releases": "See Releases for a configured pytoolbelt.",
+    "test": "Interact with pytoolbelt tests",
+    "tool": "Interact with pytoolbelt tools",
+    "toolbelt": "Interact with the pytoolbelt toolbelt config.",
+}
+
+
+def get_command(argv: List[str]) -> Optional[str]:
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg
+    return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    argv = sys.argv[1:] if argv is None else argv
 
-def parse_args():
     parser = argparse.ArgumentParser()
 
     parser.add_argument("--version", action="version", version=f"pytoolbelt :: Version :: {__version__}")
@@ -13,10 +38,13 @@ def parse_args():
     sub_parsers = parser.add_subparsers(dest="command")
     sub_parsers.required = True
 
-    commands = [ptvenv, toolbelt, tool, init, releases, installed, release, format, test]
-    commands.sort(key=lambda x: x.__name__)
+    command = get_command(argv)
 
-    for command in commands:
-        command.configure_parser(sub_parsers)
+    # every other command gets a stub parser, so that it is still listed in --help
+    for name in sorted(COMMANDS):
+        if name == command:
+            importlib.import_module(f"pytoolbelt.cli.parsers.{name}").configure_parser(sub_parsers)
+        else:
+            sub_parsers.add_parser(name, help=COMMANDS[name])
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
@@ -0,0 +1,126 @@
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from pytoolbelt.cli import COMMANDS
+from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
+from pytoolbelt.cli.views.benchmark_view import (
+    BenchmarkComparisonTableView,
+    BenchmarkTableView,
+)
+from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
+from pytoolbelt.core.project.tool_components import (
+    ToolInstaller,
+    ToolPaths,
+    ToolTemplater,
+)
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.tools.benchmark import (
+    BenchmarkResult,
+    benchmark_command,
+    compare_to_baseline,
+    load_baseline,
+    results_to_json,
+)
+from pytoolbelt.environment.config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BenchParameters(BaseEntrypointParameters):
+    runs: int
+    output: Optional[str]
+    baseline: Optional[str]
+    threshold: float
+
+
+COMMON_FLAGS = {
+    "--runs": {
+        "help": "Number of warm runs to time after the cold run of each benchmark.",
+        "type": int,
+        "default": 10,
+    },
+    "--output": {
+        "help": "Write the results as JSON to this file, for example to use as a baseline later.",
+        "required": False,
+    },
+    "--baseline": {
+        "help": "JSON results file to compare the results to. Exits with 1 if a benchmark regressed.",
+        "required": False,
+    },
+    "--threshold": {
+        "help": "Allowed slowdown of the median time compared to the baseline, in percent.",
+        "type": float,
+        "default": 20.0,
+    },
+}
+
+
+class BenchController:
+    SAMPLE_TOOL_NAME = "benchtool"
+
+    def __init__(self, runs: int) -> None:
+        self.runs = runs
+
+    @staticmethod
+    def cli_commands() -> List[List[str]]:
+        commands = [["--version"]]
+        commands.extend([command, "--help"] for command in sorted(COMMANDS))
+        return commands
+
+    def bench_cli(self) -> List[BenchmarkResult]:
+        results = []
+        for args in self.cli_commands():
+            name = f"pytoolbelt {' '.join(args)}"
+            logger.debug(f"Benchmarking {name}")
+            results.append(benchmark_command(name, [sys.executable, "-m", "pytoolbelt", *args], self.runs))
+        return results
+
+    def bench_tools(self) -> List[BenchmarkResult]:
+        """
+        used to time the startup of a freshly templated tool in every install mode. The tool runs with the
+        interpreter of pytoolbelt, so the results do not depend on any toolbelt or installed ptvenv.
+        Returns: a BenchmarkResult per install mode
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            meta = ComponentMetadata(self.SAMPLE_TOOL_NAME, "0.0.1", "tool")
+            paths = ToolPaths(meta, ToolbeltPaths(Path(tmp_dir)))
+            paths.create()
+            ToolTemplater(paths).template_new_tool_files()
+
+            results = ToolInstaller(paths).benchmark(sys.executable, ["--help"], self.runs)
+
+        for result in results:
+            result.name = f"tool {result.name}"
+        return results
+
+    def bench(self, output: Optional[str], baseline: Optional[str], threshold: float) -> int:
+        logger.info(f"Running startup benchmarks with {self.runs} warm runs each...")
+        results = [*self.bench_cli(), *self.bench_tools()]
+
+        table = BenchmarkTableView(title=f"pytoolbelt startup benchmarks ({self.runs} warm runs)")
+        for result in results:
+            table.add_row(result)
+        table.print_table()
+
+        if output:
+            Path(output).write_text(results_to_json(results, self.runs))
+            logger.info(f"Benchmark results written to {output}")
+
+        if not baseline:
+            return 0
+
+        comparisons = compare_to_baseline(results, load_baseline(Path(baseline)), threshold)
+        comparison_table = BenchmarkComparisonTableView(title=f"Compared to {baseline} (threshold {threshold:.0f}%)")
+        for comparison in comparisons:
+            comparison_table.add_row(comparison)
+        comparison_table.print_table()
+
+        regressed = [comparison.name for comparison in comparisons if comparison.regressed]
+        if regressed:
+            logger.info(f"{len(regressed)} benchmarks regressed :: {', '.join(regressed)}")
+            return 1
+        return 0
@@ -0,0 +1,32 @@
+from pytoolbelt.cli.views.cache_views import WheelCacheTableView
+from pytoolbelt.core.tools.dedup_store import DedupStore
+from pytoolbelt.core.tools.wheel_cache import WheelCache
+from pytoolbelt.environment.config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheController:
+    def __init__(self) -> None:
+        self.wheel_cache = WheelCache()
+        self.dedup_store = DedupStore()
+
+    def stats(self) -> int:
+        entries = self.wheel_cache.entries()
+        table = WheelCacheTableView(self.wheel_cache, entries)
+        for entry in entries:
+            table.add_row(entry)
+        table.print_table()
+        return 0
+
+    def prune(self, _all: bool) -> int:
+        max_size = 0 if _all else None
+        evicted = self.wheel_cache.prune(max_size=max_size)
+        freed = sum(entry.size for entry in evicted)
+        logger.info(f"Evicted {len(evicted)} wheel cache entries, freed {freed / (1024 * 1024):.1f} MB.")
+        return 0
+
+    def gc(self) -> int:
+        result = self.dedup_store.gc()
+        logger.info(f"Removed {result.files} unreferenced dedup pool entries, freed {result.saved / (1024 * 1024):.1f} MB.")
+        return 0
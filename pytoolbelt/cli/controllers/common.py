@@ -30,7 +30,7 @@ def release(
 
     # first fetch all remote tags if we don't have them
     print("Fetching remote tags...")
-    git_client.fetch_remote_tags()
+    git_client.fetch_remote_tags(ttl=0)
 
     # run all the checks to ensure we can release
     print("checking git release requirements...")
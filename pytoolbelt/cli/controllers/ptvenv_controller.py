@@ -1,21 +1,27 @@
 import shutil
+from typing import List, Optional
 
 from semver import Version
 
 from pytoolbelt.cli.controllers.common import release
+from pytoolbelt.cli.views.batch_view import BatchSummaryTableView
 from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
 from pytoolbelt.core.data_classes.pytoolbelt_config import PytoolbeltConfig
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
-from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.error_handling.exceptions import PtVenvUpToDateError, PytoolbeltError
 from pytoolbelt.core.project.ptvenv_components import (
     PtVenvBuilder,
     PtVenvConfig,
     PtVenvPaths,
     PtVenvTemplater,
 )
+from pytoolbelt.core.project.ptvenv_lock import PtVenvLock
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
-from pytoolbelt.core.tools import hash_config
+from pytoolbelt.core.tools import hash_config, timed
+from pytoolbelt.core.tools.batch import BatchResult, BatchTask, run_batch
 from pytoolbelt.core.tools.git_client import TemporaryGitClient
+from pytoolbelt.core.tools.installers import get_installer
+from pytoolbelt.core.tools.wheel_cache import WheelCache
 from pytoolbelt.environment.config import get_logger
 
 logger = get_logger(__name__)
@@ -89,8 +95,8 @@ class PtVenvController:
     def get_templater(self) -> PtVenvTemplater:
         return PtVenvTemplater(self.ptvenv_paths)
 
-    def get_builder(self) -> PtVenvBuilder:
-        return PtVenvBuilder(self.ptvenv_paths)
+    def get_builder(self, installer: str = "pip") -> PtVenvBuilder:
+        return PtVenvBuilder(self.ptvenv_paths, installer=get_installer(installer))
 
     def create(self, ptc: PytoolbeltConfig) -> int:
         self.toolbelt_paths.raise_if_not_pytoolbelt_project()
@@ -100,38 +106,35 @@ class PtVenvController:
         logger.info(f"Ptvenv {self.meta.name} created in toolbelt {self.toolbelt.name} at {self.ptvenv_paths.ptvenv_dir}.")
         return 0
 
-    def build(self, force: bool, from_config: bool) -> int:
+    def build(self, force: bool, from_config: bool, incremental: bool = False, installer: str = "pip") -> int:
         # TODO: This can be DRYed out with the tool controller...
 
         logger.info(f"Building {self.meta.name} version {self.meta.version} in {self.toolbelt.name}.")
 
+        # if we are installing from file and not forcing, then check if the installation can proceed
+        # otherwise, just run the builder and install what is in the file. No release is exported in this case.
+        if from_config:
+            # only check the config / installed hash if we are not forcing the build
+            if not force:
+                ptvenv_config = PtVenvConfig.from_file(self.ptvenv_paths.ptvenv_config_file)
+                self.installation_can_proceed(ptvenv_config, self.ptvenv_paths.read_lock())
+
+            # run the builder for this ptvenv
+            self.get_builder(installer).build(incremental=incremental)
+            return 0
+
         with TemporaryGitClient(self.toolbelt.path, self.toolbelt.name) as (
-            repo_path,
+            tmp_repo,
             git_client,
         ):
-            logger.debug(f"toolbelt copied to temp dir:  {repo_path.tmp_dir}")
-
-            # if we have uncommitted changes and are not installing from the file, raise an error
-            if not from_config and not force:
+            # if we have uncommitted changes in the toolbelt and are not forcing, raise an error
+            if not force:
                 git_client.raise_if_uncommitted_changes()
 
-            # if we are installing from file and not forcing, then check if the installation can proceed
-            # otherwise, just run the builder and install what is in the file.
-            if from_config:
-                # only check the config / installed hash if we are not forcing the build
-                if not force:
-                    ptvenv_config = PtVenvConfig.from_file(self.ptvenv_paths.ptvenv_config_file)
-                    self._installation_can_proceed(ptvenv_config)
-
-                # run the builder for this ptvenv
-                self.get_builder().build()
-                return 0
-
-            # if we did not pass in a version in the cli, and we are not installing from file, this means
-            # we need to get the latest release from the repo, and create the metadata.
-            elif self.ptvenv_paths.meta.is_latest_version:
-                tags = git_client.ptvenv_releases(name=self.meta.name, as_names=True)
-                latest_meta = ComponentMetadata.get_latest_release(tags)
+            # if we did not pass in a version in the cli, this means we need to get
+            # the latest release from the repo, and create the metadata.
+            if self.ptvenv_paths.meta.is_latest_version:
+                latest_meta = git_client.latest_release("ptvenv", self.meta.name)
 
             # in all other cases, this means we passed in a version in the cli,
             # so just go with whatever was passed in.
@@ -145,33 +148,38 @@ class PtVenvController:
             except IndexError:
                 raise PytoolbeltError(f"Version {self.meta.version} not found in the repository.")
 
-            # check out from the release tag in the temp repo
-            logger.debug(f"Checking out tag {tag_reference}")
-            git_client.checkout_tag(tag_reference)
-
-            # create new paths and builder pointed to the temp repo
-            tmp_project_paths = ToolbeltPaths(repo_path.tmp_dir)
+            # export only the ptvenv definition at the release tag to the temp dir
+            logger.debug(f"Exporting ptvenv/{latest_meta.name} at tag {tag_reference}")
+            tmp_project_paths = ToolbeltPaths(tmp_repo.export(tag_reference, [f"ptvenv/{latest_meta.name}"]))
             tmp_paths = PtVenvPaths(latest_meta, tmp_project_paths)
 
             if not force:
                 tmp_ptvenv_config = PtVenvConfig.from_file(tmp_paths.ptvenv_config_file)
-                self._installation_can_proceed(tmp_ptvenv_config)
+                self.installation_can_proceed(tmp_ptvenv_config, tmp_paths.read_lock())
 
-            tmp_builder = PtVenvBuilder(tmp_paths)
+            tmp_builder = PtVenvBuilder(tmp_paths, installer=get_installer(installer))
             logger.info(f"Building {latest_meta.name} version {latest_meta.version} in {self.toolbelt.name}.")
-            tmp_builder.build()
+            tmp_builder.build(incremental=incremental)
             logger.info(f"Built {latest_meta.name} version {latest_meta.version} in {self.toolbelt.name} successfully.")
             return 0
 
-    def _installation_can_proceed(self, current_config: PtVenvConfig) -> None:
+    def installation_can_proceed(self, current_config: PtVenvConfig, current_lock: Optional[str] = None) -> None:
+        """
+        used to check that a ptvenv definition can be built over what is installed. Raises PtVenvUpToDateError when
+        the definition is already installed, and PytoolbeltError when the installed ptvenv was modified or the
+        definition changed without a version bump.
+        Args:
+            current_config: the definition to build
+            current_lock: the lock file of the definition to build, if it has one
+        """
         # the installation directory exists, so we need to check if the configuration has changed
         # if it has, we need to warn the user that the environment definition has changed, however
         # the version has not been updated. This could lead to unexpected behavior.
         if self.ptvenv_paths.install_dir.exists():
             installed_config = PtVenvConfig.from_file(self.ptvenv_paths.installed_config_file)
 
-            hashed_current_config = hash_config(current_config)
-            hashed_installed_config = hash_config(installed_config)
+            hashed_current_config = hash_config(current_config, current_lock)
+            hashed_installed_config = hash_config(installed_config, self.ptvenv_paths.read_installed_lock())
 
             installed_hash = self.ptvenv_paths.installed_hash_file.read_text()
 
@@ -189,7 +197,15 @@ class PtVenvController:
                 )
 
             if hashed_current_config == hashed_installed_config:
-                raise PytoolbeltError(f"Python environment {self.meta.name} version {self.meta.version} is already up to date.")
+                raise PtVenvUpToDateError(f"Python environment {self.meta.name} version {self.meta.version} is already up to date.")
+
+    def lock(self, installer: str = "pip") -> int:
+        config = PtVenvConfig.from_file(self.ptvenv_paths.ptvenv_config_file)
+        with timed(logger, f"Resolving requirements of {self.meta.name} for python {config.python_version}"):
+            lock = PtVenvLock.create(config, get_installer(installer))
+        lock.write(self.ptvenv_paths.ptvenv_lock_file)
+        logger.info(f"Locked {len(lock.pins)} packages of ptvenv {self.meta.name} in {self.ptvenv_paths.ptvenv_lock_file}.")
+        return 0
 
     def delete(self, _all: bool) -> int:
         if self.ptvenv_paths.install_dir.exists():
@@ -222,3 +238,74 @@ class PtVenvController:
             toolbelt_paths=self.toolbelt_paths,
             component_paths=self.ptvenv_paths,
         )
+
+
+class PtVenvBatchController:
+    def __init__(self, toolbelt: ToolbeltConfig, names: Optional[List[str]] = None, **kwargs) -> None:
+        self.toolbelt = toolbelt
+        self.toolbelt_paths = kwargs.get("toolbelt_paths", ToolbeltPaths(toolbelt.path))
+        self.names = names or sorted(self.toolbelt_paths.iter_ptvenvs())
+
+    def build(self, force: bool, from_config: bool, jobs: int, incremental: bool = False, installer: str = "pip") -> int:
+        logger.info(f"Building {len(self.names)} ptvenvs in {self.toolbelt.name} with {jobs} jobs.")
+        ptvenv_installer = get_installer(installer)
+        wheel_cache = WheelCache()
+
+        with TemporaryGitClient(self.toolbelt.path, self.toolbelt.name) as (tmp_repo, git_client):
+            if not from_config and not force:
+                git_client.raise_if_uncommitted_changes()
+
+            results = []
+            tasks = []
+
+            for name in self.names:
+                try:
+                    paths = self._get_build_paths(name, tmp_repo, from_config, force)
+                except PtVenvUpToDateError as e:
+                    results.append(BatchResult(name=name, version="", status="skipped", duration=0.0, message=str(e)))
+                    continue
+                except PytoolbeltError as e:
+                    # a changed definition without a version bump, or a ptvenv without a release.
+                    results.append(BatchResult(name=name, version="", status="failed", duration=0.0, message=str(e)))
+                    continue
+
+                builder = PtVenvBuilder(paths, installer=ptvenv_installer, wheel_cache=wheel_cache, output_prefix=name)
+                tasks.append(
+                    BatchTask(name=name, version=str(paths.meta.version), func=lambda b=builder: b.build(incremental=incremental, prune_wheel_cache=False))
+                )
+
+            results.extend(run_batch(tasks, jobs))
+            # no build installs from the cache anymore, so no entry can be evicted from under one.
+            wheel_cache.prune()
+
+        table = BatchSummaryTableView(title=f"ptvenv builds in {self.toolbelt.name}")
+        for result in sorted(results, key=lambda r: r.name):
+            table.add_row(result)
+        table.print_table()
+
+        return 1 if any(result.failed for result in results) else 0
+
+    def _get_build_paths(self, name: str, tmp_repo: TemporaryGitClient, from_config: bool, force: bool) -> PtVenvPaths:
+        """
+        used to resolve the definition a ptvenv is built from. Release builds export the definition of the
+        ptvenv at its release tag once, so every build reads from the export without checking out the repo.
+        Args:
+            name: name of the ptvenv
+            tmp_repo: temporary client of the toolbelt repo release tags are exported with
+            from_config: build from the definition in the working tree
+            force: build even if the ptvenv is already installed
+        Returns: the paths to build the ptvenv from
+        """
+        if from_config:
+            controller = PtVenvController.for_build(name, self.toolbelt)
+            paths = controller.ptvenv_paths
+        else:
+            latest_meta = tmp_repo.git_client.latest_release("ptvenv", name)
+            export_dir = tmp_repo.export(latest_meta.release_tag, [f"ptvenv/{name}"])
+
+            controller = PtVenvController(latest_meta, self.toolbelt, toolbelt_paths=self.toolbelt_paths)
+            paths = PtVenvPaths(latest_meta, ToolbeltPaths(export_dir))
+
+        if not force:
+            controller.installation_can_proceed(PtVenvConfig.from_file(paths.ptvenv_config_file), paths.read_lock())
+        return paths
@@ -2,15 +2,16 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
-from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
+from pytoolbelt.cli.views.releases_view import ReleasePlanTableView
 from pytoolbelt.core.data_classes.pytoolbelt_config import (
     PytoolbeltConfig,
     pytoolbelt_config,
 )
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
-from pytoolbelt.core.project.ptvenv_components import PtVenvConfig, PtVenvPaths
-from pytoolbelt.core.project.tool_components import ToolConfig, ToolPaths
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.project.release_plan import ReleasePlan
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.project.toolbelt_manifest import ToolbeltManifest
 from pytoolbelt.core.tools.git_client import GitClient
 from pytoolbelt.environment.config import get_logger
 
@@ -20,6 +21,12 @@ logger = get_logger(__name__)
 @dataclass
 class ReleaseParameters(BaseEntrypointParameters):
     toolbelt: str
+    dry_run: bool = False
+    offline: bool = False
+
+    def __post_init__(self) -> None:
+        if self.offline and not self.dry_run:
+            raise PytoolbeltError("--offline can only be used with --dry-run, as a release pushes tags to the remote.")
 
 
 class ReleaseController:
@@ -30,43 +37,35 @@ class ReleaseController:
     def release(self, ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: ReleaseParameters) -> int:
         git_client = GitClient.from_path(path=self.toolbelt_paths.root_path, release_branch=ptc.release_branch)
 
+        # tagging needs the current remote state, so only a dry run settles for a fresh earlier fetch.
         logger.info("Fetching remote tags...")
-        git_client.fetch_remote_tags()
-
-        logger.info("checking git release requirements...")
-        git_client.raise_on_release_attempt()
-
-        component_versions = []
-        for tool in self.toolbelt_paths.iter_tools():
-            meta = ComponentMetadata.as_tool(tool)
-            tool_paths = ToolPaths(meta, self.toolbelt_paths)
-            tool_config = ToolConfig.from_file(tool_paths.tool_config_file)
-            tool_paths.meta.version = tool_config.version
-            component_versions.append(tool_paths.meta)
-
-        for ptvenv in self.toolbelt_paths.iter_ptvenvs():
-            meta = ComponentMetadata.as_ptvenv(ptvenv)
-            ptvenv_paths = PtVenvPaths(meta, self.toolbelt_paths)
-            ptvenv_config = PtVenvConfig.from_file(ptvenv_paths.ptvenv_config_file)
-            ptvenv_paths.meta.version = ptvenv_config.version
-            component_versions.append(ptvenv_paths.meta)
-
-        release_tags = []
-        release_tags.extend(git_client.tool_releases(as_names=True))
-        release_tags.extend(git_client.ptvenv_releases(as_names=True))
-
-        releases = []
-        for component_version in component_versions:
-            if component_version.release_tag not in release_tags:
-                releases.append(component_version)
-
-        if not releases:
+        git_client.fetch_remote_tags(ttl=None if params.dry_run else 0, offline=params.offline)
+
+        if not params.dry_run:
+            logger.info("checking git release requirements...")
+            git_client.raise_on_release_attempt()
+
+        manifest = ToolbeltManifest.load(self.toolbelt_paths, git_client)
+        plan = ReleasePlan.create(manifest, git_client)
+
+        table = ReleasePlanTableView(self.toolbelt_paths.toolbelt_dir.name)
+        for entry in plan.entries:
+            table.add_row(entry)
+        table.print_table()
+
+        for entry in plan.unbumped:
+            logger.warning(f"{entry.component.kind} {entry.component.name} changed since {entry.component.release_tag} without a version bump.")
+
+        if params.dry_run:
+            return 0
+
+        if not plan.releases:
             logger.info(f"No new releases to make in toolbelt {self.toolbelt_paths.toolbelt_dir.name}.")
             return 0
 
-        for release in releases:
-            logger.info(f"tagging release {release.release_tag}...")
-            git_client.tag_release(release.release_tag)
+        for entry in plan.releases:
+            logger.info(f"tagging release {entry.component.release_tag}...")
+            git_client.tag_release(entry.component.release_tag)
 
         logger.info("Pushing tags to remote...")
         git_client.push_tags_to_remote()
@@ -79,4 +78,14 @@ COMMON_FLAGS = {
         "help": "The help for toolbelt",
         "default": Path.cwd().name,
     },
+    "--dry-run": {
+        "required": False,
+        "help": "Show the release plan of every tool and ptvenv without tagging anything.",
+        "action": "store_true",
+    },
+    "--offline": {
+        "required": False,
+        "help": "Do not contact the remote and plan the release with the local tags. Requires --dry-run.",
+        "action": "store_true",
+    },
 }
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
 from pytoolbelt.cli.views.releases_view import ReleasesTableView
-from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfigs
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
@@ -20,6 +20,7 @@ class ReleasesParameters(BaseEntrypointParameters):
     ptvenv: bool
     tools: bool
     all: bool
+    offline: bool = False
 
     def __post_init__(self) -> None:
         if self.ptvenv and self.tools:
@@ -50,6 +51,11 @@ COMMON_FLAGS = {
         "help": "The help for the all flag",
         "action": "store_true",
     },
+    "--offline": {
+        "required": False,
+        "help": "Do not fetch from the remote and list the releases known locally.",
+        "action": "store_true",
+    },
 }
 
 
@@ -59,19 +65,19 @@ class ReleasesController:
         self.toolbelt = self.toolbelt_configs.get(toolbelt)
         self.toolbelt_paths = ToolbeltPaths(self.toolbelt.path)
 
-    def releases(self, ptvenv: bool, tools: bool, _all: bool) -> int:
+    def releases(self, ptvenv: bool, tools: bool, _all: bool, offline: Optional[bool] = False) -> int:
         self.toolbelt_paths.raise_if_not_exists()
         git_client = GitClient.from_path(self.toolbelt.path, self.toolbelt)
 
-        git_client.repo.remotes.origin.fetch()
+        git_client.fetch(offline=offline)
 
         releases = []
 
         if ptvenv:
-            releases = [(ComponentMetadata.from_release_tag(t.name), t) for t in git_client.ptvenv_releases()]
+            releases = git_client.release_refs("ptvenv")
 
         if tools:
-            releases = [(ComponentMetadata.from_release_tag(t.name), t) for t in git_client.tool_releases()]
+            releases = git_client.release_refs("tool")
 
         if not releases:
             logger.info(f"No releases found for toolbelt {self.toolbelt.name}")
@@ -79,11 +85,12 @@ class ReleasesController:
 
         # otherwise just do all the releases
         table = ReleasesTableView(toolbelt=self.toolbelt, ptvenv=ptvenv, tools=tools, _all=_all)
-        for r, t in releases:
+        for release in releases:
             table.add_row(
-                r.name,
-                r.version,
-                str(t.commit.committed_datetime.date()),
-                t.commit.hexsha,
+                release.name,
+                release.version,
+                str(release.release_date),
+                release.sha,
             )
         table.print_table()
+        return 0
@@ -1,13 +1,22 @@
+import hashlib
+from typing import Dict, List, Optional, Set
+
 import docker
 from docker.errors import DockerException
 
+from pytoolbelt.cli.views.batch_view import BatchSummaryTableView
 from pytoolbelt.core.data_classes.pytoolbelt_config import PytoolbeltConfig
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
-from pytoolbelt.core.project.ptvenv_components import PtVenvConfig
-from pytoolbelt.core.project.tool_components import ToolConfig
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.project.toolbelt_manifest import ToolbeltManifest
+from pytoolbelt.core.tools import hash_config
+from pytoolbelt.core.tools.batch import BatchResult, BatchTask, run_batch
+from pytoolbelt.core.tools.git_client import GitClient
+from pytoolbelt.core.tools.nox_runner import NoxContainerRunner
 from pytoolbelt.core.tools.noxtemplating import NoxfileTemplater, PytestIniTemplater
+from pytoolbelt.core.tools.ptvenv_images import PtVenvImageBuilder
+from pytoolbelt.core.tools.session_cache import SessionResultCache, parse_session_name
 from pytoolbelt.environment.config import get_logger
 
 logger = get_logger(__name__)
@@ -19,6 +28,11 @@ class TestController:
         self.toolbelt = toolbelt
         self.toolbelt_paths = ToolbeltPaths(toolbelt_root=toolbelt.path)
 
+    def get_git_client(self) -> Optional[GitClient]:
+        if not self.toolbelt_paths.git_dir.exists():
+            return None
+        return GitClient.from_path(self.toolbelt_paths.toolbelt_dir)
+
     def pull(self) -> int:
         docker_client = docker.from_env()
         try:
@@ -30,48 +44,232 @@ class TestController:
         logger.info(f"Successfully pulled image {self.ptc.test_image}")
         return 0
 
+    def get_runner(self) -> NoxContainerRunner:
+        return NoxContainerRunner(docker.from_env(), self.ptc.test_image, self.toolbelt_paths.toolbelt_dir)
+
     def list(self) -> None:
-        docker_client = docker.from_env()
+        try:
+            sessions = self.get_runner().list_sessions()
+        except DockerException:
+            raise PytoolbeltError("Failed to list the nox sessions")
+
+        for session in sessions:
+            logger.info(session)
+
+    @property
+    def test_harness_files(self) -> List[str]:
+        # every session runs with these files, so a change to any of them affects all sessions.
+        paths = [self.toolbelt_paths.noxfile, self.toolbelt_paths.pytest_ini, self.toolbelt_paths.conftest, self.toolbelt_paths.pytoolbelt_config]
+        return [path.relative_to(self.toolbelt_paths.toolbelt_dir).as_posix() for path in paths]
+
+    def get_affected_sessions(self, manifest: ToolbeltManifest, sessions: List[str], since: str) -> List[str]:
+        """
+        used to select the sessions affected by the changes since a git ref: the sessions of changed tools, of tools
+        whose ptvenv changed, and of changed ptvenvs without tools. Sessions not generated by pytoolbelt always run,
+        and every session runs when a file of the test harness at the root of the toolbelt changed.
+        Args:
+            manifest: manifest of the toolbelt
+            sessions: names of the nox sessions
+            since: git ref to compare the working tree with
+        Returns: the affected sessions
+        """
+        git_client = self.get_git_client()
+        if git_client is None:
+            raise PytoolbeltError("--since requires the toolbelt to be a git repo.")
+
+        changed_paths = git_client.changed_paths(since)
+        harness = [path for path in changed_paths if path in self.test_harness_files]
+        if harness:
+            logger.info(f"All {len(sessions)} nox sessions are affected by changes to {', '.join(harness)} since {since}.")
+            return sessions
 
-        container = docker_client.containers.run(
-            image=self.ptc.test_image, command="nox --list -f /code/noxfile.py", volumes={self.toolbelt_paths.toolbelt_dir: {"bind": "/code", "mode": "rw"}}
-        )
-        logger.info(f"Container output: {container.decode()}")
+        affected = manifest.affected_by(changed_paths)
+        tools = {entry.config.name for entry in affected if entry.kind == "tool"}
+        ptvenvs = {entry.config.name for entry in affected if entry.kind == "ptvenv"}
 
-    def run(self) -> int:
+        selected = []
+        for session in sessions:
+            parsed = parse_session_name(session)
+            if parsed is None or (parsed[1] in tools if parsed[1] else parsed[0] in ptvenvs):
+                selected.append(session)
+
+        logger.info(f"{len(selected)} of {len(sessions)} nox sessions are affected by changes since {since}.")
+        return selected
+
+    def get_session_keys(self, manifest: ToolbeltManifest, sessions: List[str], image_id: str) -> Dict[str, str]:
+        """
+        used to compute the result cache key of each session of the generated noxfile. Sessions of tools
+        without a content hash, which is only known in a git repo, have no key and always run.
+        Args:
+            manifest: manifest of the toolbelt
+            sessions: names of the nox sessions
+            image_id: id of the test image
+        Returns: the cache key of each session that has one
+        """
+        ptvenvs = {entry.config.name: entry for entry in manifest.ptvenvs.values()}
+        tools = {entry.config.name: entry for entry in manifest.tools.values()}
+
+        test_config = hashlib.sha256()
+        for name in self.test_harness_files:
+            path = self.toolbelt_paths.toolbelt_dir / name
+            # the name separates the files, so content moving from one file to another changes the hash.
+            test_config.update(f"{name}\0".encode("utf-8"))
+            test_config.update(path.read_bytes() if path.exists() else b"")
+
+        keys = {}
+        for session in sessions:
+            parsed = parse_session_name(session)
+            if parsed is None or parsed[0] not in ptvenvs:
+                continue
+
+            ptvenv_name, tool_name = parsed
+            ptvenv = ptvenvs[ptvenv_name]
+            lock_file = ptvenv.path / f"{ptvenv.name}.lock"
+            ptvenv_hash = hash_config(ptvenv.config, lock_file.read_text() if lock_file.exists() else None)
+
+            tool_hash = ""
+            if tool_name is not None:
+                tool = tools.get(tool_name)
+                if tool is None or tool.content_hash is None:
+                    continue
+                tool_hash = tool.content_hash
+
+            keys[session] = SessionResultCache.key(tool_hash, ptvenv_hash, image_id, test_config.hexdigest())
+        return keys
+
+    def build_ptvenv_images(self, manifest: ToolbeltManifest, runner: NoxContainerRunner, names: Optional[Set[str]] = None) -> Dict[str, str]:
+        """
+        used to get the prebuilt test images of the ptvenvs, building the images of new or changed ptvenvs.
+        Args:
+            manifest: manifest of the toolbelt
+            runner: runner of the toolbelt, for its docker client and test image
+            names: names of the ptvenvs to get images for, every ptvenv when None
+        Returns: the image tag of each ptvenv, by the ptvenv name used in the noxfile
+        """
+        builder = PtVenvImageBuilder(runner.docker_client, runner.image, runner.image_id)
+        images = {}
+        for ptvenv in manifest.ptvenvs.values():
+            if names is not None and ptvenv.config.name not in names:
+                continue
+            try:
+                images[ptvenv.config.name] = builder.build(ptvenv)
+            except DockerException as e:
+                raise PytoolbeltError(f"Failed to build the test image of ptvenv {ptvenv.config.name} :: {e}")
+        return images
+
+    def run_session(
+        self,
+        runner: NoxContainerRunner,
+        session: str,
+        cache: SessionResultCache,
+        key: Optional[str] = None,
+        image: Optional[str] = None,
+    ) -> None:
+        try:
+            returncode = runner.run([session], prefix=session, image=image)
+        except DockerException as e:
+            raise PytoolbeltError(f"Failed to run the session container :: {e}")
+
+        if returncode != 0:
+            raise PytoolbeltError(f"nox exited with code {returncode}")
+
+        if key is not None:
+            cache.add(key, session)
+
+    def run(self, jobs: int = 1, use_cache: bool = True, prebuilt: bool = False, since: Optional[str] = None) -> int:
+        """
+        used to run the nox sessions of the toolbelt in containers of the test image. With more than one job,
+        every session runs in its own container on a bounded pool, with its output prefixed by the session name.
+        Sessions that passed before with the same tool, ptvenv definition, test image and noxfile are not run again.
+        Args:
+            jobs: the maximum number of sessions running at once
+            use_cache: skip the sessions the test result cache knows to pass
+            prebuilt: run each session in the prebuilt test image of its ptvenv, which skips installing requirements
+            since: only run the sessions of the tools affected by changes since this git ref
+        Returns: 1 if any session failed, 0 otherwise
+        """
         logger.info("Running test command")
-        docker_client = docker.from_env()
+        runner = self.get_runner()
+
+        if jobs == 1 and not use_cache and not prebuilt and since is None:
+            try:
+                return 0 if runner.run() == 0 else 1
+            except DockerException:
+                raise PytoolbeltError("Failed to run test command")
+
+        manifest = ToolbeltManifest.load(self.toolbelt_paths, self.get_git_client())
 
         try:
-            container = docker_client.containers.run(
-                image=self.ptc.test_image,
-                command="nox",
-                volumes={self.toolbelt_paths.toolbelt_dir: {"bind": "/code", "mode": "rw"}},
-                detach=True,
-                working_dir="/code",
+            sessions = runner.list_sessions()
+            if since is not None:
+                sessions = self.get_affected_sessions(manifest, sessions, since)
+            keys = self.get_session_keys(manifest, sessions, runner.image_id) if use_cache else {}
+        except DockerException:
+            raise PytoolbeltError("Failed to list the nox sessions")
+
+        cache = SessionResultCache()
+        cached = [session for session in sessions if session in keys and cache.has(keys[session])]
+        pending = [session for session in sessions if session not in cached]
+        if use_cache:
+            logger.info(f"{len(cached)} of {len(sessions)} nox sessions served from the test result cache.")
+
+        images = {}
+        if prebuilt:
+            images = self.build_ptvenv_images(manifest, runner, {parsed[0] for parsed in map(parse_session_name, pending) if parsed})
+
+        # sessions of different ptvenvs need different images, so prebuilt images always run a container per session.
+        if jobs == 1 and not prebuilt:
+            return self.run_serial(runner, pending, cache, keys)
+
+        logger.info(f"Running {len(pending)} nox sessions in {self.toolbelt.name} with {jobs} jobs.")
+        tasks = [
+            BatchTask(
+                name=session,
+                version="",
+                func=lambda session=session: self.run_session(runner, session, cache, keys.get(session), self.get_session_image(session, images)),
             )
+            for session in pending
+        ]
+        results = [BatchResult(session, "", "cached", 0.0, "passed before") for session in cached]
+        results.extend(run_batch(tasks, jobs))
+
+        table = BatchSummaryTableView(title=f"test sessions in {self.toolbelt.name}", version_header=None)
+        for result in sorted(results, key=lambda r: sessions.index(r.name)):
+            table.add_row(result)
+        table.print_table()
+
+        return 1 if any(result.failed for result in results) else 0
 
-            for log in container.logs(stream=True):
-                logger.info(log.decode().strip())
-            container.wait()
+    @staticmethod
+    def get_session_image(session: str, images: Dict[str, str]) -> Optional[str]:
+        parsed = parse_session_name(session)
+        return images.get(parsed[0]) if parsed else None
 
+    def run_serial(self, runner: NoxContainerRunner, sessions: List[str], cache: SessionResultCache, keys: Dict[str, str]) -> int:
+        # every session runs in one container, so a failure can not be attributed and only a full pass is cached.
+        if not sessions:
+            return 0
+
+        try:
+            returncode = runner.run(sessions)
         except DockerException:
             raise PytoolbeltError("Failed to run test command")
+
+        if returncode != 0:
+            return 1
+
+        for session in sessions:
+            if session in keys:
+                cache.add(keys[session], session)
         return 0
 
     def render(self) -> int:
         logger.info("Rendering noxfile.py")
 
+        manifest = ToolbeltManifest.load(self.toolbelt_paths, self.get_git_client())
         ptvenv_configs = {}
-        for p in self.toolbelt_paths.ptvenvs_dir.iterdir():
-            config = PtVenvConfig.from_file(p / f"{p.name}.yml")
-            ptvenv_configs[config.name] = {"config": config, "tools": []}
-
-        for t in self.toolbelt_paths.tools_dir.iterdir():
-            config = ToolConfig.from_file(t / "config.yml")
-
-            if config.ptvenv.name in ptvenv_configs:
-                ptvenv_configs[config.ptvenv.name]["tools"].append(config)
+        for name, ptvenv in manifest.ptvenvs.items():
+            ptvenv_configs[ptvenv.config.name] = {"config": ptvenv.config, "tools": [tool.config for tool in manifest.dependents(name)]}
 
         self.toolbelt_paths.noxfile.touch(exist_ok=True)
         self.toolbelt_paths.pytest_ini.touch(exist_ok=True)
@@ -82,7 +280,7 @@ class TestController:
 
         logger.info("Rendering pytest.ini")
         pytest_templater = PytestIniTemplater()
-        tools = [t.name for t in self.toolbelt_paths.tools_dir.iterdir() if t.is_dir()]
+        tools = list(manifest.tools)
         pytest_ini = pytest_templater.render_pytest_ini(tools=tools)
         self.toolbelt_paths.pytest_ini.write_text(pytest_ini)
 
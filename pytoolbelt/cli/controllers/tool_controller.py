@@ -1,12 +1,16 @@
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
 from semver import Version
 
 from pytoolbelt.cli.controllers.common import release
+from pytoolbelt.cli.controllers.ptvenv_controller import PtVenvController
+from pytoolbelt.cli.views.batch_view import BatchSummaryTableView
+from pytoolbelt.cli.views.benchmark_view import BenchmarkTableView
 from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
 from pytoolbelt.core.data_classes.pytoolbelt_config import PytoolbeltConfig
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
-from pytoolbelt.core.error_handling.exceptions import PytoolbeltError, ToolCreationError
+from pytoolbelt.core.error_handling.exceptions import PythonEnvBuildError, PytoolbeltError, ToolCreationError
 from pytoolbelt.core.project.ptvenv_components import PtVenvPaths
 from pytoolbelt.core.project.tool_components import (
     ToolConfig,
@@ -15,6 +19,7 @@ from pytoolbelt.core.project.tool_components import (
     ToolTemplater,
 )
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.tools.batch import BatchResult, BatchTask, run_batch
 from pytoolbelt.core.tools.git_client import TemporaryGitClient
 from pytoolbelt.environment.config import get_logger
 
@@ -95,39 +100,45 @@ class ToolController:
         logger.info(f"Tool {self.meta.name} created in toolbelt {self.toolbelt.name} at {self.tool_paths.tool_dir}.")
         return 0
 
-    def _run_installer(self, p: PtVenvPaths, dev_mode: bool, installer: Optional[ToolInstaller] = None) -> int:
+    def run_installer(self, p: PtVenvPaths, dev_mode: bool, installer: Optional[ToolInstaller] = None, mode: str = "zipapp") -> int:
+        """
+        used to install the tool with the python interpreter of its ptvenv, as a shim in dev mode.
+        Args:
+            p: paths of the installed ptvenv of the tool
+            dev_mode: install a shim running the tool from the toolbelt instead of a copy of the tool
+            installer: installer of the tool, the installer of the tool in the toolbelt when None
+            mode: how the tool is installed outside of dev mode
+        Returns: 0 when the tool was installed
+        """
         installer = installer or self.get_installer()
         if dev_mode:
             logger.debug(f"Installing {self.meta.name} in dev mode.")
             return installer.install_shim(p.python_executable_path.as_posix())
-        logger.debug(f"Installing {self.meta.name} in production mode.")
-        return installer.install(p.python_executable_path.as_posix())
+        logger.debug(f"Installing {self.meta.name} in production mode as {mode}.")
+        return installer.install(p.python_executable_path.as_posix(), mode=mode)
 
-    def install(self, dev_mode: bool, from_config: bool) -> int:
+    def install(self, dev_mode: bool, from_config: bool, mode: str = "zipapp") -> int:
         # TODO: This can be DRYed out. Check the build method of the PtVenvController.
 
         logger.info(f"Installing {self.meta.name} from toolbelt {self.toolbelt.name} at {self.tool_paths.tool_dir}.")
 
-        with TemporaryGitClient(self.toolbelt.path, self.toolbelt.name) as (
-            repo_path,
-            git_client,
-        ):
-            logger.debug(f"toolbelt copied to temp dir: {repo_path.tmp_dir}")
-
-            tool_config = ToolConfig.from_file(self.tool_paths.tool_config_file)
+        tool_config = ToolConfig.from_file(self.tool_paths.tool_config_file)
 
-            ptvenv_paths = PtVenvPaths.from_tool_config(tool_config, self.toolbelt_paths)
-            ptvenv_paths.raise_if_ptvenv_is_not_installed()
+        ptvenv_paths = PtVenvPaths.from_tool_config(tool_config, self.toolbelt_paths)
+        ptvenv_paths.raise_if_ptvenv_is_not_installed()
 
-            if not from_config and not dev_mode:
-                git_client.raise_if_uncommitted_changes()
+        # installing from the working tree does not need a release, so nothing is exported.
+        if from_config or dev_mode:
+            return self.run_installer(ptvenv_paths, dev_mode, mode=mode)
 
-            if from_config or dev_mode:
-                return self._run_installer(ptvenv_paths, dev_mode)
+        with TemporaryGitClient(self.toolbelt.path, self.toolbelt.name) as (
+            tmp_repo,
+            git_client,
+        ):
+            git_client.raise_if_uncommitted_changes()
 
-            elif self.meta.is_latest_version:
-                tags = git_client.tool_releases(name=self.meta.name, as_names=True)
-                latest_meta = ComponentMetadata.get_latest_release(tags)
+            if self.meta.is_latest_version:
+                latest_meta = git_client.latest_release("tool", self.meta.name)
 
             else:
                 latest_meta = self.meta
@@ -137,20 +148,32 @@ class ToolController:
             except IndexError:
                 raise ToolCreationError(f"Tool {latest_meta.name} version {latest_meta.version} does not exist.")
 
-            # check out from the release tag
-            logger.debug(f"Checking out {latest_meta.release_tag}...")
-            git_client.checkout_tag(tag_reference)
-
-            # create new temp paths
-            tmp_project_paths = ToolbeltPaths(repo_path.tmp_dir)
+            # export only the tool at the release tag
+            logger.debug(f"Exporting tools/{latest_meta.name} at {latest_meta.release_tag}...")
+            tmp_project_paths = ToolbeltPaths(tmp_repo.export(tag_reference, [f"tools/{latest_meta.name}"]))
             tmp_paths = ToolPaths(latest_meta, tmp_project_paths)
 
             tmp_installer = ToolInstaller(tmp_paths)
-            result = self._run_installer(ptvenv_paths, dev_mode, tmp_installer)
+            result = self.run_installer(ptvenv_paths, dev_mode, tmp_installer, mode=mode)
             logger.info(f"Tool {latest_meta.name} version {latest_meta.version} installed using ptvenv {ptvenv_paths.ptvenv_dir}.")
 
             return result
 
+    def bench(self, runs: int, args: List[str]) -> int:
+        logger.info(f"Benchmarking startup of {self.meta.name} {' '.join(args)} for each install mode.")
+
+        tool_config = ToolConfig.from_file(self.tool_paths.tool_config_file)
+        ptvenv_paths = PtVenvPaths.from_tool_config(tool_config, self.toolbelt_paths)
+        ptvenv_paths.raise_if_ptvenv_is_not_installed()
+
+        interpreter = ptvenv_paths.python_executable_path.as_posix()
+        table = BenchmarkTableView(title=f"Startup of {self.meta.name} {' '.join(args)} ({runs} warm runs)")
+        for result in self.get_installer().benchmark(interpreter, args, runs):
+            table.add_row(result)
+
+        table.print_table()
+        return 0
+
     def bump(self, ptc: PytoolbeltConfig, part: str) -> int:
         logger.info(f"Bumping version of tool {self.meta.name} in toolbelt {self.toolbelt.name}.")
         if part == "config":
@@ -166,7 +189,10 @@ class ToolController:
     def remove(self) -> int:
         logger.info(f"Removing tool {self.meta.name} from toolbelt {self.toolbelt.name}.")
         if self.tool_paths.install_path.exists():
+            # an extracted install keeps a read-only copy of the tool beside the launcher the symlink points at.
+            target = self.tool_paths.install_path.resolve()
             self.tool_paths.install_path.unlink()
+            self.get_installer().remove_extracted(target.parent / f".{target.name}")
         else:
             raise ToolCreationError(f"Tool {self.meta.name} does not exist.")
         logger.info(f"Tool {self.meta.name} removed.")
@@ -175,3 +201,111 @@ class ToolController:
     def release(self, ptc: PytoolbeltConfig) -> int:
         logger.info(f"Releasing tool {self.meta.name} version {self.meta.version} in toolbelt {self.toolbelt.name}.")
         return release(ptc=ptc, toolbelt_paths=self.toolbelt_paths, component_paths=self.tool_paths)
+
+
+class ToolBatchController:
+    """Controller for installing many tools at once."""
+
+    def __init__(self, toolbelt: ToolbeltConfig, names: Optional[List[str]] = None, **kwargs) -> None:
+        self.toolbelt = toolbelt
+        self.toolbelt_paths = kwargs.get("toolbelt_paths", ToolbeltPaths(toolbelt.path))
+        self.names = names or sorted(self.toolbelt_paths.iter_tools())
+
+    def install(self, dev_mode: bool, from_config: bool, jobs: int, install_ptvenvs: bool = False, installer: str = "pip", mode: str = "zipapp") -> int:
+        logger.info(f"Installing {len(self.names)} tools from toolbelt {self.toolbelt.name} with {jobs} jobs.")
+        results = []
+
+        with TemporaryGitClient(self.toolbelt.path, self.toolbelt.name) as (
+            tmp_repo,
+            git_client,
+        ):
+            if from_config or dev_mode:
+                tool_paths = {name: ToolController.for_installation(name, self.toolbelt).tool_paths for name in self.names}
+            else:
+                git_client.raise_if_uncommitted_changes()
+                tool_paths = self._export_releases(tmp_repo, results)
+
+            # every tool needs its ptvenv, so check them all before building anything
+            ptvenv_paths = {
+                name: PtVenvPaths.from_tool_config(ToolConfig.from_file(paths.tool_config_file), self.toolbelt_paths) for name, paths in tool_paths.items()
+            }
+            ptvenv_errors = {}
+            if install_ptvenvs:
+                ptvenv_errors = self._install_missing_ptvenvs(list(ptvenv_paths.values()), from_config or dev_mode, installer)
+
+            tasks = []
+            for name, paths in tool_paths.items():
+                version = str(paths.meta.version)
+                p = ptvenv_paths[name]
+
+                if not p.install_dir.exists():
+                    error = ptvenv_errors.get((p.meta.name, str(p.meta.version)))
+                    if error is None:
+                        message = f"ptvenv {p.meta.name} version {p.meta.version} is not installed."
+                    else:
+                        message = f"ptvenv {p.meta.name} version {p.meta.version} failed to install :: {error}"
+                    results.append(BatchResult(name=name, version=version, status="failed", duration=0.0, message=message))
+                    continue
+
+                controller = ToolController(paths.meta, self.toolbelt, toolbelt_paths=self.toolbelt_paths)
+                tool_installer = ToolInstaller(paths)
+                tasks.append(BatchTask(name=name, version=version, func=lambda c=controller, p=p, i=tool_installer: c.run_installer(p, dev_mode, i, mode)))
+
+            results.extend(run_batch(tasks, jobs))
+
+        table = BatchSummaryTableView(title=f"tool installs from {self.toolbelt.name}")
+        for result in sorted(results, key=lambda r: r.name):
+            table.add_row(result)
+        table.print_table()
+
+        return 1 if any(result.failed for result in results) else 0
+
+    def _export_releases(self, tmp_repo: TemporaryGitClient, results: List[BatchResult]) -> Dict[str, ToolPaths]:
+        """
+        used to export the latest release of every tool. Tools are grouped by release tag, so each distinct
+        tag is exported once, with only the tool directories released under it.
+        Args:
+            tmp_repo: temporary client of the toolbelt repo
+            results: tools without a release are added to the results as failed
+        Returns: the paths of each exported tool by name
+        """
+        releases = {}
+        for name in self.names:
+            try:
+                releases[name] = tmp_repo.git_client.latest_release("tool", name)
+            except PytoolbeltError as e:
+                results.append(BatchResult(name=name, version="", status="failed", duration=0.0, message=str(e)))
+
+        tool_dirs_by_tag = defaultdict(list)
+        for meta in releases.values():
+            tool_dirs_by_tag[meta.release_tag].append(f"tools/{meta.name}")
+
+        for tag, tool_dirs in tool_dirs_by_tag.items():
+            logger.debug(f"Exporting {', '.join(tool_dirs)} at {tag}...")
+            tmp_repo.export(tag, tool_dirs)
+
+        tmp_project_paths = ToolbeltPaths(tmp_repo.tmp_dir)
+        return {name: ToolPaths(meta, tmp_project_paths) for name, meta in releases.items()}
+
+    def _install_missing_ptvenvs(self, ptvenv_paths: List[PtVenvPaths], from_config: bool, installer: str) -> Dict[Tuple[str, str], str]:
+        """
+        used to build the ptvenvs of the tools that are not installed yet.
+        Args:
+            ptvenv_paths: paths of the ptvenv of every tool
+            from_config: build from the working tree instead of the release
+            installer: installer used to build the ptvenvs
+        Returns: the error of each ptvenv that failed to build, by ptvenv name and version
+        """
+        missing = {(p.meta.name, str(p.meta.version)) for p in ptvenv_paths if not p.install_dir.exists()}
+
+        errors = {}
+        for name, version in sorted(missing):
+            logger.info(f"Installing missing ptvenv {name} version {version}.")
+            try:
+                ptvenv = PtVenvController.for_build(f"{name}=={version}", self.toolbelt)
+                ptvenv.build(force=False, from_config=from_config, installer=installer)
+            except (PytoolbeltError, PythonEnvBuildError) as e:
+                # the tools using this ptvenv are reported as failed in the summary.
+                logger.info(f"Unable to install ptvenv {name} version {version} :: {e}")
+                errors[(name, version)] = str(e)
+        return errors
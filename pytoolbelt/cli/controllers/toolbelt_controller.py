@@ -1,12 +1,15 @@
 from pathlib import Path
+from typing import List, Optional
 
 import giturlparse
 from git import Repo, exc
 
+from pytoolbelt.cli.views.batch_view import BatchSummaryTableView
 from pytoolbelt.cli.views.toolbelt_views import ToolbeltConfigView
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig, ToolbeltConfigs
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths, ToolbeltTemplater
+from pytoolbelt.core.tools.batch import BatchTask, run_batch
 from pytoolbelt.core.tools.git_client import GitClient
 from pytoolbelt.environment.config import get_logger
 
@@ -88,15 +91,93 @@ class ToolbeltController:
         table.print_table()
         return 0
 
-    def fetch(self, toolbelt: ToolbeltConfig) -> int:
+    @staticmethod
+    def _set_release_branch(toolbelt: ToolbeltConfig, git_client: GitClient) -> bool:
+        # main is the default branch, set master if old school
+        if "master" in git_client.repo.branches and toolbelt.release_branch != "master":
+            toolbelt.release_branch = "master"
+            return True
+        return False
+
+    def fetch(self, toolbelt: ToolbeltConfig, clone_filter: Optional[str] = None, depth: Optional[int] = None, sparse: Optional[bool] = False) -> int:
         try:
-            git_client = GitClient.clone_from_url(toolbelt.url, toolbelt.path)
+            git_client = GitClient.clone_from_url(toolbelt.url, toolbelt.path, clone_filter=clone_filter, depth=depth, sparse=sparse)
         except exc.GitCommandError as e:
             raise PytoolbeltError(f"Error fetching toolbelt: {e}")
 
-        # main is the default branch, set master if old school
-        if "master" in git_client.repo.branches:
-            toolbelt.release_branch = "master"
+        if self._set_release_branch(toolbelt, git_client):
             self.toolbelt_configs.add(toolbelt)
             self.toolbelt_configs.save()
         return 0
+
+    def _sync_toolbelt(
+        self,
+        toolbelt: ToolbeltConfig,
+        cloned: List[ToolbeltConfig],
+        timeout: Optional[float] = None,
+        clone_filter: Optional[str] = None,
+        depth: Optional[int] = None,
+        sparse: Optional[bool] = False,
+    ) -> str:
+        try:
+            if not toolbelt.path.joinpath(".git").exists():
+                if toolbelt.path.exists() and any(toolbelt.path.iterdir()):
+                    raise PytoolbeltError(f"{toolbelt.path} exists and is not a git repo.")
+                git_client = GitClient.clone_from_url(toolbelt.url, toolbelt.path, clone_filter=clone_filter, depth=depth, sparse=sparse, timeout=timeout)
+                if self._set_release_branch(toolbelt, git_client):
+                    cloned.append(toolbelt)
+                return f"cloned into {toolbelt.path}"
+
+            git_client = GitClient.from_path(toolbelt.path, toolbelt)
+            git_client.fetch(ttl=0, timeout=timeout)
+            moved = git_client.fast_forward()
+        except exc.GitCommandError as e:
+            raise PytoolbeltError(e.stderr.strip() or str(e))
+
+        if moved:
+            return f"fast-forwarded to {git_client.repo.head.commit.hexsha[:7]}"
+        return "up to date"
+
+    def sync(
+        self,
+        jobs: int,
+        timeout: Optional[float] = None,
+        clone_filter: Optional[str] = None,
+        depth: Optional[int] = None,
+        sparse: Optional[bool] = False,
+    ) -> int:
+        """
+        used to bring every configured toolbelt up to date. Missing toolbelts are cloned, existing ones are
+        fetched and their checked out branch fast-forwarded. Toolbelts are synced concurrently, and git commands
+        that contact a remote are killed after the timeout, so a slow remote only fails its own toolbelt.
+        Args:
+            jobs: the maximum number of toolbelts synced at once
+            timeout: seconds after which a git command contacting a remote is killed, no limit when None
+            clone_filter: partial clone filter for toolbelts that are cloned
+            depth: history depth for toolbelts that are cloned
+            sparse: sparse checkout for toolbelts that are cloned
+        Returns: 1 if any toolbelt failed to sync, 0 otherwise
+        """
+        cloned: List[ToolbeltConfig] = []
+        tasks = [
+            BatchTask(
+                name=toolbelt.name,
+                version=toolbelt.release_branch,
+                func=lambda toolbelt=toolbelt: self._sync_toolbelt(toolbelt, cloned, timeout, clone_filter, depth, sparse),
+            )
+            for toolbelt in self.toolbelt_configs.repos.values()
+        ]
+        results = run_batch(tasks, jobs)
+
+        # written once all toolbelts are synced, worker threads never write the config file.
+        if cloned:
+            for toolbelt in cloned:
+                self.toolbelt_configs.add(toolbelt)
+            self.toolbelt_configs.save()
+
+        table = BatchSummaryTableView(title="toolbelt sync", version_header="Branch")
+        for result in sorted(results, key=lambda r: r.name):
+            table.add_row(result)
+        table.print_table()
+
+        return 1 if any(result.failed for result in results) else 0
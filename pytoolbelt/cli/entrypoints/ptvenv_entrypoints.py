@@ -1,13 +1,20 @@
 from dataclasses import dataclass
 from pathlib import Path
 
-from pytoolbelt.cli.controllers.ptvenv_controller import PtVenvController
+from pytoolbelt.cli.controllers.cache_controller import CacheController
+from pytoolbelt.cli.controllers.ptvenv_controller import (
+    PtVenvBatchController,
+    PtVenvController,
+)
 from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
 from pytoolbelt.core.data_classes.pytoolbelt_config import (
     PytoolbeltConfig,
     pytoolbelt_config,
 )
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+
+ACTIONS_WITHOUT_NAME = ["cache", "gc"]
 
 
 @dataclass
@@ -18,6 +25,18 @@ class PtVenvParameters(BaseEntrypointParameters):
     force: bool
     part: str
     from_config: bool
+    incremental: bool
+    cache_action: str
+    names: str
+    jobs: int
+
+    @property
+    def is_batch_install(self) -> bool:
+        return self.action == "install" and (self.all or bool(self.names))
+
+    def __post_init__(self) -> None:
+        if self.action not in ACTIONS_WITHOUT_NAME and not self.name and not self.is_batch_install:
+            raise PytoolbeltError(f"--name is required for ptvenv {self.action}")
 
 
 @pytoolbelt_config(provide_ptc=True)
@@ -26,10 +45,27 @@ def new(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: PtVenvParameter
     return ptvenv.create(ptc)
 
 
-@pytoolbelt_config()
-def install(toolbelt: ToolbeltConfig, params: PtVenvParameters) -> int:
+@pytoolbelt_config(provide_ptc=True)
+def install(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: PtVenvParameters) -> int:
+    if params.is_batch_install:
+        names = [name.strip() for name in params.names.split(",")] if params.names else None
+        batch = PtVenvBatchController(toolbelt, names)
+        return batch.build(
+            force=params.force,
+            from_config=params.from_config,
+            jobs=params.jobs,
+            incremental=params.incremental,
+            installer=ptc.installer,
+        )
+
+    ptvenv = PtVenvController.for_build(params.name, toolbelt)
+    return ptvenv.build(force=params.force, from_config=params.from_config, incremental=params.incremental, installer=ptc.installer)
+
+
+@pytoolbelt_config(provide_ptc=True)
+def lock(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: PtVenvParameters) -> int:
     ptvenv = PtVenvController.for_build(params.name, toolbelt)
-    return ptvenv.build(force=params.force, from_config=params.from_config)
+    return ptvenv.lock(installer=ptc.installer)
 
 
 @pytoolbelt_config()
@@ -50,10 +86,22 @@ def release(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: PtVenvParam
     return ptvenv.release(ptc)
 
 
+def cache(params: PtVenvParameters) -> int:
+    controller = CacheController()
+    if params.cache_action == "prune":
+        return controller.prune(params.all)
+    return controller.stats()
+
+
+def gc(params: PtVenvParameters) -> int:
+    controller = CacheController()
+    return controller.gc()
+
+
 COMMON_FLAGS = {
     "--name": {
         "help": "Name of the ptvenv definition.",
-        "required": True,
+        "required": False,
     },
     "--toolbelt": {
         "help": "Name of the toolbelt.",
@@ -82,8 +130,31 @@ ACTIONS = {
                 "action": "store_true",
                 "default": False,
             },
+            "--incremental": {
+                "help": "Build from a copy of the newest installed version, only installing the requirements that changed.",
+                "action": "store_true",
+                "default": False,
+            },
+            "--all": {
+                "help": "Install every ptvenv defined in the toolbelt.",
+                "action": "store_true",
+                "default": False,
+            },
+            "--names": {
+                "help": "Comma separated names of the ptvenvs to install.",
+                "required": False,
+            },
+            "--jobs": {
+                "help": "Number of ptvenvs to build at the same time when installing with --all or --names.",
+                "type": int,
+                "default": 4,
+            },
         },
     },
+    "lock": {
+        "func": lock,
+        "help": "Resolve the requirements of a ptvenv definition into a lock file with pinned versions and hashes.",
+    },
     "remove": {
         "func": remove,
         "help": "Remove a ptvenv definition from the local project.",
@@ -111,4 +182,23 @@ ACTIONS = {
         "func": release,
         "help": "Release a ptvenv definition to a remote git repository.",
     },
+    "cache": {
+        "func": cache,
+        "help": "Show stats for, or prune the shared ptvenv wheel cache.",
+        "flags": {
+            "cache_action": {
+                "help": "Cache action to run.",
+                "choices": ["stats", "prune"],
+            },
+            "--all": {
+                "help": "Remove every entry from the wheel cache when pruning.",
+                "action": "store_true",
+                "default": False,
+            },
+        },
+    },
+    "gc": {
+        "func": gc,
+        "help": "Remove dedup pool entries that are no longer used by any installed ptvenv.",
+    },
 }
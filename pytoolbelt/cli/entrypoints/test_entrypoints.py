@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from pytoolbelt.cli.controllers.test_controller import TestController
 from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
@@ -8,11 +9,20 @@ from pytoolbelt.core.data_classes.pytoolbelt_config import (
     pytoolbelt_config,
 )
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
 
 
 @dataclass
 class TestParameters(BaseEntrypointParameters):
     toolbelt: str
+    jobs: Optional[int] = None
+    no_cache: bool = False
+    prebuilt: bool = False
+    since: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.jobs is not None and self.jobs < 1:
+            raise PytoolbeltError("--jobs must be at least 1")
 
 
 @pytoolbelt_config(provide_ptc=True)
@@ -25,8 +35,7 @@ def pull(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: TestParameters
 @pytoolbelt_config(provide_ptc=True)
 def run(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: TestParameters) -> int:
     test_controller = TestController(ptc, toolbelt)
-    test_controller.run()
-    return 0
+    return test_controller.run(jobs=params.jobs, use_cache=not params.no_cache, prebuilt=params.prebuilt, since=params.since)
 
 
 @pytoolbelt_config(provide_ptc=True)
@@ -60,6 +69,27 @@ ACTIONS = {
     "run": {
         "func": run,
         "help": "Run the tests for a given toolbelt.",
+        "flags": {
+            "--jobs": {
+                "help": "Number of nox sessions to run at the same time, each in its own container.",
+                "type": int,
+                "default": 1,
+            },
+            "--no-cache": {
+                "help": "Run every session, including the sessions that passed before with the same tool, ptvenv and test image.",
+                "action": "store_true",
+                "default": False,
+            },
+            "--since": {
+                "help": "Only run the sessions of the tools affected by changes since this git ref, including the tools of changed ptvenvs.",
+                "required": False,
+            },
+            "--prebuilt": {
+                "help": "Run each session in a test image with the requirements of its ptvenv installed, built when the ptvenv changes.",
+                "action": "store_true",
+                "default": False,
+            },
+        },
     },
     "render": {
         "func": render,
@@ -1,13 +1,18 @@
 from dataclasses import dataclass
 from pathlib import Path
 
-from pytoolbelt.cli.controllers.tool_controller import ToolController
+from pytoolbelt.cli.controllers.tool_controller import (
+    ToolBatchController,
+    ToolController,
+)
 from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
 from pytoolbelt.core.data_classes.pytoolbelt_config import (
     PytoolbeltConfig,
     pytoolbelt_config,
 )
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.project.tool_components import ToolInstaller
 
 
 @dataclass
@@ -17,6 +22,21 @@ class ToolParameters(BaseEntrypointParameters):
     name: str
     dev_mode: bool
     from_config: bool
+    all: bool
+    names: str
+    jobs: int
+    install_ptvenvs: bool
+    mode: str
+    runs: int
+    args: str
+
+    @property
+    def is_batch_install(self) -> bool:
+        return self.action == "install" and (self.all or bool(self.names))
+
+    def __post_init__(self) -> None:
+        if not self.name and not self.is_batch_install:
+            raise PytoolbeltError(f"--name is required for tool {self.action}")
 
 
 @pytoolbelt_config()
@@ -31,10 +51,28 @@ def remove(toolbelt: ToolbeltConfig, params: ToolParameters) -> int:
     return tool.remove()
 
 
+@pytoolbelt_config(provide_ptc=True)
+def install(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: ToolParameters) -> int:
+    if params.is_batch_install:
+        names = [name.strip() for name in params.names.split(",")] if params.names else None
+        batch = ToolBatchController(toolbelt, names)
+        return batch.install(
+            dev_mode=params.dev_mode,
+            from_config=params.from_config,
+            jobs=params.jobs,
+            install_ptvenvs=params.install_ptvenvs,
+            installer=ptc.installer,
+            mode=params.mode,
+        )
+
+    tool = ToolController.for_installation(params.name, toolbelt)
+    return tool.install(dev_mode=params.dev_mode, from_config=params.from_config, mode=params.mode)
+
+
 @pytoolbelt_config()
-def install(toolbelt: ToolbeltConfig, params: ToolParameters) -> int:
+def bench(toolbelt: ToolbeltConfig, params: ToolParameters) -> int:
     tool = ToolController.for_installation(params.name, toolbelt)
-    return tool.install(dev_mode=params.dev_mode, from_config=params.from_config)
+    return tool.bench(runs=params.runs, args=params.args.split())
 
 
 @pytoolbelt_config(provide_ptc=True)
@@ -52,7 +90,7 @@ def release(ptc: PytoolbeltConfig, toolbelt: ToolbeltConfig, params: ToolParamet
 COMMON_FLAGS = {
     "--name": {
         "help": "Name of the tool",
-        "required": True,
+        "required": False,
     },
     "--toolbelt": {
         "help": "The name of the toolbelt to target.",
@@ -81,6 +119,45 @@ ACTIONS = {
                 "action": "store_true",
                 "default": False,
             },
+            "--all": {
+                "help": "Install every tool in the toolbelt",
+                "action": "store_true",
+                "default": False,
+            },
+            "--names": {
+                "help": "Comma separated names of the tools to install",
+                "required": False,
+            },
+            "--jobs": {
+                "help": "Number of tools to install at the same time when installing with --all or --names",
+                "type": int,
+                "default": 4,
+            },
+            "--mode": {
+                "help": "How the tool is installed. compiled and extracted include precompiled bytecode for a faster startup",
+                "choices": ToolInstaller.INSTALL_MODES,
+                "default": "zipapp",
+            },
+            "--install-ptvenvs": {
+                "help": "Install the ptvenvs of the tools that are not installed yet when installing with --all or --names",
+                "action": "store_true",
+                "default": False,
+            },
+        },
+    },
+    "bench": {
+        "func": bench,
+        "help": "Benchmark the startup time of the tool for each install mode",
+        "flags": {
+            "--runs": {
+                "help": "Number of warm runs to time after the cold run",
+                "type": int,
+                "default": 10,
+            },
+            "--args": {
+                "help": "Arguments to run the tool with",
+                "default": "--help",
+            },
         },
     },
     "bump": {
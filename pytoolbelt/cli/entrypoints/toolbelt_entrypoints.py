@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from pytoolbelt.cli.controllers.toolbelt_controller import ToolbeltController
 from pytoolbelt.cli.entrypoints.bases.base_parameters import BaseEntrypointParameters
@@ -14,11 +15,22 @@ class ToolbeltParameters(BaseEntrypointParameters):
     toolbelt: str
     this_toolbelt: bool
     fetch: bool
+    clone_filter: Optional[str] = None
+    depth: Optional[int] = None
+    sparse: bool = False
+    jobs: Optional[int] = None
+    timeout: Optional[float] = None
 
     def __post_init__(self):
         if self.action == "add":
             self._validate_on_add_action()
 
+        if self.depth is not None and self.depth < 1:
+            raise PytoolbeltError("--depth must be at least 1.")
+
+        if self.timeout is not None and self.timeout <= 0:
+            raise PytoolbeltError("--timeout must be greater than 0.")
+
         if self.toolbelt and not self.toolbelt.endswith("-toolbelt"):
             raise PytoolbeltError("Toolbelt name must end with '-toolbelt'.")
 
@@ -53,7 +65,12 @@ def show(params: ToolbeltParameters) -> int:
 @pytoolbelt_config()
 def fetch(toolbelt: ToolbeltConfig, params: ToolbeltParameters) -> int:
     controller = ToolbeltController()
-    return controller.fetch(toolbelt=toolbelt)
+    return controller.fetch(toolbelt=toolbelt, clone_filter=params.clone_filter, depth=params.depth, sparse=params.sparse)
+
+
+def sync(params: ToolbeltParameters) -> int:
+    controller = ToolbeltController()
+    return controller.sync(jobs=params.jobs, timeout=params.timeout, clone_filter=params.clone_filter, depth=params.depth, sparse=params.sparse)
 
 
 COMMON_FLAGS = {}
@@ -107,7 +124,53 @@ ACTIONS = {
                 "help": "The name of the toolbelt to fetch.",
                 "required": False,
                 "default": Path.cwd().name,
-            }
+            },
+            "--filter": {
+                "help": "Partial clone filter, for example blob:none. Missing objects are fetched when they are needed.",
+                "required": False,
+                "dest": "clone_filter",
+            },
+            "--depth": {
+                "help": "Only fetch this many commits of history for the branch and for every release tag.",
+                "required": False,
+                "type": int,
+            },
+            "--sparse": {
+                "help": "Only check out the files in the root of the toolbelt and the tools and ptvenv directories.",
+                "action": "store_true",
+                "default": False,
+            },
+        },
+    },
+    "sync": {
+        "func": sync,
+        "help": "Clone missing toolbelts and update the existing ones from the global config.",
+        "flags": {
+            "--jobs": {
+                "help": "Number of toolbelts to sync at the same time.",
+                "type": int,
+                "default": 4,
+            },
+            "--timeout": {
+                "help": "Seconds after which a git command contacting a remote is killed and the toolbelt fails to sync.",
+                "type": float,
+                "default": 300,
+            },
+            "--filter": {
+                "help": "Partial clone filter for toolbelts that are cloned, for example blob:none.",
+                "required": False,
+                "dest": "clone_filter",
+            },
+            "--depth": {
+                "help": "Only fetch this many commits of history for toolbelts that are cloned.",
+                "required": False,
+                "type": int,
+            },
+            "--sparse": {
+                "help": "Sparse checkout of the tools and ptvenv directories for toolbelts that are cloned.",
+                "action": "store_true",
+                "default": False,
+            },
         },
     },
 }
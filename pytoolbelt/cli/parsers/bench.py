@@ -0,0 +1,28 @@
+from argparse import Namespace
+from typing import Any
+
+from pytoolbelt.cli import COMMANDS
+from pytoolbelt.cli.controllers.bench_controller import (
+    COMMON_FLAGS,
+    BenchController,
+    BenchParameters,
+)
+from pytoolbelt.core.error_handling.error_handler import handle_cli_errors
+from pytoolbelt.core.tools import build_entrypoint_parsers
+
+
+@handle_cli_errors
+def entrypoint(cliargs: Namespace) -> int:
+    params = BenchParameters.from_cliargs(cliargs)
+    controller = BenchController(runs=params.runs)
+    return controller.bench(output=params.output, baseline=params.baseline, threshold=params.threshold)
+
+
+def configure_parser(subparser: Any) -> None:
+    build_entrypoint_parsers(
+        subparser=subparser,
+        name="bench",
+        root_help=COMMANDS["bench"],
+        entrypoint=entrypoint,
+        common_flags=COMMON_FLAGS,
+    )
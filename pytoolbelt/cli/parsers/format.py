@@ -1,6 +1,7 @@
 from argparse import Namespace
 from typing import Any
 
+from pytoolbelt.cli import COMMANDS
 from pytoolbelt.cli.controllers.format_controller import (
     COMMON_FLAGS,
     FormatController,
@@ -22,7 +23,7 @@ def configure_parser(subparser: Any) -> None:
     build_entrypoint_parsers(
         subparser=subparser,
         name="format",
-        root_help="Format tools in a pytoolbelt.",
+        root_help=COMMANDS["format"],
         entrypoint=entrypoint,
         common_flags=COMMON_FLAGS,
     )
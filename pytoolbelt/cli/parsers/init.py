@@ -1,6 +1,7 @@
 from argparse import Namespace
 from typing import Any
 
+from pytoolbelt.cli import COMMANDS
 from pytoolbelt.cli.controllers.init_controller import InitController
 from pytoolbelt.core.error_handling.error_handler import handle_cli_errors
 from pytoolbelt.core.tools import build_entrypoint_parsers
@@ -15,7 +16,7 @@ def configure_parser(subparser: Any) -> None:
     build_entrypoint_parsers(
         subparser=subparser,
         name="init",
-        root_help="Initialize .pytoolbelt home directory",
+        root_help=COMMANDS["init"],
         entrypoint=entrypoint,
         common_flags={
             "--path": {
@@ -1,6 +1,7 @@
 from argparse import Namespace
 from typing import Any
 
+from pytoolbelt.cli import COMMANDS
 from pytoolbelt.cli.controllers.installed_controller import (
     COMMON_FLAGS,
     InstalledController,
@@ -21,7 +22,7 @@ def configure_parser(subparser: Any) -> None:
     build_entrypoint_parsers(
         subparser=subparser,
         name="installed",
-        root_help="See installed components from any pytoolbelt",
+        root_help=COMMANDS["installed"],
         entrypoint=entrypoint,
         common_flags=COMMON_FLAGS,
     )
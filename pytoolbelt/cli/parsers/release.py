@@ -1,6 +1,7 @@
 from argparse import Namespace
 from typing import Any
 
+from pytoolbelt.cli import COMMANDS
 from pytoolbelt.cli.controllers.release_controller import (
     COMMON_FLAGS,
     ReleaseController,
@@ -14,15 +15,14 @@ from pytoolbelt.core.tools import build_entrypoint_parsers
 def entrypoint(cliargs: Namespace) -> int:
     params = ReleaseParameters.from_cliargs(cliargs)
     controller = ReleaseController()
-    controller.release(params=params)
-    return 0
+    return controller.release(params=params)
 
 
 def configure_parser(subparser: Any) -> None:
     build_entrypoint_parsers(
         subparser=subparser,
         name="release",
-        root_help="Make releases for a pytoolbelt.",
+        root_help=COMMANDS["release"],
         entrypoint=entrypoint,
         common_flags=COMMON_FLAGS,
     )
@@ -1,6 +1,7 @@
 from argparse import Namespace
 from typing import Any
 
+from pytoolbelt.cli import COMMANDS
 from pytoolbelt.cli.controllers.releases_controller import (
     COMMON_FLAGS,
     ReleasesController,
@@ -14,14 +15,14 @@ from pytoolbelt.core.tools import build_entrypoint_parsers
 def entrypoint(cliargs: Namespace) -> int:
     params = ReleasesParameters.from_cliargs(cliargs)
     controller = ReleasesController(toolbelt=params.toolbelt)
-    return controller.releases(ptvenv=params.ptvenv, tools=params.tools, _all=params.all)
+    return controller.releases(ptvenv=params.ptvenv, tools=params.tools, _all=params.all, offline=params.offline)
 
 
 def configure_parser(subparser: Any) -> None:
     build_entrypoint_parsers(
         subparser=subparser,
         name="releases",
-        root_help="See Releases for a configured pytoolbelt.",
+        root_help=COMMANDS["releases"],
         entrypoint=entrypoint,
         common_flags=COMMON_FLAGS,
     )
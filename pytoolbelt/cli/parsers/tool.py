@@ -1,6 +1,7 @@
 from argparse import Namespace
 from typing import Any
 
+from pytoolbelt.cli import COMMANDS
 from pytoolbelt.cli.entrypoints import tool_entrypoints
 from pytoolbelt.core.error_handling.error_handler import handle_cli_errors
 from pytoolbelt.core.tools import build_entrypoint_parsers
@@ -17,7 +18,7 @@ def configure_parser(subparser: Any) -> None:
     build_entrypoint_parsers(
         subparser=subparser,
         name="tool",
-        root_help="Interact with pytoolbelt tools",
+        root_help=COMMANDS["tool"],
         entrypoint=entrypoint,
         actions=tool_entrypoints.ACTIONS,
         common_flags=tool_entrypoints.COMMON_FLAGS,
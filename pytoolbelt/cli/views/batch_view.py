@@ -0,0 +1,27 @@
+from typing import Optional
+
+from pytoolbelt.core.tools.batch import BatchResult
+
+from .base_view import BaseTableView
+
+
+class BatchSummaryTableView(BaseTableView):
+    def __init__(self, title: str, version_header: Optional[str] = "Version") -> None:
+        # the version column is left out when the tasks have no version.
+        self.show_version = version_header is not None
+        headers = [{"header": "Name", "style": "cyan", "justify": "right"}]
+        if self.show_version:
+            headers.append({"header": version_header, "style": "magenta", "justify": "center"})
+        headers.extend(
+            [
+                {"header": "Status", "justify": "center"},
+                {"header": "Duration", "style": "green", "justify": "right"},
+                {"header": "Message", "style": "yellow"},
+            ]
+        )
+        super().__init__(title=title, headers=headers)
+
+    def add_row(self, result: BatchResult) -> None:
+        style = {"success": "green", "cached": "cyan", "skipped": "yellow"}.get(result.status, "red")
+        columns = [result.name, result.version] if self.show_version else [result.name]
+        super().add_row(*columns, f"[{style}]{result.status}[/{style}]", f"{result.duration:.1f}s", result.message)
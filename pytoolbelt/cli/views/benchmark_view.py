@@ -0,0 +1,43 @@
+from pytoolbelt.core.tools.benchmark import BenchmarkComparison, BenchmarkResult
+
+from .base_view import BaseTableView
+
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f} ms"
+
+
+class BenchmarkTableView(BaseTableView):
+    def __init__(self, title: str) -> None:
+        super().__init__(
+            title=title,
+            headers=[
+                {"header": "Name", "style": "cyan", "justify": "right"},
+                {"header": "Cold", "style": "magenta", "justify": "right"},
+                {"header": "Mean", "style": "green", "justify": "right"},
+                {"header": "Median", "style": "green", "justify": "right"},
+                {"header": "Min", "justify": "right"},
+                {"header": "Max", "justify": "right"},
+            ],
+        )
+
+    def add_row(self, result: BenchmarkResult) -> None:
+        super().add_row(result.name, format_ms(result.cold), format_ms(result.mean), format_ms(result.median), format_ms(result.min), format_ms(result.max))
+
+
+class BenchmarkComparisonTableView(BaseTableView):
+    def __init__(self, title: str) -> None:
+        super().__init__(
+            title=title,
+            headers=[
+                {"header": "Name", "style": "cyan", "justify": "right"},
+                {"header": "Baseline", "style": "magenta", "justify": "right"},
+                {"header": "Current", "style": "green", "justify": "right"},
+                {"header": "Change", "justify": "right"},
+                {"header": "Status", "justify": "center"},
+            ],
+        )
+
+    def add_row(self, comparison: BenchmarkComparison) -> None:
+        status = "[red]regressed[/red]" if comparison.regressed else "[green]ok[/green]"
+        super().add_row(comparison.name, format_ms(comparison.baseline), format_ms(comparison.current), f"{comparison.change:+.1f}%", status)
@@ -0,0 +1,28 @@
+import time
+from typing import List
+
+from pytoolbelt.core.tools.wheel_cache import WheelCache, WheelCacheEntry
+
+from .base_view import BaseTableView
+
+
+def format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class WheelCacheTableView(BaseTableView):
+    def __init__(self, wheel_cache: WheelCache, entries: List[WheelCacheEntry]) -> None:
+        total_size = sum(entry.size for entry in entries)
+        super().__init__(
+            title=f"Wheel Cache {wheel_cache.root} -- {format_size(total_size)} of {format_size(wheel_cache.max_size)}",
+            headers=[
+                {"header": "Key", "style": "cyan", "justify": "right"},
+                {"header": "Wheels", "style": "magenta", "justify": "center"},
+                {"header": "Size", "style": "green", "justify": "center"},
+                {"header": "Last Used", "style": "yellow"},
+            ],
+        )
+
+    def add_row(self, entry: WheelCacheEntry) -> None:
+        last_used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.last_used))
+        super().add_row(entry.key[:12], str(entry.wheels), format_size(entry.size), last_used)
@@ -1,5 +1,6 @@
 from pytoolbelt.cli.views.base_view import BaseTableView
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
+from pytoolbelt.core.project.release_plan import ReleasePlanEntry
 
 
 class ReleasesTableView(BaseTableView):
@@ -36,3 +37,24 @@ class ReleasesTableView(BaseTableView):
         url = f"https://github.com/{self.toolbelt.owner}/{self.toolbelt.name}/tree/{commit}/{self.component}/{name}"
         display_text = f"View Release -- {name}-{version}"
         return f"[link={url}]{display_text}[/link]"
+
+
+class ReleasePlanTableView(BaseTableView):
+    STATUS_STYLES = {"new": "green", "changed": "green", "unchanged": "white", "unbumped": "red"}
+
+    def __init__(self, toolbelt: str) -> None:
+        super().__init__(
+            title=f"Release Plan for {toolbelt}",
+            headers=[
+                {"header": "Kind", "style": "blue", "justify": "right"},
+                {"header": "Name", "style": "cyan", "justify": "right"},
+                {"header": "Version", "style": "magenta", "justify": "center"},
+                {"header": "Status", "justify": "center"},
+                {"header": "Last Release", "style": "yellow"},
+            ],
+        )
+
+    def add_row(self, entry: ReleasePlanEntry) -> None:
+        style = self.STATUS_STYLES.get(entry.status, "white")
+        component = entry.component
+        super().add_row(component.kind, component.name, str(component.version), f"[{style}]{entry.status}[/{style}]", entry.last_release or "")
@@ -1,4 +1,31 @@
-from jinja2 import Environment, PackageLoader
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from pytoolbelt.environment.config import PYTOOLBELT_TEMPLATE_CACHE_DIR, get_logger
+
+if TYPE_CHECKING:
+    from jinja2 import BytecodeCache, Environment
+
+logger = get_logger(__name__)
+
+_jinja_env: Optional["Environment"] = None
+_jinja_env_lock = threading.Lock()
+
+
+def get_bytecode_cache() -> Optional["BytecodeCache"]:
+    """
+    used to get the cache compiled templates are kept in between runs. Jinja checks the source of a
+    template against its cached bytecode, so a template changed by an upgrade of pytoolbelt is compiled again.
+    Returns: the bytecode cache, or None if the cache directory can not be created
+    """
+    from jinja2 import FileSystemBytecodeCache
+
+    try:
+        PYTOOLBELT_TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.debug(f"Unable to create the template cache at {PYTOOLBELT_TEMPLATE_CACHE_DIR} :: {e}")
+        return None
+    return FileSystemBytecodeCache(directory=PYTOOLBELT_TEMPLATE_CACHE_DIR.as_posix())
 
 
 class BaseTemplater:
@@ -6,13 +33,22 @@ class BaseTemplater:
         self.jinja_env = self.get_jinja_environment()
 
     @staticmethod
-    def get_jinja_environment() -> Environment:
+    def get_jinja_environment() -> "Environment":
         """
-        used to get a jinja2 templating environment.
+        used to get the jinja2 templating environment shared by every templater in the process, so each
+        template is loaded and compiled at most once per run. jinja2 is imported here, as it is only
+        needed by the commands that template files and is slow to import.
         Returns: Jinja2 Environment
         """
-        loader = PackageLoader(package_name="pytoolbelt", package_path="templates")
-        return Environment(loader=loader, trim_blocks=True, lstrip_blocks=True)
+        global _jinja_env
+
+        with _jinja_env_lock:
+            if _jinja_env is None:
+                from jinja2 import Environment, PackageLoader
+
+                loader = PackageLoader(package_name="pytoolbelt", package_path="templates")
+                _jinja_env = Environment(loader=loader, trim_blocks=True, lstrip_blocks=True, bytecode_cache=get_bytecode_cache())
+            return _jinja_env
 
     @staticmethod
     def format_template_name(file_name: str) -> str:
@@ -2,11 +2,11 @@ from functools import wraps
 from pathlib import Path
 from typing import Optional
 
-import yaml
 from pydantic import BaseModel
 
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfigs
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools.config_io import load_yaml
 
 
 class PytoolbeltConfig(BaseModel):
@@ -15,13 +15,13 @@ class PytoolbeltConfig(BaseModel):
     envfile: str
     release_branch: str
     test_image: str
+    installer: str = "pip"
 
     @classmethod
     def load(cls, root_path: Path) -> "PytoolbeltConfig":
         config_path = root_path / "pytoolbelt.yml"
         try:
-            with config_path.open("r") as file:
-                config = yaml.safe_load(file)["project-config"]
+            config = load_yaml(config_path)["project-config"]
         except FileNotFoundError:
             raise PytoolbeltError("Pytoolbelt config file not found")
         return cls(**config)
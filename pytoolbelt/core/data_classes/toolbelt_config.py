@@ -2,15 +2,14 @@
 TODO: Add tests
 """
 
-import os
 from pathlib import Path
 from typing import Dict, Optional
 
 import giturlparse
-import yaml
 from pydantic import BaseModel
 
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools.config_io import dump_yaml, load_yaml
 from pytoolbelt.environment.config import (
     PYTOOLBELT_TOOLBELT_CONFIG_FILE,
     PYTOOLBELT_TOOLBELT_INSTALL_DIR,
@@ -46,12 +45,10 @@ class ToolbeltConfigs(BaseModel):
 
     @classmethod
     def load(cls) -> "ToolbeltConfigs":
-        with PYTOOLBELT_TOOLBELT_CONFIG_FILE.open("r") as file:
-            raw_data = os.path.expandvars(file.read())
-            config = yaml.safe_load(raw_data)["repos"]
-            if not config:
-                config = {}
-            repos = {name: ToolbeltConfig(**repo) for name, repo in config.items()}
+        config = load_yaml(PYTOOLBELT_TOOLBELT_CONFIG_FILE, expand_vars=True)["repos"]
+        if not config:
+            config = {}
+        repos = {name: ToolbeltConfig(**repo) for name, repo in config.items()}
         return cls(repos=repos)
 
     def get(self, key: str) -> ToolbeltConfig:
@@ -64,8 +61,7 @@ class ToolbeltConfigs(BaseModel):
         self.repos[repo.name] = repo
 
     def save(self) -> None:
-        with PYTOOLBELT_TOOLBELT_CONFIG_FILE.open("w") as file:
-            yaml.safe_dump(
-                {"repos": {name: repo.to_dict() for name, repo in self.repos.items()}},
-                file,
-            )
+        dump_yaml(
+            PYTOOLBELT_TOOLBELT_CONFIG_FILE,
+            {"repos": {name: repo.to_dict() for name, repo in self.repos.items()}},
+        )
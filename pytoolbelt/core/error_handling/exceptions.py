@@ -64,3 +64,11 @@ class ToolbeltFetchError(Exception):
 
 class PytoolbeltError(Exception):
     pass
+
+
+class PtVenvUpToDateError(PytoolbeltError):
+    pass
+
+
+class BenchmarkError(PytoolbeltError):
+    pass
@@ -1,9 +1,10 @@
+import os
+import re
 import shutil
-import subprocess
+import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import yaml
 from pydantic import BaseModel
 from semver import Version
 
@@ -15,9 +16,17 @@ from pytoolbelt.core.error_handling.exceptions import (
     PythonEnvBuildError,
     PytoolbeltError,
 )
+from pytoolbelt.core.project.ptvenv_lock import PtVenvLock, lock_platform
 from pytoolbelt.core.project.tool_components import ToolConfig
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
-from pytoolbelt.core.tools import hash_config
+from pytoolbelt.core.tools import hash_config, run_command, timed
+from pytoolbelt.core.tools.config_io import IndentedSafeDumper, dump_yaml, load_yaml
+from pytoolbelt.core.tools.dedup_store import DedupStore
+from pytoolbelt.core.tools.installers import BaseInstaller, PipInstaller
+from pytoolbelt.core.tools.wheel_cache import WheelCache
+from pytoolbelt.environment.config import PYTOOLBELT_DEDUP_PTVENVS, get_logger
+
+logger = get_logger(__name__)
 
 
 class PtVenvConfig(BaseModel):
@@ -31,10 +40,12 @@ class PtVenvConfig(BaseModel):
 
     @classmethod
     def from_file(cls, file_path: Path) -> "PtVenvConfig":
-        with file_path.open("r") as f:
-            raw_data = yaml.safe_load(f)
-            raw_data["version"] = Version.parse(raw_data["version"])
-            return cls(**raw_data)
+        return cls.from_dict(load_yaml(file_path))
+
+    @classmethod
+    def from_dict(cls, raw_data: dict) -> "PtVenvConfig":
+        raw_data = dict(raw_data, version=Version.parse(str(raw_data["version"])))
+        return cls(**raw_data)
 
     def to_dict(self) -> dict:
         return {
@@ -45,11 +56,6 @@ class PtVenvConfig(BaseModel):
         }
 
 
-class IndentedSafeDumper(yaml.SafeDumper):
-    def increase_indent(self, flow=False, indentless=False):
-        return super(IndentedSafeDumper, self).increase_indent(flow, False)
-
-
 class PtVenvPaths(BasePaths):
     def __init__(self, meta: ComponentMetadata, toolbelt_paths: "ToolbeltPaths") -> None:
         self._meta = meta
@@ -75,6 +81,10 @@ class PtVenvPaths(BasePaths):
     def ptvenv_hash_filename(self) -> str:
         return f"{self.meta.name}.sha256"
 
+    @property
+    def ptvenv_lock_filename(self) -> str:
+        return f"{self.meta.name}.lock"
+
     @property
     def meta(self) -> ComponentMetadata:
         return self._meta
@@ -91,6 +101,10 @@ class PtVenvPaths(BasePaths):
     def ptvenv_config_file(self) -> Path:
         return self.ptvenv_dir / self.ptvenv_filename
 
+    @property
+    def ptvenv_lock_file(self) -> Path:
+        return self.ptvenv_dir / self.ptvenv_lock_filename
+
     @property
     def ptvenv_readme_file(self) -> Path:
         return self.ptvenv_dir / "README.md"
@@ -127,6 +141,14 @@ class PtVenvPaths(BasePaths):
     def installed_hash_file(self) -> Path:
         return self.install_version_dir / self.ptvenv_hash_filename
 
+    @property
+    def installed_lock_file(self) -> Path:
+        return self.install_version_dir / self.ptvenv_lock_filename
+
+    @property
+    def installed_dedup_manifest_file(self) -> Path:
+        return self.install_version_dir / DedupStore.MANIFEST_FILENAME
+
     @property
     def python_executable_path(self) -> Path:
         return self.install_dir / "bin" / "python"
@@ -147,6 +169,22 @@ class PtVenvPaths(BasePaths):
         destination = self.install_version_dir / f"{self.meta.name}.yml"
         shutil.copy(self.ptvenv_config_file, destination)
 
+    def copy_lock_to_install_dir(self) -> None:
+        if self.ptvenv_lock_file.exists():
+            shutil.copy(self.ptvenv_lock_file, self.installed_lock_file)
+        else:
+            self.installed_lock_file.unlink(missing_ok=True)
+
+    def read_lock(self) -> Optional[str]:
+        if not self.ptvenv_lock_file.exists():
+            return None
+        return self.ptvenv_lock_file.read_text()
+
+    def read_installed_lock(self) -> Optional[str]:
+        if not self.installed_lock_file.exists():
+            return None
+        return self.installed_lock_file.read_text()
+
     def list_installed_versions(self) -> List[Version]:
         if not self.install_root_dir.exists():
             return []
@@ -160,14 +198,13 @@ class PtVenvPaths(BasePaths):
             return None
 
     def write_to_config_file(self, config: PtVenvConfig) -> None:
-        with self.ptvenv_config_file.open("w") as f:
-            yaml.dump(
-                config.to_dict(),
-                f,
-                Dumper=IndentedSafeDumper,
-                sort_keys=False,
-                indent=2,
-            )
+        dump_yaml(
+            self.ptvenv_config_file,
+            config.to_dict(),
+            Dumper=IndentedSafeDumper,
+            sort_keys=False,
+            indent=2,
+        )
 
 
 class PtVenvTemplater(BaseTemplater):
@@ -182,38 +219,112 @@ class PtVenvTemplater(BaseTemplater):
 
 
 class PtVenvBuilder:
-    def __init__(self, paths: PtVenvPaths):
+    def __init__(
+        self,
+        paths: PtVenvPaths,
+        installer: Optional[BaseInstaller] = None,
+        wheel_cache: Optional[WheelCache] = None,
+        dedup_store: Optional[DedupStore] = None,
+        output_prefix: Optional[str] = None,
+    ):
         self.paths = paths
         self.ptvenv = None
+        self.lock: Optional[PtVenvLock] = None
+        self.lock_text: Optional[str] = None
+        self.output_prefix = output_prefix
+        self.installer = installer or PipInstaller()
+        self.wheel_cache = wheel_cache or WheelCache()
+        self.dedup_store = dedup_store or DedupStore(venv_install_dir=paths.toolbelt_paths.venv_install_dir)
+
+    @staticmethod
+    def requirement_name(requirement: str) -> str:
+        match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", requirement)
+        if not match:
+            return requirement
+        return re.sub(r"[-_.]+", "-", match.group(1)).lower()
+
+    @property
+    def requirements(self) -> List[str]:
+        return self.lock.pins if self.lock else self.ptvenv.requirements
 
     @property
     def create_command(self) -> List[str]:
-        return [
-            f"python{self.ptvenv.python_version}",
-            "-m",
-            "venv",
-            self.paths.install_dir.as_posix(),
-            "--clear",
-        ]
-
-    @property
-    def install_requirements_command(self) -> List[str]:
-        return [
-            self.paths.pip_executable_path.as_posix(),
-            "install",
-            *self.ptvenv.requirements,
-        ]
+        return self.installer.create_command(self.ptvenv.python_version, self.paths)
+
+    @property
+    def relocate_command(self) -> List[str]:
+        return self.installer.relocate_command(self.ptvenv.python_version, self.paths)
+
+    @property
+    def check_command(self) -> List[str]:
+        return self.installer.check_command(self.paths)
+
+    def install_requirements_command(self, requirements: List[str]) -> List[str]:
+        return self.installer.install_command(self.paths, requirements)
+
+    def uninstall_requirements_command(self, names: List[str]) -> List[str]:
+        return self.installer.uninstall_command(self.paths, names)
+
+    def build_wheels_command(self, wheel_dir: Path, requirements: List[str]) -> List[str]:
+        return self.installer.wheel_command(self.paths, wheel_dir, requirements)
+
+    def cached_install_requirements_command(self, wheel_dir: Path, requirements: List[str]) -> List[str]:
+        return self.installer.install_command(self.paths, requirements, find_links=wheel_dir)
+
+    def run(self, command: List[str]) -> int:
+        return run_command(command, prefix=self.output_prefix).returncode
 
     def load_config(self) -> None:
         self.ptvenv = PtVenvConfig.from_file(self.paths.ptvenv_config_file)
+        self.lock_text = self.paths.read_lock()
+        if self.lock_text is not None:
+            self.lock = PtVenvLock.from_text(self.lock_text)
+            self.lock.raise_if_stale(self.ptvenv)
+            self.lock.raise_if_wrong_platform(self.ptvenv, lock_platform())
 
     def create_install_dir(self) -> None:
         self.paths.install_dir.mkdir(parents=True, exist_ok=True)
 
+    def populate_wheel_cache(self, key: str, requirements: List[str]) -> None:
+        staging_dir = self.wheel_cache.create_staging_dir(key)
+        if self.run(self.build_wheels_command(staging_dir, requirements)) != 0:
+            logger.info(f"Unable to build wheels for python environment {self.ptvenv.name}, installing without the wheel cache.")
+            self.wheel_cache.discard(staging_dir)
+            return
+
+        self.wheel_cache.commit(key, staging_dir)
+
+    def run_install_requirements(self, requirements: List[str]) -> int:
+        if not self.installer.supports_wheel_cache:
+            return self.run(self.install_requirements_command(requirements))
+
+        key = self.wheel_cache.get_key(self.ptvenv.python_version, requirements)
+
+        if self.wheel_cache.has(key):
+            logger.debug(f"Wheel cache hit for python environment {self.ptvenv.name} :: {key}")
+        else:
+            logger.debug(f"Wheel cache miss for python environment {self.ptvenv.name} :: {key}")
+            self.populate_wheel_cache(key, requirements)
+
+        if self.wheel_cache.has(key):
+            self.wheel_cache.touch(key)
+            return self.run(self.cached_install_requirements_command(self.wheel_cache.entry_dir(key), requirements))
+        return self.run(self.install_requirements_command(requirements))
+
+    def run_install_locked(self, pins: List[str]) -> int:
+        # locked installs skip the wheel cache, the archives pip downloads are checked against the hashes in the lock.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_file = Path(tmp_dir) / self.paths.ptvenv_lock_filename
+            lock_file.write_text("\n".join(pins) + "\n")
+            return self.run(self.installer.locked_install_command(self.paths, lock_file))
+
     def install_requirements(self) -> None:
-        result = subprocess.run(self.install_requirements_command)
+        if self.lock:
+            returncode = self.run_install_locked(self.lock.pins)
+        else:
+            returncode = self.run_install_requirements(self.ptvenv.requirements)
 
-        if result.returncode != 0:
+        if returncode != 0:
             self.remove_build_on_failure()
             raise PythonEnvBuildError(f"Failed to install requirements for python environment {self.ptvenv.name}")
 
@@ -221,17 +332,153 @@ class PtVenvBuilder:
         if self.paths.install_version_dir.exists():
             shutil.rmtree(self.paths.install_version_dir)
 
-    def build(self) -> None:
-        self.load_config()
+    def deduplicate(self) -> None:
+        try:
+            result = self.dedup_store.deduplicate(self.paths.install_dir, self.paths.installed_dedup_manifest_file)
+        except OSError as e:
+            # dedup is only an optimization, a failure here should never fail the build.
+            logger.info(f"Unable to deduplicate python environment {self.ptvenv.name} :: {e}")
+            return
+        logger.debug(f"Linked {result.linked} of {result.files} files in {self.ptvenv.name}, saving {result.saved} bytes.")
+
+    def get_incremental_base(self) -> Optional[Tuple[PtVenvPaths, PtVenvConfig]]:
+        """
+        used to find the installed version an incremental build can start from.
+        Returns: the paths and installed config of the newest installed version, or None if a clean build is required
+        """
+        latest_version = self.paths.get_latest_installed_version()
+        if latest_version is None or latest_version == self.paths.meta.version:
+            return None
+
+        base_meta = ComponentMetadata(name=self.paths.meta.name, version=latest_version, kind="ptvenv")
+        base_paths = PtVenvPaths(base_meta, self.paths.toolbelt_paths)
+
+        if not base_paths.install_dir.exists() or not base_paths.installed_config_file.exists():
+            return None
+
+        base_config = PtVenvConfig.from_file(base_paths.installed_config_file)
+        if base_config.python_version != self.ptvenv.python_version:
+            logger.info(f"Python version changed since {self.ptvenv.name} version {latest_version}, running a clean build.")
+            return None
+
+        if base_paths.installed_lock_file.exists() != (self.lock is not None):
+            logger.info(f"Lock of {self.ptvenv.name} added or removed since version {latest_version}, running a clean build.")
+            return None
+
+        return base_paths, base_config
+
+    def relocate_scripts(self, old_install_dir: Path) -> None:
+        # console scripts have the absolute path of the venv interpreter in their shebang.
+        old_prefix = f"#!{old_install_dir.as_posix()}/"
+        new_prefix = f"#!{self.paths.install_dir.as_posix()}/"
+
+        for script in (self.paths.install_dir / "bin").iterdir():
+            if script.is_symlink() or not script.is_file():
+                continue
+
+            with script.open("rb") as f:
+                if not f.read(len(old_prefix)) == old_prefix.encode("utf-8"):
+                    continue
+
+            content = script.read_bytes().replace(old_prefix.encode("utf-8"), new_prefix.encode("utf-8"), 1)
+            tmp_script = script.with_name(f".{script.name}.tmp")
+            tmp_script.write_bytes(content)
+            tmp_script.chmod(script.stat().st_mode & 0o777)
+            os.replace(tmp_script, script)
+
+    def build_incremental(self) -> bool:
+        """
+        used to build the ptvenv from a copy of the newest installed version, only installing and uninstalling
+        the requirements that changed between the two definitions. Without a lock, the dependencies of a removed
+        or changed requirement are not known, so uninstalling it could leave packages behind that a clean build
+        would not install. Only added requirements are built incrementally then. A lock pins every package, so
+        any change to it is applied exactly.
+        Returns: True if the incremental build succeeded, False if a clean build is required
+        """
+        base = self.get_incremental_base()
+        if base is None:
+            return False
+
+        base_paths, base_config = base
+        base_requirements = PtVenvLock.from_file(base_paths.installed_lock_file).pins if self.lock else base_config.requirements
+        added = [r for r in self.requirements if r not in base_requirements]
+        kept_names = {self.requirement_name(r) for r in self.requirements}
+        base_names = {self.requirement_name(r) for r in base_requirements}
+        removed = sorted(base_names - kept_names)
+
+        changed = [r for r in added if self.requirement_name(r) in base_names]
+        if not self.lock and (removed or changed):
+            logger.info(f"Requirements of {self.ptvenv.name} were removed or changed since version {base_config.version}, running a clean build.")
+            return False
+
+        logger.info(f"Building {self.ptvenv.name} incrementally from version {base_config.version} :: {len(added)} to install, {len(removed)} to remove.")
+
+        self.remove_build_on_failure()
+        self.paths.install_version_dir.mkdir(parents=True, exist_ok=True)
+
+        with timed(logger, f"Relocating a copy of {self.ptvenv.name} version {base_config.version}"):
+            shutil.copytree(base_paths.install_dir, self.paths.install_dir, symlinks=True)
+
+            if self.run(self.relocate_command) != 0:
+                return self.abandon_incremental_build()
+            self.relocate_scripts(base_paths.install_dir)
+
+        if removed and self.run(self.uninstall_requirements_command(removed)) != 0:
+            return self.abandon_incremental_build()
+
+        if added:
+            with timed(logger, f"Installing changed requirements for {self.ptvenv.name} with {self.installer.name}"):
+                returncode = self.run_install_locked(added) if self.lock else self.run_install_requirements(added)
+            if returncode != 0:
+                return self.abandon_incremental_build()
+
+        if self.run(self.check_command) != 0:
+            return self.abandon_incremental_build()
+
+        return True
+
+    def abandon_incremental_build(self) -> bool:
+        logger.info(f"Incremental build of {self.ptvenv.name} failed validation, running a clean build.")
+        self.remove_build_on_failure()
+        return False
+
+    def build_clean(self) -> None:
         self.create_install_dir()
-        result = subprocess.run(self.create_command)
 
-        if result.returncode != 0:
+        with timed(logger, f"Creating python environment {self.ptvenv.name} with {self.installer.name}"):
+            returncode = self.run(self.create_command)
+
+        if returncode != 0:
             self.remove_build_on_failure()
             raise PythonEnvBuildError(f"Failed to create the python virtual environment {self.ptvenv.name}")
 
-        if self.ptvenv.requirements:
-            self.install_requirements()
+        if self.requirements:
+            with timed(logger, f"Installing requirements for {self.ptvenv.name} with {self.installer.name}"):
+                self.install_requirements()
+
+    def build(self, incremental: bool = False, prune_wheel_cache: bool = True) -> str:
+        """
+        used to build the ptvenv and record its installed definition.
+        Args:
+            incremental: build from a copy of the newest installed version when possible
+            prune_wheel_cache: prune the wheel cache once the build is done. Concurrent builds share the cache and
+                install from its entries, so a batch prunes it once after every build finished instead.
+        Returns: the install directory of the ptvenv, for display
+        """
+        self.load_config()
+
+        try:
+            if not incremental or not self.build_incremental():
+                self.build_clean()
+        finally:
+            if prune_wheel_cache:
+                self.wheel_cache.prune()
+
+        if PYTOOLBELT_DEDUP_PTVENVS:
+            with timed(logger, f"Deduplicating python environment {self.ptvenv.name}"):
+                self.deduplicate()
 
         self.paths.copy_config_to_install_dir()
-        self.paths.installed_hash_file.write_text(hash_config(self.ptvenv))
+        self.paths.copy_lock_to_install_dir()
+        self.paths.installed_hash_file.write_text(hash_config(self.ptvenv, self.lock_text))
+        return self.paths.display_install_dir
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import platform
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools import run_command
+from pytoolbelt.core.tools.installers import BaseInstaller
+from pytoolbelt.environment.config import get_logger
+
+if TYPE_CHECKING:
+    from pytoolbelt.core.project.ptvenv_components import PtVenvConfig
+
+logger = get_logger(__name__)
+
+LOCK_HEADER = "# generated by pytoolbelt ptvenv lock, do not edit."
+
+# docker reports the architecture of an image with the names of go, not those of platform.machine().
+MACHINE_ALIASES = {"x86_64": "amd64", "aarch64": "arm64"}
+
+
+def lock_platform(os_name: Optional[str] = None, machine: Optional[str] = None) -> str:
+    """
+    used to name a platform the hashes of a lock are valid for.
+    Args:
+        os_name: name of the operating system, the current one when None
+        machine: name of the architecture, the current one when None
+    Returns: the platform, for example linux-amd64
+    """
+    os_name = (os_name or sys.platform).lower()
+    machine = (machine or platform.machine()).lower()
+    return f"{os_name}-{MACHINE_ALIASES.get(machine, machine)}"
+
+
+@dataclass
+class PtVenvLock:
+    """
+    The fully resolved requirements of a ptvenv, one pin with its hashes per package. A lock is
+    stored as <name>.lock next to the ptvenv definition and records the python version and the
+    requirements it was resolved from, so a lock that no longer matches its definition is detected.
+    A lock that only holds the hashes of the files for one platform also records that platform.
+    """
+
+    python_version: str
+    requirements_hash: str
+    pins: List[str] = field(default_factory=list)
+    platform: Optional[str] = None
+
+    @staticmethod
+    def hash_requirements(requirements: List[str]) -> str:
+        return hashlib.sha256(json.dumps(requirements).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_text(cls, text: str) -> "PtVenvLock":
+        headers = {}
+        pins = []
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("#"):
+                key, _, value = line.lstrip("# ").partition(": ")
+                headers[key] = value
+            elif line:
+                pins.append(line)
+
+        try:
+            return cls(python_version=headers["python_version"], requirements_hash=headers["requirements_hash"], pins=pins, platform=headers.get("platform"))
+        except KeyError as e:
+            raise PytoolbeltError(f"Invalid ptvenv lock file, the {e} header is missing.")
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> "PtVenvLock":
+        return cls.from_text(file_path.read_text())
+
+    @classmethod
+    def create(cls, config: "PtVenvConfig", installer: BaseInstaller) -> "PtVenvLock":
+        """
+        used to resolve the requirements of a ptvenv for its python version into a lock.
+        Args:
+            config: the ptvenv definition
+            installer: the installer used to resolve the requirements
+        Returns: the PtVenvLock
+        """
+        lock = cls(
+            python_version=config.python_version,
+            requirements_hash=cls.hash_requirements(config.requirements),
+            platform=None if installer.portable_locks else lock_platform(),
+        )
+        if not config.requirements:
+            return lock
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            requirements_file = Path(tmp_dir) / "requirements.in"
+            requirements_file.write_text("\n".join(config.requirements) + "\n")
+            output_file = Path(tmp_dir) / "lock-output"
+
+            command = installer.lock_command(config.python_version, requirements_file, output_file)
+            if run_command(command).returncode != 0:
+                raise PytoolbeltError(f"Failed to resolve the requirements of ptvenv {config.name} with {installer.name}.")
+            lock.pins = installer.read_lock_output(output_file)
+        return lock
+
+    def to_text(self) -> str:
+        lines = [
+            LOCK_HEADER,
+            f"# python_version: {self.python_version}",
+            f"# requirements_hash: {self.requirements_hash}",
+        ]
+        if self.platform:
+            lines.append(f"# platform: {self.platform}")
+        return "\n".join([*lines, *self.pins]) + "\n"
+
+    def write(self, file_path: Path) -> None:
+        file_path.write_text(self.to_text())
+
+    def is_stale(self, config: "PtVenvConfig") -> bool:
+        return self.python_version != config.python_version or self.requirements_hash != self.hash_requirements(config.requirements)
+
+    def raise_if_wrong_platform(self, config: "PtVenvConfig", target_platform: str) -> None:
+        if self.platform and self.platform != target_platform:
+            raise PytoolbeltError(
+                f"The lock file of ptvenv {config.name} only holds the hashes of the files for {self.platform}, and can not install on {target_platform}. "
+                f"Lock it on {target_platform}, or with the uv installer to hash the files of every platform."
+            )
+
+    def raise_if_stale(self, config: "PtVenvConfig") -> None:
+        if self.is_stale(config):
+            raise PytoolbeltError(
+                f"The lock file of ptvenv {config.name} does not match its definition. Run 'pytoolbelt ptvenv lock --name {config.name}' to update it."
+            )
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from pytoolbelt.core.project.toolbelt_manifest import ManifestEntry, ToolbeltManifest
+
+if TYPE_CHECKING:
+    from pytoolbelt.core.tools.git_client import GitClient
+
+RELEASE_DIRECTORIES = {"tool": "tools", "ptvenv": "ptvenv"}
+
+
+@dataclass
+class ReleasePlanEntry:
+    component: ManifestEntry
+    status: str
+    last_release: Optional[str] = None
+
+    @property
+    def should_release(self) -> bool:
+        return self.status in (ReleasePlan.NEW, ReleasePlan.CHANGED)
+
+
+class ReleasePlan:
+    """
+    What a release of a toolbelt would do with each component, based on the content hash of the component
+    compared to the tree of the component at its release tags:
+        new: the component was never released
+        changed: the version of the component has no release tag yet
+        unchanged: the current version is released and the component is identical to that release
+        unbumped: the current version is released, but the component changed without a version bump
+    """
+
+    NEW = "new"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+    UNBUMPED = "unbumped"
+
+    def __init__(self, entries: List[ReleasePlanEntry]) -> None:
+        self.entries = entries
+
+    @classmethod
+    def create(cls, manifest: ToolbeltManifest, git_client: "GitClient") -> "ReleasePlan":
+        """
+        used to plan the release of every component in a manifest. The released trees are resolved in a single
+        git cat-file session, so planning does not run a git command per component.
+        Args:
+            manifest: manifest of the toolbelt, loaded with a GitClient so it has content hashes
+            git_client: GitClient of the toolbelt
+        Returns: the ReleasePlan
+        """
+        last_releases: Dict[str, Optional[str]] = {}
+        revisions: Dict[str, str] = {}
+
+        for component in manifest.components:
+            tags = git_client.tag_index.release_tags(component.kind, component.name)
+            last_releases[component.release_tag] = tags[-1] if tags else None
+            if component.release_tag in tags:
+                revisions[component.release_tag] = f"{component.release_tag}:{RELEASE_DIRECTORIES[component.kind]}/{component.name}"
+
+        released_trees = git_client.object_ids(list(revisions.values()))
+
+        entries = []
+        for component in manifest.components:
+            last_release = last_releases[component.release_tag]
+            if last_release is None:
+                status = cls.NEW
+            elif component.release_tag not in revisions:
+                status = cls.CHANGED
+            elif released_trees[revisions[component.release_tag]] == component.content_hash:
+                status = cls.UNCHANGED
+            else:
+                status = cls.UNBUMPED
+            entries.append(ReleasePlanEntry(component, status, last_release))
+        return cls(entries)
+
+    def with_status(self, *statuses: str) -> List[ReleasePlanEntry]:
+        return [entry for entry in self.entries if entry.status in statuses]
+
+    @property
+    def releases(self) -> List[ReleasePlanEntry]:
+        return [entry for entry in self.entries if entry.should_release]
+
+    @property
+    def unbumped(self) -> List[ReleasePlanEntry]:
+        return self.with_status(self.UNBUMPED)
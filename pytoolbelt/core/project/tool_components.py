@@ -1,15 +1,20 @@
+import os
+import shutil
+import subprocess
+import tempfile
 import zipapp
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-import yaml
 from pydantic import BaseModel
 
 from pytoolbelt.core.bases.base_paths import BasePaths
 from pytoolbelt.core.bases.base_templater import BaseTemplater
 from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
-from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError, ToolCreationError
 from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.tools.benchmark import BenchmarkResult, benchmark_command
+from pytoolbelt.core.tools.config_io import IndentedSafeDumper, dump_yaml, load_yaml
 
 
 class PtVenv(BaseModel):
@@ -30,10 +35,13 @@ class ToolConfig(BaseModel):
 
     @classmethod
     def from_file(cls, file: Path) -> "ToolConfig":
-        with file.open("r") as f:
-            raw_yaml = yaml.safe_load(f)["tool"]
-            ptvenv = PtVenv(**raw_yaml["ptvenv"])
-            return cls(name=raw_yaml["name"], version=raw_yaml["version"], ptvenv=ptvenv)
+        return cls.from_dict(load_yaml(file))
+
+    @classmethod
+    def from_dict(cls, raw_data: dict) -> "ToolConfig":
+        raw_yaml = raw_data["tool"]
+        ptvenv = PtVenv(**raw_yaml["ptvenv"])
+        return cls(name=raw_yaml["name"], version=raw_yaml["version"], ptvenv=ptvenv)
 
     def to_dict(self) -> dict:
         return {
@@ -45,11 +53,6 @@ class ToolConfig(BaseModel):
         }
 
 
-class IndentedSafeDumper(yaml.SafeDumper):
-    def increase_indent(self, flow=False, indentless=False):
-        return super(IndentedSafeDumper, self).increase_indent(flow, False)
-
-
 class ToolPaths(BasePaths):
     def __init__(self, meta: ComponentMetadata, toolbelt_paths: ToolbeltPaths) -> None:
         self._meta = meta
@@ -124,6 +127,10 @@ class ToolPaths(BasePaths):
     def zipapp_path(self) -> Path:
         return Path(f"{self.install_path.as_posix()}=={str(self.meta.version)}")
 
+    @property
+    def extracted_install_dir(self) -> Path:
+        return self.install_path.parent / f".{self.meta.name}=={str(self.meta.version)}"
+
     @property
     def dev_install_path(self) -> Path:
         return Path(f"{self.install_path.as_posix()}-dev")
@@ -166,14 +173,13 @@ class ToolPaths(BasePaths):
         self.dev_install_path.unlink()
 
     def write_to_config_file(self, config: ToolConfig) -> None:
-        with self.tool_config_file.open("w") as f:
-            yaml.dump(
-                config.to_dict(),
-                f,
-                Dumper=IndentedSafeDumper,
-                sort_keys=False,
-                indent=2,
-            )
+        dump_yaml(
+            self.tool_config_file,
+            config.to_dict(),
+            Dumper=IndentedSafeDumper,
+            sort_keys=False,
+            indent=2,
+        )
 
     def raise_if_exists(self) -> None:
         if self.tool_dir.exists():
@@ -181,22 +187,27 @@ class ToolPaths(BasePaths):
 
 
 class EntrypointShimTemplater(BaseTemplater):
-    def __init__(self, tool_paths: ToolPaths, interpreter: str) -> None:
+    def __init__(self, tool_paths: ToolPaths, interpreter: str, tool_path: Optional[Path] = None) -> None:
         self.tool_paths = tool_paths
         self.interpreter = interpreter
+        self.tool_path = tool_path
         super().__init__()
 
     def get_template_kwargs(self) -> dict:
+        tool_path = self.tool_path or self.tool_paths.tool_dir
         return {
             "python_executable": self.interpreter,
-            "tool_path": self.tool_paths.tool_dir.as_posix(),
+            "tool_path": tool_path.as_posix(),
             "tool_name": self.tool_paths.meta.name,
         }
 
     def write_entrypoint_shim(self) -> None:
-        content = self.render("entrypoint-shim.py.jinja2", **self.get_template_kwargs())
         self.tool_paths.dev_install_path.touch(exist_ok=True)
-        self.tool_paths.dev_install_path.write_text(content)
+        self.write_launcher(self.tool_paths.dev_install_path)
+
+    def write_launcher(self, target: Path) -> None:
+        content = self.render("entrypoint-shim.py.jinja2", **self.get_template_kwargs())
+        target.write_text(content)
 
 
 class ToolTemplater(BaseTemplater):
@@ -218,22 +229,131 @@ class ToolTemplater(BaseTemplater):
 
 
 class ToolInstaller:
+    """
+    Installs a tool for the interpreter of its ptvenv. The install mode decides what is written to the install path:
+        zipapp: a zipapp of the tool sources, which is compiled on every run as zip archives can not cache bytecode.
+        compiled: a zipapp that also holds bytecode compiled by the ptvenv interpreter, which zipimport loads directly.
+        extracted: a small launcher for a read-only, precompiled copy of the tool in a versioned directory beside it.
+    """
+
+    INSTALL_MODES = ["zipapp", "compiled", "extracted"]
+
     def __init__(self, paths: ToolPaths) -> None:
         self.paths = paths
 
-    def install(self, interpreter: str) -> int:
-        with self.paths.zipapp_path.open("wb") as target:
-            zipapp.create_archive(
-                source=self.paths.tool_dir,
-                target=target,
-                interpreter=interpreter,
-                main=self.paths.meta.name + ".__main__:main",
-            )
+    @property
+    def main(self) -> str:
+        return self.paths.meta.name + ".__main__:main"
 
+    def install(self, interpreter: str, mode: str = "zipapp") -> int:
+        self.build(interpreter, mode, self.paths.zipapp_path, self.paths.extracted_install_dir)
         self.paths.create_install_symlink()
-        self.paths.zipapp_path.chmod(0o755)
         return 0
 
+    def build(self, interpreter: str, mode: str, target: Path, extract_dir: Path) -> None:
+        """
+        used to write an executable for the tool to target.
+        Args:
+            interpreter: python executable the tool runs with
+            mode: one of INSTALL_MODES
+            target: the path of the executable
+            extract_dir: directory the tool is extracted to in extracted mode
+        """
+        if mode not in self.INSTALL_MODES:
+            raise PytoolbeltError(f"Unknown install mode {mode}. Choose one of {', '.join(self.INSTALL_MODES)}.")
+
+        if mode == "extracted":
+            self.build_extracted(interpreter, target, extract_dir)
+        else:
+            self.build_zipapp(interpreter, target, compiled=mode == "compiled")
+        target.chmod(0o755)
+
+    def build_zipapp(self, interpreter: str, target: Path, compiled: bool = False) -> None:
+        if not compiled:
+            with target.open("wb") as f:
+                zipapp.create_archive(source=self.paths.tool_dir, target=f, interpreter=interpreter, main=self.main)
+            return
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / self.paths.meta.name
+            self.copy_source(source)
+            self.compile(interpreter, source, legacy=True)
+            with target.open("wb") as f:
+                zipapp.create_archive(source=source, target=f, interpreter=interpreter, main=self.main)
+
+    def build_extracted(self, interpreter: str, target: Path, extract_dir: Path) -> None:
+        extract_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=f"{extract_dir.name}.", dir=extract_dir.parent))
+
+        try:
+            self.copy_source(staging_dir)
+            self.compile(interpreter, staging_dir)
+            self.set_read_only(staging_dir, True)
+            self.remove_extracted(extract_dir)
+            os.rename(staging_dir, extract_dir)
+        except BaseException:
+            self.remove_extracted(staging_dir)
+            raise
+
+        EntrypointShimTemplater(self.paths, interpreter, tool_path=extract_dir).write_launcher(target)
+
+    def copy_source(self, destination: Path) -> None:
+        shutil.copytree(self.paths.tool_dir, destination, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"), dirs_exist_ok=True)
+
+    def compile(self, interpreter: str, directory: Path, legacy: bool = False) -> None:
+        """
+        used to compile the tool with the interpreter it runs with, so the bytecode matches its python version.
+        Args:
+            interpreter: python executable the tool runs with
+            directory: the directory to compile
+            legacy: write .pyc files next to the sources, which is the only layout zipimport loads bytecode from
+        """
+        command = [interpreter, "-m", "compileall", "-q"]
+        if legacy:
+            # zip archives only keep mtimes to 2 seconds, so the bytecode is not validated against the sources.
+            command.extend(["-b", "--invalidation-mode", "unchecked-hash"])
+        command.append(directory.as_posix())
+
+        if subprocess.run(command).returncode != 0:
+            raise ToolCreationError(f"Failed to compile tool {self.paths.meta.name} with {interpreter}.")
+
+    @staticmethod
+    def set_read_only(directory: Path, read_only: bool) -> None:
+        dir_mode, file_mode = (0o555, 0o444) if read_only else (0o755, 0o644)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            for filename in filenames:
+                os.chmod(os.path.join(dirpath, filename), file_mode)
+            for dirname in dirnames:
+                os.chmod(os.path.join(dirpath, dirname), dir_mode)
+        os.chmod(directory, dir_mode)
+
+    def remove_extracted(self, extract_dir: Path) -> None:
+        if extract_dir.exists():
+            self.set_read_only(extract_dir, False)
+            shutil.rmtree(extract_dir)
+
+    def benchmark(self, interpreter: str, args: List[str], runs: int) -> List[BenchmarkResult]:
+        """
+        used to time the startup of the tool in every install mode, and as a development mode shim.
+        Args:
+            interpreter: python executable the tool runs with
+            args: arguments to run the tool with
+            runs: number of warm runs after the cold run
+        Returns: a BenchmarkResult per install mode
+        """
+        results = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for mode in self.INSTALL_MODES:
+                target = Path(tmp_dir) / mode
+                self.build(interpreter, mode, target, Path(tmp_dir) / f".{mode}")
+                results.append(benchmark_command(mode, [target.as_posix(), *args], runs))
+
+            dev_target = Path(tmp_dir) / "dev-mode"
+            EntrypointShimTemplater(self.paths, interpreter).write_launcher(dev_target)
+            dev_target.chmod(0o755)
+            results.append(benchmark_command("dev-mode", [dev_target.as_posix(), *args], runs))
+        return results
+
     def install_shim(self, interpreter: str) -> int:
         shim_templater = EntrypointShimTemplater(self.paths, interpreter)
         shim_templater.write_entrypoint_shim()
@@ -68,6 +68,10 @@ class ToolbeltPaths(BasePaths):
     def pytest_ini(self) -> Path:
         return self.toolbelt_dir / "pytest.ini"
 
+    @property
+    def conftest(self) -> Path:
+        return self.toolbelt_dir / "conftest.py"
+
     @property
     def git_dir(self) -> Path:
         return self.toolbelt_dir / ".git"
@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+from semver import Version
+
+from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
+from pytoolbelt.core.project.ptvenv_components import PtVenvConfig
+from pytoolbelt.core.project.tool_components import ToolConfig
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.tools.config_io import disk_cached_configs
+from pytoolbelt.environment.config import get_logger
+
+if TYPE_CHECKING:
+    from pytoolbelt.core.tools.git_client import GitClient
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ManifestEntry:
+    kind: str
+    name: str
+    path: Path
+    config: Union[ToolConfig, PtVenvConfig]
+    content_hash: Optional[str] = None
+
+    @property
+    def version(self) -> Version:
+        return Version.parse(str(self.config.version))
+
+    @property
+    def meta(self) -> ComponentMetadata:
+        return ComponentMetadata(self.name, self.version, self.kind)
+
+    @property
+    def release_tag(self) -> str:
+        return self.meta.release_tag
+
+    def to_dict(self, root: Path) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "path": self.path.relative_to(root).as_posix(),
+            "config": self.config.to_dict(),
+            "content_hash": self.content_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, root: Path) -> "ManifestEntry":
+        config_class = ToolConfig if data["kind"] == "tool" else PtVenvConfig
+        return cls(
+            kind=data["kind"],
+            name=data["name"],
+            path=root / data["path"],
+            config=config_class.from_dict(data["config"]),
+            content_hash=data["content_hash"],
+        )
+
+
+class ToolbeltManifest:
+    """
+    Every tool and ptvenv of a toolbelt with its parsed config, the ptvenv each tool depends on and a content hash
+    of each component directory. The toolbelt is scanned in a single os.scandir pass over tools/ and ptvenv/.
+    In a git repo the content hash is the git tree id of the component in the working tree, and the manifest is
+    cached in .git/pytoolbelt keyed by the tree id of the whole working tree, so an unchanged toolbelt is not rescanned.
+    """
+
+    FILENAME = "manifest.json"
+    DIRECTORIES = ("tools", "ptvenv")
+
+    def __init__(self, toolbelt_paths: ToolbeltPaths, tools: Dict[str, ManifestEntry], ptvenvs: Dict[str, ManifestEntry]) -> None:
+        self.toolbelt_paths = toolbelt_paths
+        self.tools = tools
+        self.ptvenvs = ptvenvs
+
+    @classmethod
+    def load(cls, toolbelt_paths: ToolbeltPaths, git_client: Optional["GitClient"] = None) -> "ToolbeltManifest":
+        """
+        used to get the manifest of a toolbelt, reusing the cached manifest when the working tree is unchanged.
+        Args:
+            toolbelt_paths: paths of the toolbelt
+            git_client: GitClient of the toolbelt, without it the toolbelt is always scanned and has no content hashes
+        Returns: the ToolbeltManifest
+        """
+        if git_client is None:
+            return cls.scan(toolbelt_paths)
+
+        key, tree_ids = git_client.worktree_tree_ids(list(cls.DIRECTORIES))
+        cache_file = Path(git_client.repo.git_dir) / "pytoolbelt" / cls.FILENAME
+
+        manifest = cls.read_cache(toolbelt_paths, cache_file, key)
+        if manifest is not None:
+            return manifest
+
+        logger.debug(f"Scanning toolbelt {toolbelt_paths.toolbelt_dir}")
+        manifest = cls.scan(toolbelt_paths, tree_ids)
+        manifest.write_cache(cache_file, key)
+        return manifest
+
+    @classmethod
+    def scan(cls, toolbelt_paths: ToolbeltPaths, tree_ids: Optional[Dict[str, str]] = None) -> "ToolbeltManifest":
+        tree_ids = tree_ids or {}
+        tools = {}
+        ptvenvs = {}
+
+        with disk_cached_configs(toolbelt_paths.toolbelt_dir):
+            for entry in cls.iter_component_dirs(toolbelt_paths.tools_dir):
+                config_file = Path(entry.path) / "config.yml"
+                if config_file.is_file():
+                    tools[entry.name] = ManifestEntry(
+                        "tool", entry.name, Path(entry.path), ToolConfig.from_file(config_file), tree_ids.get(f"tools/{entry.name}")
+                    )
+
+            for entry in cls.iter_component_dirs(toolbelt_paths.ptvenvs_dir):
+                config_file = Path(entry.path) / f"{entry.name}.yml"
+                if config_file.is_file():
+                    ptvenvs[entry.name] = ManifestEntry(
+                        "ptvenv", entry.name, Path(entry.path), PtVenvConfig.from_file(config_file), tree_ids.get(f"ptvenv/{entry.name}")
+                    )
+
+        return cls(toolbelt_paths, tools, ptvenvs)
+
+    @staticmethod
+    def iter_component_dirs(directory: Path) -> List[os.DirEntry]:
+        try:
+            with os.scandir(directory) as entries:
+                return sorted((e for e in entries if e.is_dir() and not e.name.startswith((".", "__"))), key=lambda e: e.name)
+        except FileNotFoundError:
+            return []
+
+    @classmethod
+    def read_cache(cls, toolbelt_paths: ToolbeltPaths, cache_file: Path, key: str) -> Optional["ToolbeltManifest"]:
+        try:
+            data = json.loads(cache_file.read_text())
+            if data["key"] != key:
+                return None
+            root = toolbelt_paths.toolbelt_dir
+            tools = {e["name"]: ManifestEntry.from_dict(e, root) for e in data["tools"]}
+            ptvenvs = {e["name"]: ManifestEntry.from_dict(e, root) for e in data["ptvenvs"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cls(toolbelt_paths, tools, ptvenvs)
+
+    def write_cache(self, cache_file: Path, key: str) -> None:
+        root = self.toolbelt_paths.toolbelt_dir
+        data = {
+            "key": key,
+            "tools": [e.to_dict(root) for e in self.tools.values()],
+            "ptvenvs": [e.to_dict(root) for e in self.ptvenvs.values()],
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{self.FILENAME}.", dir=cache_file.parent)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            # the cache is only an optimization, a read only repo still works without it.
+            logger.debug(f"Unable to write the toolbelt manifest cache :: {e}")
+
+    @property
+    def components(self) -> List[ManifestEntry]:
+        return [*self.tools.values(), *self.ptvenvs.values()]
+
+    def get(self, kind: str, name: str) -> Optional[ManifestEntry]:
+        return (self.tools if kind == "tool" else self.ptvenvs).get(name)
+
+    def ptvenv_of(self, tool: str) -> Optional[ManifestEntry]:
+        return self.ptvenvs.get(self.tools[tool].config.ptvenv.name)
+
+    def dependents(self, ptvenv: str) -> List[ManifestEntry]:
+        return [entry for entry in self.tools.values() if entry.config.ptvenv.name == ptvenv]
+
+    def affected_by(self, paths: List[str]) -> List[ManifestEntry]:
+        """
+        used to find the components affected by changed files: the changed tools and ptvenvs, and every tool
+        that depends on a changed ptvenv.
+        Args:
+            paths: changed paths, relative to the root of the toolbelt
+        Returns: the affected components
+        """
+        affected: Dict[tuple, ManifestEntry] = {}
+        for path in paths:
+            parts = PurePosixPath(path).parts
+            if len(parts) < 2:
+                continue
+
+            directory, name = parts[:2]
+            if directory == "tools" and name in self.tools:
+                affected[("tool", name)] = self.tools[name]
+            elif directory == "ptvenv" and name in self.ptvenvs:
+                ptvenv = self.ptvenvs[name]
+                affected[("ptvenv", name)] = ptvenv
+                for tool in self.dependents(ptvenv.config.name):
+                    affected[("tool", tool.name)] = tool
+        return list(affected.values())
+
+    @property
+    def dependency_graph(self) -> Dict[str, List[str]]:
+        return {name: [tool.name for tool in self.dependents(name)] for name in self.ptvenvs}
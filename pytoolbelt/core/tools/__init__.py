@@ -1,18 +1,61 @@
 import hashlib
 import json
-from typing import Any, Callable, Dict, Optional
+import logging
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
 
-from pydantic import BaseModel
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
 
-def hash_config(model: BaseModel) -> str:
+def hash_config(model: "BaseModel", lock: Optional[str] = None) -> str:
     model_json = json.dumps(model.to_dict())
     model_bytes = model_json.encode("utf-8")
     hash_object = hashlib.sha256()
     hash_object.update(model_bytes)
+    # the lock of a ptvenv is part of its definition. Without a lock the hash is that of the config alone.
+    if lock is not None:
+        hash_object.update(lock.encode("utf-8"))
     return hash_object.hexdigest()
 
 
+_output_lock = threading.Lock()
+
+
+def print_prefixed(prefix: str, line: str) -> None:
+    # lines of concurrent tasks are printed whole, so output of different tasks never interleaves within a line.
+    with _output_lock:
+        print(f"[{prefix}] {line.rstrip()}", flush=True)
+
+
+def run_command(command: List[str], prefix: Optional[str] = None) -> subprocess.CompletedProcess:
+    """
+    used to run a command, optionally prefixing every line of its output. This keeps the output
+    of commands running concurrently readable.
+    Args:
+        command: the command to run
+        prefix: prefix for each line of output, output is not captured if None
+    Returns: the completed process
+    """
+    if prefix is None:
+        return subprocess.run(command)
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in process.stdout:
+        print_prefixed(prefix, line)
+    return subprocess.CompletedProcess(command, process.wait())
+
+
+@contextmanager
+def timed(logger: logging.Logger, message: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    logger.info(f"{message} took {time.perf_counter() - start:.2f}s")
+
+
 def build_entrypoint_parsers(
     subparser: Any,
     name: str,
@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+
+
+@dataclass
+class BatchTask:
+    name: str
+    version: str
+    func: Callable[[], Optional[str]]
+
+
+@dataclass
+class BatchResult:
+    name: str
+    version: str
+    status: str
+    duration: float
+    message: str = ""
+
+    @property
+    def failed(self) -> bool:
+        return self.status == "failed"
+
+
+def run_task(task: BatchTask) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        message = task.func()
+    except Exception as e:
+        return BatchResult(task.name, task.version, "failed", time.perf_counter() - start, str(e))
+    # a task can describe what it did by returning a message.
+    message = message if isinstance(message, str) else ""
+    return BatchResult(task.name, task.version, "success", time.perf_counter() - start, message)
+
+
+def run_batch(tasks: List[BatchTask], jobs: int) -> List[BatchResult]:
+    """
+    used to run tasks on a bounded pool of worker threads. A failing task never stops the others.
+    Args:
+        tasks: the tasks to run
+        jobs: the maximum number of tasks running at once
+    Returns: one BatchResult per task, in the order the tasks were given
+    """
+    if jobs < 1:
+        raise PytoolbeltError("--jobs must be at least 1")
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run_task, tasks))
@@ -0,0 +1,119 @@
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pytoolbelt.core.error_handling.exceptions import BenchmarkError, PytoolbeltError
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    cold: float
+    warm: List[float] = field(default_factory=list)
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.warm) if self.warm else self.cold
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.warm) if self.warm else self.cold
+
+    @property
+    def min(self) -> float:
+        return min(self.warm) if self.warm else self.cold
+
+    @property
+    def max(self) -> float:
+        return max(self.warm) if self.warm else self.cold
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "mean": self.mean, "median": self.median, "min": self.min, "max": self.max}
+
+
+def time_command(command: List[str], env: Optional[Dict[str, str]] = None) -> float:
+    start = time.perf_counter()
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise BenchmarkError(f"{' '.join(command)} exited with {result.returncode}")
+    return elapsed
+
+
+def benchmark_command(name: str, command: List[str], runs: int, env: Optional[Dict[str, str]] = None) -> BenchmarkResult:
+    """
+    used to time how long a command takes to run. The first run is reported as the cold start, as it is the
+    one that pays for cold file system caches and bytecode compilation, the following runs are the warm starts.
+    Args:
+        name: name of the benchmark
+        command: the command to run
+        runs: number of warm runs after the cold run
+        env: optional environment to run the command with
+    Returns: BenchmarkResult with the times in seconds
+    """
+    result = BenchmarkResult(name=name, cold=time_command(command, env))
+    for _ in range(runs):
+        result.warm.append(time_command(command, env))
+    return result
+
+
+@dataclass
+class BenchmarkComparison:
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline * 100 if self.baseline else 0.0
+
+    @property
+    def regressed(self) -> bool:
+        return self.change > self.threshold
+
+
+def results_to_json(results: List[BenchmarkResult], runs: int) -> str:
+    return json.dumps(
+        {
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "machine": platform.machine(),
+            "runs": runs,
+            "results": {result.name: result.to_dict() for result in results},
+        },
+        indent=2,
+    )
+
+
+def load_baseline(file: Path) -> Dict[str, float]:
+    """
+    used to load the median times of a JSON benchmark results file written by results_to_json.
+    Args:
+        file: the results file
+    Returns: median time in seconds by benchmark name
+    """
+    try:
+        data = json.loads(file.read_text())
+        return {name: result["median"] for name, result in data["results"].items()}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise PytoolbeltError(f"Unable to read benchmark baseline {file} :: {e}")
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, float], threshold: float) -> List[BenchmarkComparison]:
+    """
+    used to compare the median times of results to a baseline. Benchmarks missing from the baseline are not compared.
+    Args:
+        results: the current results
+        baseline: median time in seconds by benchmark name
+        threshold: allowed slowdown in percent before a benchmark counts as regressed
+    Returns: a BenchmarkComparison per result found in the baseline
+    """
+    return [BenchmarkComparison(r.name, baseline[r.name], r.median, threshold) for r in results if r.name in baseline]
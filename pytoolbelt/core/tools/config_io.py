@@ -0,0 +1,161 @@
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import yaml
+
+from pytoolbelt.environment.config import (
+    PYTOOLBELT_CONFIG_CACHE_DIR,
+    PYTOOLBELT_CONFIG_DISK_CACHE,
+    get_logger,
+)
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+logger = get_logger(__name__)
+
+StatKey = Tuple[int, int]
+
+# parsed yaml files of this process keyed by (path, expand_vars), each stored with the stat key it was parsed at.
+_cache: Dict[Tuple[str, bool], Tuple[StatKey, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+class IndentedSafeDumper(yaml.SafeDumper):
+    # the libyaml emitter always writes sequences in mappings without indentation,
+    # so the indented format of tool and ptvenv configs needs the pure python dumper.
+    def increase_indent(self, flow=False, indentless=False):
+        return super(IndentedSafeDumper, self).increase_indent(flow, False)
+
+
+def get_stat_key(path: Path) -> Optional[StatKey]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_yaml(path: Path, expand_vars: bool = False) -> Any:
+    """
+    used to load a yaml file, reusing the parsed data while the mtime and size of the file are unchanged.
+    Callers are free to modify the returned data, it is a copy of the cached data.
+    Args:
+        path: the yaml file to load
+        expand_vars: expand environment variables in the raw text before parsing
+    Returns: the parsed yaml data
+    """
+    cache_key = (str(path), expand_vars)
+    stat_key = get_stat_key(path)
+
+    if stat_key is not None:
+        with _cache_lock:
+            cached = _cache.get(cache_key)
+        if cached and cached[0] == stat_key:
+            return copy.deepcopy(cached[1])
+
+    with path.open("r") as file:
+        raw_data = file.read()
+
+    if expand_vars:
+        raw_data = os.path.expandvars(raw_data)
+    data = yaml.load(raw_data, Loader=SafeLoader)
+
+    if stat_key is not None:
+        with _cache_lock:
+            _cache[cache_key] = (stat_key, data)
+    return copy.deepcopy(data)
+
+
+def dump_yaml(path: Path, data: Any, **kwargs) -> None:
+    """
+    used to write data to a yaml file and drop the cached copy of the file.
+    Args:
+        path: the yaml file to write
+        data: the data to write
+        **kwargs: passed on to yaml.dump, the libyaml SafeDumper is used unless a Dumper is given
+    """
+    kwargs.setdefault("Dumper", SafeDumper)
+    try:
+        with path.open("w") as file:
+            yaml.dump(data, file, **kwargs)
+    finally:
+        invalidate(path)
+
+
+def invalidate(path: Optional[Path] = None) -> None:
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+            return
+        for expand_vars in (False, True):
+            _cache.pop((str(path), expand_vars), None)
+
+
+def get_disk_cache_file(root: Path, cache_dir: Optional[Path] = None) -> Path:
+    cache_dir = cache_dir or PYTOOLBELT_CONFIG_CACHE_DIR
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{digest}.pickle"
+
+
+def read_disk_cache(cache_file: Path) -> Dict[str, Tuple[StatKey, Any]]:
+    try:
+        with cache_file.open("rb") as file:
+            entries = pickle.load(file)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        # a truncated or incompatible cache file is simply rebuilt.
+        logger.debug(f"Ignoring unreadable config cache {cache_file} :: {e}")
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def write_disk_cache(cache_file: Path, entries: Dict[str, Tuple[StatKey, Any]]) -> None:
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{cache_file.name}.", dir=cache_file.parent)
+    with os.fdopen(fd, "wb") as file:
+        pickle.dump(entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_file)
+
+
+@contextmanager
+def disk_cached_configs(root: Path, enabled: Optional[bool] = None, cache_dir: Optional[Path] = None) -> Iterator[None]:
+    """
+    used to persist the parsed configs of a directory tree between runs, for commands that read every config of a toolbelt.
+    Entries are still validated against the stat of each file, so a stale cache file only costs a reparse.
+    Args:
+        root: only configs below this directory are persisted
+        enabled: turn the disk cache on or off, defaults to PYTOOLBELT_CONFIG_DISK_CACHE
+        cache_dir: directory of the cache files, defaults to PYTOOLBELT_CONFIG_CACHE_DIR
+    """
+    enabled = PYTOOLBELT_CONFIG_DISK_CACHE if enabled is None else enabled
+    if not enabled:
+        yield
+        return
+
+    cache_file = get_disk_cache_file(root, cache_dir)
+    entries = read_disk_cache(cache_file)
+    with _cache_lock:
+        for path, entry in entries.items():
+            _cache.setdefault((path, False), entry)
+
+    yield
+
+    prefix = os.path.join(str(root), "")
+    with _cache_lock:
+        entries = {path: entry for (path, expand_vars), entry in _cache.items() if not expand_vars and path.startswith(prefix)}
+    try:
+        write_disk_cache(cache_file, entries)
+    except OSError as e:
+        logger.debug(f"Unable to write the config cache {cache_file} :: {e}")
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+from pytoolbelt.environment.config import (
+    PYTOOLBELT_DEDUP_POOL_DIR,
+    PYTOOLBELT_VENV_INSTALL_DIR,
+)
+
+# ioctl request number used to clone a file on copy-on-write filesystems (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+@dataclass
+class DedupResult:
+    files: int = 0
+    linked: int = 0
+    saved: int = 0
+
+
+class DedupStore:
+    """
+    A content addressed pool of files installed into ptvenvs. Identical files in different installed
+    versions are replaced with a reflink (where the filesystem supports it) or a hardlink to the pooled copy.
+    Each deduplicated directory records the pool entries it uses in a manifest, which is what gc uses to find
+    pool entries that are no longer referenced by any installed ptvenv.
+    """
+
+    MANIFEST_FILENAME = "dedup.manifest"
+
+    def __init__(self, root: Optional[Path] = None, venv_install_dir: Optional[Path] = None) -> None:
+        self.root = root or PYTOOLBELT_DEDUP_POOL_DIR
+        self.venv_install_dir = venv_install_dir or PYTOOLBELT_VENV_INSTALL_DIR
+        self._reflink_supported: Optional[bool] = None
+
+    @staticmethod
+    def hash_file(file: Path) -> str:
+        hash_object = hashlib.sha256()
+        with file.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hash_object.update(chunk)
+        return hash_object.hexdigest()
+
+    @staticmethod
+    def reflink(src: Path, dst: Path) -> None:
+        import fcntl
+
+        with src.open("rb") as s, dst.open("wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+    @staticmethod
+    def iter_files(directory: Path) -> Iterator[Path]:
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                file = Path(dirpath) / filename
+                if not file.is_symlink() and file.is_file():
+                    yield file
+
+    def pool_key(self, file: Path) -> str:
+        mode = file.stat().st_mode & 0o777
+        return f"{self.hash_file(file)}-{mode:o}"
+
+    def pool_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def link(self, src: Path, dst: Path) -> None:
+        """
+        used to create dst as a reflink of src, falling back to a hardlink when reflinks are not supported.
+        Args:
+            src: the file to link to
+            dst: the path of the new link, which must not exist
+        """
+        if self._reflink_supported is not False:
+            try:
+                self.reflink(src, dst)
+                os.chmod(dst, src.stat().st_mode & 0o777)
+                self._reflink_supported = True
+                return
+            except (ImportError, OSError):
+                dst.unlink(missing_ok=True)
+                self._reflink_supported = False
+        os.link(src, dst)
+
+    def add_to_pool(self, file: Path, key: str) -> None:
+        pool_path = self.pool_path(key)
+        pool_path.parent.mkdir(parents=True, exist_ok=True)
+        # ptvenvs may be built concurrently, so the staging name must be unique per thread.
+        tmp_path = pool_path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        self.link(file, tmp_path)
+        try:
+            os.rename(tmp_path, pool_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def replace_with_link(self, file: Path, key: str) -> None:
+        tmp_path = file.with_name(f".{file.name}.{threading.get_ident()}.ptdedup")
+        self.link(self.pool_path(key), tmp_path)
+        os.replace(tmp_path, file)
+
+    def deduplicate(self, directory: Path, manifest_file: Path) -> DedupResult:
+        """
+        used to link every file in directory to the pool, adding files the pool has not seen before.
+        Args:
+            directory: the directory to deduplicate, normally a ptvenv install dir
+            manifest_file: file the used pool keys are written to
+        Returns: DedupResult with the number of files linked and bytes saved
+        """
+        result = DedupResult()
+        keys = set()
+
+        for file in self.iter_files(directory):
+            stat = file.stat()
+            if stat.st_size == 0:
+                continue
+
+            result.files += 1
+            key = self.pool_key(file)
+            keys.add(key)
+            pool_path = self.pool_path(key)
+
+            if not pool_path.exists():
+                self.add_to_pool(file, key)
+                continue
+
+            if pool_path.stat().st_ino == stat.st_ino:
+                continue
+
+            self.replace_with_link(file, key)
+            result.linked += 1
+            result.saved += stat.st_size
+
+        manifest_file.write_text("\n".join(sorted(keys)))
+        return result
+
+    def referenced_keys(self) -> Set[str]:
+        keys = set()
+        if not self.venv_install_dir.exists():
+            return keys
+
+        for manifest in self.venv_install_dir.glob(f"*/*/{self.MANIFEST_FILENAME}"):
+            keys.update(line for line in manifest.read_text().splitlines() if line)
+        return keys
+
+    def gc(self) -> DedupResult:
+        """
+        used to remove pool entries that are not referenced by the manifest of any installed ptvenv.
+        Files in installed ptvenvs stay intact, as they are links to the pooled data and not the pool entry itself.
+        Returns: DedupResult with the number of removed files and bytes freed
+        """
+        result = DedupResult()
+        if not self.root.exists():
+            return result
+
+        referenced = self.referenced_keys()
+        for pool_path in self.root.glob("*/*"):
+            if pool_path.name in referenced:
+                continue
+            stat = pool_path.stat()
+            pool_path.unlink()
+            result.files += 1
+            # hardlinked entries only free disk space when the pool holds the last link.
+            if stat.st_nlink == 1:
+                result.saved += stat.st_size
+        return result
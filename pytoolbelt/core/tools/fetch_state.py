@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from git import Repo
+
+from pytoolbelt.environment.config import get_logger
+
+logger = get_logger(__name__)
+
+
+class FetchState:
+    """
+    The time of the last successful fetch of each remote of a toolbelt repo, and the refs the remote had at that time.
+    Stored in .git/pytoolbelt, it lets a fetch be skipped while it is fresh, or when git ls-remote shows the remote is unchanged.
+    """
+
+    FILENAME = "fetch_state.json"
+
+    def __init__(self, repo: Repo) -> None:
+        self.path = Path(repo.git_dir) / "pytoolbelt" / self.FILENAME
+
+    def load(self) -> Dict[str, Dict]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, remote: str, refs: Dict[str, str], fetched_at: Optional[float] = None) -> None:
+        data = self.load()
+        data[remote] = {"fetched_at": fetched_at or time.time(), "refs": refs}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{self.FILENAME}.", dir=self.path.parent)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # without the state every command simply fetches again.
+            logger.debug(f"Unable to write the fetch state :: {e}")
+
+    def fetched_at(self, remote: str) -> Optional[float]:
+        return self.load().get(remote, {}).get("fetched_at")
+
+    def refs(self, remote: str) -> Optional[Dict[str, str]]:
+        return self.load().get(remote, {}).get("refs")
+
+    def is_fresh(self, remote: str, ttl: float) -> bool:
+        fetched_at = self.fetched_at(remote)
+        if fetched_at is None or ttl <= 0:
+            return False
+        return 0 <= time.time() - fetched_at < ttl
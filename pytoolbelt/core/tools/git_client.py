@@ -1,12 +1,23 @@
+import io
 import shutil
+import tarfile
 import tempfile
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
-from git import Repo, TagReference
+from git import Git, GitCommandError, Repo, TagReference
 
+from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
 from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools.fetch_state import FetchState
+from pytoolbelt.core.tools.tag_index import ReleaseRef, TagIndex
+from pytoolbelt.environment.config import PYTOOLBELT_FETCH_TTL, get_logger
+
+logger = get_logger(__name__)
+
+# a sparse checkout of a toolbelt only has the files in its root (such as pytoolbelt.yml) and these directories.
+SPARSE_CHECKOUT_DIRECTORIES = ["tools", "ptvenv"]
 
 
 class GitClient:
@@ -19,6 +30,8 @@ class GitClient:
         self._repo = repo
         self._config = config
         self._release_branch = release_branch
+        self._tag_index: Optional[TagIndex] = None
+        self._fetch_state: Optional[FetchState] = None
 
     @classmethod
     def from_path(
@@ -34,23 +47,85 @@ class GitClient:
         return Repo(path)
 
     @classmethod
-    def clone_from_url(cls, url: str, path: Path) -> "GitClient":
-        repo = Repo.clone_from(url, path)
-        return cls(repo)
+    def clone_from_url(
+        cls,
+        url: str,
+        path: Path,
+        clone_filter: Optional[str] = None,
+        depth: Optional[int] = None,
+        sparse: Optional[bool] = False,
+        timeout: Optional[float] = None,
+    ) -> "GitClient":
+        """
+        used to clone a toolbelt, optionally as a partial, shallow and / or sparse clone.
+        Objects left out of a partial or shallow clone are fetched by git when they are needed.
+        Args:
+            url: url of the toolbelt repo
+            path: directory to clone into
+            clone_filter: partial clone filter, for example blob:none
+            depth: number of commits of history to fetch for the branch and for every release tag
+            sparse: only check out the files in the root of the repo and the tools and ptvenv directories
+            timeout: seconds after which a git command of the clone is killed, no limit when None
+        Returns: GitClient of the clone
+        """
+        kwargs = {}
+        if clone_filter:
+            kwargs["filter"] = clone_filter
+        if depth:
+            kwargs["depth"] = depth
+        if sparse:
+            kwargs["sparse"] = True
+
+        # Repo.clone_from runs git as a process that can not be killed on a timeout, so git clone is run directly.
+        Git.check_unsafe_protocols(url)
+        created = not path.exists()
+        try:
+            Git().clone("--", url, str(path), kill_after_timeout=timeout, **kwargs)
+            repo = Repo(path)
+            git_client = cls(repo)
+
+            if sparse:
+                repo.git.sparse_checkout("set", *SPARSE_CHECKOUT_DIRECTORIES)
+
+            if depth:
+                # remembered so later fetches keep the clone shallow. A shallow clone only has the tags
+                # of the commits it fetched, so the other release tags are fetched right away.
+                with repo.config_writer() as config:
+                    config.set_value("pytoolbelt", "depth", depth)
+                git_client.fetch(ttl=0, timeout=timeout)
+        except GitCommandError:
+            # a killed clone leaves a partial repo behind, which would look like a finished clone to the next command.
+            if created:
+                shutil.rmtree(path, ignore_errors=True)
+            raise
+        return git_client
 
     @staticmethod
     def init_if_not_exists(path: Path) -> Repo:
         if not path.joinpath(".git").exists():
             return Repo.init(path)
 
-    @staticmethod
-    def get_tag_filter(kind: str, name: Optional[str] = None) -> str:
-        return f"{kind}-{name}-" if name else f"{kind}-"
-
     @property
     def repo(self) -> Repo:
         return self._repo
 
+    @property
+    def tag_index(self) -> TagIndex:
+        if self._tag_index is None:
+            self._tag_index = TagIndex(self.repo)
+        return self._tag_index
+
+    @property
+    def depth_args(self) -> List[str]:
+        depth = self.repo.config_reader().get_value("pytoolbelt", "depth", 0)
+        return [f"--depth={depth}"] if depth else []
+
+    @property
+    def fetch_state(self) -> FetchState:
+        if self._fetch_state is None:
+            self._fetch_state = FetchState(self.repo)
+        return self._fetch_state
+
     @property
     def repo_config(self) -> Optional[ToolbeltConfig]:
         return self._config
@@ -88,7 +163,7 @@ class GitClient:
             raise PytoolbeltError("Repo has uncommited changes. Please commit your changes before tagging a release.")
 
     def raise_if_local_and_remote_head_are_different(self) -> None:
-        self.repo.remotes.origin.fetch()
+        self.fetch()
         if self.repo.head.commit.hexsha != self.repo.commit(f"origin/{self.current_branch}").hexsha:
             raise PytoolbeltError("Local and remote HEAD are different. Please pull / push the latest changes before tagging a release.")
 
@@ -108,41 +183,234 @@ class GitClient:
     def push_tags_to_remote(self) -> None:
         self.repo.git.push("--tags", "origin")
 
-    def fetch_remote_tags(self) -> None:
-        self.repo.git.fetch("--tags", "origin")
+    def fetch_remote_tags(self, ttl: Optional[float] = None, offline: Optional[bool] = False) -> None:
+        self.fetch(ttl=ttl, offline=offline)
 
-    def ptvenv_releases(self, name: Optional[str] = None, as_names: Optional[bool] = False) -> Union[List[TagReference], List[str]]:
-        flt = self.get_tag_filter("ptvenv", name)
+    def remote_refs(self, remote: str = "origin", timeout: Optional[float] = None) -> Dict[str, str]:
+        output = self.repo.git.ls_remote("--heads", "--tags", remote, kill_after_timeout=timeout)
+        refs = {}
+        for line in output.splitlines():
+            sha, ref = line.split("\t", 1)
+            refs[ref] = sha
+        return refs
+
+    def fetch(
+        self,
+        remote: str = "origin",
+        ttl: Optional[float] = None,
+        offline: Optional[bool] = False,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        used to fetch the branches and tags of a remote, skipping the fetch when it is not needed.
+        A fetch is skipped when offline, when the last fetch is younger than ttl, or when git ls-remote
+        shows the remote refs are unchanged since the last fetch.
+        Args:
+            remote: name of the remote
+            ttl: seconds a fetch stays fresh, defaults to PYTOOLBELT_FETCH_TTL. 0 always checks the remote.
+            offline: never contact the remote and use the local refs
+            timeout: seconds after which a git command contacting the remote is killed, no limit when None
+        Returns: True if the remote was fetched
+        """
+        if offline:
+            logger.debug(f"Offline, using the local refs of {remote}.")
+            return False
+
+        ttl = PYTOOLBELT_FETCH_TTL if ttl is None else ttl
+        if self.fetch_state.is_fresh(remote, ttl):
+            logger.debug(f"Last fetch of {remote} is younger than {ttl}s, skipping fetch.")
+            return False
+
+        refs = self.remote_refs(remote, timeout=timeout)
+        if refs == self.fetch_state.refs(remote):
+            logger.debug(f"Refs of {remote} are unchanged, skipping fetch.")
+            self.fetch_state.save(remote, refs)
+            return False
+
+        self.repo.git.fetch(*self.depth_args, "--tags", remote, kill_after_timeout=timeout)
+        self.fetch_state.save(remote, refs)
+        self.tag_index.refresh()
+        return True
+
+    def releases(self, kind: str, name: Optional[str] = None, as_names: Optional[bool] = False) -> Union[List[TagReference], List[str]]:
+        tag_names = self.tag_index.release_tags(kind, name)
         if as_names:
-            return [tag.name for tag in self.repo.tags if tag.name.startswith(flt)]
-        return [tag for tag in self.repo.tags if tag.name.startswith(flt)]
+            return tag_names
+        return [TagReference(self.repo, TagReference.to_full_path(tag_name)) for tag_name in tag_names]
+
+    def release_refs(self, kind: str, name: Optional[str] = None) -> List[ReleaseRef]:
+        return self.tag_index.release_refs(kind, name)
+
+    def ptvenv_releases(self, name: Optional[str] = None, as_names: Optional[bool] = False) -> Union[List[TagReference], List[str]]:
+        return self.releases("ptvenv", name, as_names)
 
     def tool_releases(self, name: Optional[str] = None, as_names: Optional[bool] = False) -> Union[List[TagReference], List[str]]:
-        flt = self.get_tag_filter("tool", name)
-        if as_names:
-            return [tag.name for tag in self.repo.tags if tag.name.startswith(flt)]
-        return [tag for tag in self.repo.tags if tag.name.startswith(flt)]
+        return self.releases("tool", name, as_names)
+
+    def latest_release(self, kind: str, name: str) -> ComponentMetadata:
+        latest = self.tag_index.latest_release(kind, name)
+        if latest is None:
+            raise PytoolbeltError(f"No release found for {kind} {name}.")
+        return latest
+
+    def fast_forward(self) -> bool:
+        """
+        used to fast-forward the checked out branch to the commit of its upstream branch.
+        Returns: True if the branch moved, False if it was already up to date
+        """
+        if self.repo.head.is_detached:
+            raise PytoolbeltError("HEAD is detached, there is no branch to fast-forward.")
+
+        branch = self.repo.active_branch
+        upstream = branch.tracking_branch()
+        if upstream is None or not upstream.is_valid():
+            raise PytoolbeltError(f"Branch {branch.name} has no upstream branch to fast-forward to.")
+
+        if upstream.commit == branch.commit:
+            return False
+
+        try:
+            self.repo.git.merge("--ff-only", upstream.name)
+        except GitCommandError as e:
+            raise PytoolbeltError(f"Unable to fast-forward {branch.name} to {upstream.name} :: {e.stderr.strip()}")
+        return True
+
+    def fetch_tag(self, tag_name: str, remote: str = "origin") -> bool:
+        """
+        used to fetch a single tag from a remote, for tags created after the last fetch.
+        Args:
+            tag_name: name of the tag
+            remote: name of the remote
+        Returns: True if the tag was fetched
+        """
+        try:
+            self.repo.git.fetch(*self.depth_args, "--no-tags", remote, "tag", tag_name)
+        except GitCommandError as e:
+            logger.debug(f"Unable to fetch tag {tag_name} from {remote} :: {e}")
+            return False
+        self.tag_index.refresh()
+        return True
 
     def get_tag_reference(self, tag_name: str) -> TagReference:
-        return self.repo.tags[tag_name]
+        tag_reference = TagReference(self.repo, TagReference.to_full_path(tag_name))
+        if not tag_reference.is_valid() and self.repo.remotes and self.fetch_tag(tag_name):
+            tag_reference = TagReference(self.repo, TagReference.to_full_path(tag_name))
+        if not tag_reference.is_valid():
+            raise IndexError(f"No tag named {tag_name}")
+        return tag_reference
 
     def checkout_tag(self, tag_ref: TagReference) -> None:
         self.repo.git.checkout(tag_ref)
 
+    def export_tree(self, ref: Union[str, TagReference], destination: Path, paths: Optional[List[str]] = None) -> None:
+        """
+        used to write the files of a ref to a directory without cloning or checking out the repo.
+        Args:
+            ref: the tag, branch or commit to export
+            destination: directory the files are written to
+            paths: optional repo relative paths to limit the export to
+        """
+        archive = io.BytesIO()
+        self.repo.archive(archive, treeish=str(ref), format="tar", path=paths or [])
+        archive.seek(0)
+
+        destination.mkdir(parents=True, exist_ok=True)
+        with tarfile.open(fileobj=archive) as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(destination, filter="data")
+            else:
+                tar.extractall(destination)
+
+    def worktree_tree_ids(self, directories: List[str]) -> Tuple[str, Dict[str, str]]:
+        """
+        used to get git tree ids for the working tree, including uncommitted and untracked (but not ignored) files.
+        The working tree is added to a copy of the index, so the index of the repo is left untouched.
+        Args:
+            directories: repo relative directories to list the subdirectories of, for example ["tools", "ptvenv"]
+        Returns: the id of the root tree, and the tree id of every subdirectory of the given directories
+        """
+        git_dir = Path(self.repo.git_dir)
+        directories = [d for d in directories if (Path(self.repo.working_tree_dir) / d).is_dir()]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_file = Path(tmp_dir) / "index"
+            if (git_dir / "index").exists():
+                # starting from the real index lets git skip rehashing files whose stat did not change.
+                shutil.copyfile(git_dir / "index", index_file)
+            env = {"GIT_INDEX_FILE": str(index_file)}
+            if directories:
+                self.repo.git.add("--all", "--", *directories, env=env)
+            tree = self.repo.git.write_tree(env=env)
+
+        tree_ids = {}
+        if directories:
+            for line in self.repo.git.ls_tree("-d", tree, *[f"{d}/" for d in directories]).splitlines():
+                info, path = line.split("\t", 1)
+                tree_ids[path] = info.split()[2]
+        return tree, tree_ids
+
+    def changed_paths(self, ref: str) -> List[str]:
+        """
+        used to list the files changed in the working tree since a ref, committed or not, including untracked files.
+        Renames are listed as a deleted and an added path.
+        Args:
+            ref: git ref to compare the working tree with
+        Returns: the changed paths, relative to the root of the repo
+        """
+        try:
+            changed = self.repo.git.diff("--name-only", "--no-renames", ref, "--").splitlines()
+        except GitCommandError as e:
+            raise PytoolbeltError(f"Unable to compare the toolbelt with {ref} :: {e.stderr.strip()}")
+        untracked = self.repo.git.ls_files("--others", "--exclude-standard").splitlines()
+        return sorted(set(changed) | set(untracked))
+
+    def object_ids(self, revisions: List[str]) -> Dict[str, Optional[str]]:
+        """
+        used to resolve many revisions, for example "<tag>:tools/<name>", in a single git cat-file --batch-check session.
+        Args:
+            revisions: revisions to resolve
+        Returns: the object id of each revision, or None for revisions that do not exist
+        """
+        object_ids = {}
+        for revision in revisions:
+            try:
+                object_ids[revision] = self.repo.git.get_object_header(revision)[0].decode()
+            except ValueError:
+                object_ids[revision] = None
+        return object_ids
+
 
 class TemporaryGitClient:
+    """
+    Provides a GitClient for the toolbelt repo, and a temporary directory components can be exported to
+    at a release tag. Only the requested paths are written with git archive, so an install scales with the
+    size of the component rather than the size of the repo and its history.
+    """
+
     def __init__(self, src: Path, toolbelt: str):
         self._root_tmp_dir = tempfile.TemporaryDirectory()
         self.toolbelt = toolbelt
         self.src = src
+        self.git_client: Optional[GitClient] = None
 
     @property
     def tmp_dir(self):
         return Path(self._root_tmp_dir.name) / "pytoolbelt" / self.toolbelt
 
+    def export(self, ref: Union[str, TagReference], paths: List[str]) -> Path:
+        """
+        used to export paths of the toolbelt at ref into the temporary directory.
+        Args:
+            ref: the tag, branch or commit to export
+            paths: repo relative paths to export, for example ["tools/my_tool"]
+        Returns: the temporary directory, which can be used as the root of a ToolbeltPaths
+        """
+        self.git_client.export_tree(ref, self.tmp_dir, paths=paths)
+        return self.tmp_dir
+
     def __enter__(self) -> Tuple["TemporaryGitClient", GitClient]:
-        shutil.copytree(src=self.src, dst=self.tmp_dir)
-        return self, GitClient.from_path(self.tmp_dir)
+        self.git_client = GitClient.from_path(self.src)
+        return self, self.git_client
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         # TODO: Implement logging....
@@ -0,0 +1,218 @@
+import json
+import re
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
+
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+
+if TYPE_CHECKING:
+    from pytoolbelt.core.project.ptvenv_components import PtVenvPaths
+
+
+class BaseInstaller(ABC):
+    """
+    Builds the commands used to create a ptvenv and install its requirements. The installer
+    used by a toolbelt is selected with the installer key in the project-config of pytoolbelt.yml.
+    """
+
+    name: str = ""
+    executable: Optional[str] = None
+    supports_wheel_cache: bool = True
+    # whether a lock holds the hashes of the files of every platform, or only of the platform it was made on.
+    portable_locks: bool = True
+
+    @abstractmethod
+    def create_command(self, python_version: str, paths: "PtVenvPaths") -> List[str]:
+        pass
+
+    @abstractmethod
+    def install_command(self, paths: "PtVenvPaths", requirements: List[str], find_links: Optional[Path] = None) -> List[str]:
+        pass
+
+    @abstractmethod
+    def uninstall_command(self, paths: "PtVenvPaths", names: List[str]) -> List[str]:
+        pass
+
+    @abstractmethod
+    def check_command(self, paths: "PtVenvPaths") -> List[str]:
+        pass
+
+    @abstractmethod
+    def wheel_command(self, paths: "PtVenvPaths", wheel_dir: Path, requirements: List[str]) -> List[str]:
+        pass
+
+    @abstractmethod
+    def lock_command(self, python_version: str, requirements_file: Path, output_file: Path) -> List[str]:
+        pass
+
+    @abstractmethod
+    def read_lock_output(self, output_file: Path) -> List[str]:
+        """
+        used to read the output of the lock command.
+        Args:
+            output_file: the output file passed to the lock command
+        Returns: one pinned requirement per package, in the form name==version --hash=sha256:<hash>
+        """
+
+    def locked_install_command(self, paths: "PtVenvPaths", lock_file: Path) -> List[str]:
+        # every package is pinned and hashed in the lock, so nothing is resolved at install time.
+        return self.install_command(paths, ["--no-deps", "--require-hashes", "-r", lock_file.as_posix()])
+
+    def relocate_command(self, python_version: str, paths: "PtVenvPaths") -> List[str]:
+        # upgrading a copied venv in place rewrites pyvenv.cfg and the activate scripts for its new location.
+        return [
+            f"python{python_version}",
+            "-m",
+            "venv",
+            paths.install_dir.as_posix(),
+            "--without-pip",
+        ]
+
+
+class PipInstaller(BaseInstaller):
+    name = "pip"
+
+    # the report of pip only has the hash of the archive it picked for the current platform.
+    portable_locks = False
+
+    def create_command(self, python_version: str, paths: "PtVenvPaths") -> List[str]:
+        return [
+            f"python{python_version}",
+            "-m",
+            "venv",
+            paths.install_dir.as_posix(),
+            "--clear",
+        ]
+
+    def install_command(self, paths: "PtVenvPaths", requirements: List[str], find_links: Optional[Path] = None) -> List[str]:
+        command = [paths.pip_executable_path.as_posix(), "install"]
+        if find_links:
+            command.extend(["--no-index", "--find-links", find_links.as_posix()])
+        return [*command, *requirements]
+
+    def uninstall_command(self, paths: "PtVenvPaths", names: List[str]) -> List[str]:
+        return [paths.pip_executable_path.as_posix(), "uninstall", "--yes", *names]
+
+    def check_command(self, paths: "PtVenvPaths") -> List[str]:
+        return [paths.pip_executable_path.as_posix(), "check"]
+
+    def wheel_command(self, paths: "PtVenvPaths", wheel_dir: Path, requirements: List[str]) -> List[str]:
+        return [
+            paths.pip_executable_path.as_posix(),
+            "wheel",
+            "--wheel-dir",
+            wheel_dir.as_posix(),
+            *requirements,
+        ]
+
+    def lock_command(self, python_version: str, requirements_file: Path, output_file: Path) -> List[str]:
+        # the resolver of the target python reports what it would install, without installing anything.
+        return [
+            f"python{python_version}",
+            "-m",
+            "pip",
+            "install",
+            "--dry-run",
+            "--ignore-installed",
+            "--quiet",
+            "--report",
+            output_file.as_posix(),
+            "-r",
+            requirements_file.as_posix(),
+        ]
+
+    def read_lock_output(self, output_file: Path) -> List[str]:
+        pins = []
+        for item in json.loads(output_file.read_text())["install"]:
+            name = re.sub(r"[-_.]+", "-", item["metadata"]["name"]).lower()
+            archive_info = item.get("download_info", {}).get("archive_info", {})
+            hashes = dict(archive_info.get("hashes") or {})
+            if not hashes and "=" in archive_info.get("hash", ""):
+                algorithm, value = archive_info["hash"].split("=", 1)
+                hashes[algorithm] = value
+
+            if "sha256" not in hashes:
+                raise PytoolbeltError(f"Unable to lock {name}, it is not installed from an archive with a sha256 hash.")
+            pins.append(f"{name}=={item['metadata']['version']} --hash=sha256:{hashes['sha256']}")
+        return sorted(pins)
+
+
+class UvInstaller(BaseInstaller):
+    name = "uv"
+    executable = "uv"
+
+    # uv keeps its own global cache of built wheels, so the pytoolbelt wheel cache is not used.
+    supports_wheel_cache = False
+
+    def create_command(self, python_version: str, paths: "PtVenvPaths") -> List[str]:
+        # seed pip into the venv so the ptvenv stays usable with plain pip.
+        return ["uv", "venv", "--seed", "--python", python_version, paths.install_dir.as_posix()]
+
+    def install_command(self, paths: "PtVenvPaths", requirements: List[str], find_links: Optional[Path] = None) -> List[str]:
+        command = ["uv", "pip", "install", "--python", paths.python_executable_path.as_posix()]
+        if find_links:
+            command.extend(["--no-index", "--find-links", find_links.as_posix()])
+        return [*command, *requirements]
+
+    def uninstall_command(self, paths: "PtVenvPaths", names: List[str]) -> List[str]:
+        return ["uv", "pip", "uninstall", "--python", paths.python_executable_path.as_posix(), *names]
+
+    def check_command(self, paths: "PtVenvPaths") -> List[str]:
+        return ["uv", "pip", "check", "--python", paths.python_executable_path.as_posix()]
+
+    def wheel_command(self, paths: "PtVenvPaths", wheel_dir: Path, requirements: List[str]) -> List[str]:
+        # uv has no wheel command, the pip seeded into the venv builds them.
+        return [
+            paths.pip_executable_path.as_posix(),
+            "wheel",
+            "--wheel-dir",
+            wheel_dir.as_posix(),
+            *requirements,
+        ]
+
+    def lock_command(self, python_version: str, requirements_file: Path, output_file: Path) -> List[str]:
+        # a universal resolution keeps the dependencies of every platform, with their environment markers.
+        return [
+            "uv",
+            "pip",
+            "compile",
+            "--universal",
+            "--generate-hashes",
+            "--no-header",
+            "--no-annotate",
+            "--quiet",
+            "--python-version",
+            python_version,
+            "--output-file",
+            output_file.as_posix(),
+            requirements_file.as_posix(),
+        ]
+
+    def read_lock_output(self, output_file: Path) -> List[str]:
+        # uv writes a requirements file with the hashes of each package on continuation lines.
+        content = output_file.read_text().replace("\\\n", " ")
+        pins = []
+        for line in content.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                pins.append(" ".join(line.split()))
+        return sorted(pins)
+
+
+INSTALLERS: Dict[str, Type[BaseInstaller]] = {
+    PipInstaller.name: PipInstaller,
+    UvInstaller.name: UvInstaller,
+}
+
+
+def get_installer(name: str) -> BaseInstaller:
+    try:
+        installer = INSTALLERS[name]
+    except KeyError:
+        raise PytoolbeltError(f"Unknown installer {name}. Choose one of {', '.join(INSTALLERS)}.")
+
+    if installer.executable and not shutil.which(installer.executable):
+        raise PytoolbeltError(f"The {name} installer is configured, but {installer.executable} was not found on the PATH.")
+    return installer()
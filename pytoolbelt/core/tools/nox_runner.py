@@ -0,0 +1,108 @@
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
+
+from docker.errors import DockerException
+
+from pytoolbelt.core.tools import print_prefixed
+from pytoolbelt.environment.config import get_logger
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+logger = get_logger(__name__)
+
+# a session in the output of nox --list, * when it is selected and - when it is skipped.
+SESSION_LINE = re.compile(r"^([*-]) (.+?)(?: -> .*)?$")
+
+CODE_DIR = "/code"
+
+
+def parse_session_list(output: str) -> List[str]:
+    """
+    used to read the sessions nox would run from the output of nox --list
+    Args:
+        output: output of nox --list
+    Returns: names of the selected sessions, in the order nox lists them
+    """
+    sessions = []
+    for line in output.splitlines():
+        match = SESSION_LINE.match(line.strip())
+        if match and match.group(1) == "*":
+            sessions.append(match.group(2))
+    return sessions
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    # docker streams logs in chunks that do not follow line boundaries.
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="replace")
+        *lines, buffer = buffer.split("\n")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+class NoxContainerRunner:
+    """
+    Runs the nox sessions of a toolbelt in containers of the test image, with the toolbelt mounted at /code.
+    """
+
+    def __init__(self, docker_client: "DockerClient", image: str, toolbelt_dir: Path) -> None:
+        self.docker_client = docker_client
+        self.image = image
+        self.toolbelt_dir = toolbelt_dir
+
+    @property
+    def image_id(self) -> str:
+        # the id changes when a tag is pulled again, the name is used when the image can not be inspected.
+        try:
+            return self.docker_client.images.get(self.image).id
+        except DockerException as e:
+            logger.debug(f"Unable to inspect image {self.image} :: {e}")
+            return self.image
+
+    @property
+    def volumes(self) -> dict:
+        return {self.toolbelt_dir.as_posix(): {"bind": CODE_DIR, "mode": "rw"}}
+
+    def list_sessions(self) -> List[str]:
+        output = self.docker_client.containers.run(
+            image=self.image,
+            command=["nox", "--list", "-f", f"{CODE_DIR}/noxfile.py"],
+            volumes=self.volumes,
+            working_dir=CODE_DIR,
+            remove=True,
+        )
+        return parse_session_list(output.decode())
+
+    def run(self, sessions: Optional[List[str]] = None, prefix: Optional[str] = None, image: Optional[str] = None) -> int:
+        """
+        used to run nox in a new container, streaming its output while it runs.
+        Args:
+            sessions: the sessions to run, every selected session when None
+            prefix: prefix for each line of output, lines are logged without a prefix when None
+            image: image of the container, the test image when None
+        Returns: the exit code of nox
+        """
+        command = ["nox"]
+        if sessions:
+            command.extend(["--sessions", *sessions])
+
+        container = self.docker_client.containers.run(
+            image=image or self.image,
+            command=command,
+            volumes=self.volumes,
+            working_dir=CODE_DIR,
+            detach=True,
+        )
+        try:
+            for line in iter_lines(container.logs(stream=True, follow=True)):
+                if prefix is None:
+                    logger.info(line)
+                else:
+                    print_prefixed(prefix, line)
+            return container.wait()["StatusCode"]
+        finally:
+            container.remove(force=True)
@@ -9,3 +9,8 @@ class NoxfileTemplater(BaseTemplater):
 class PytestIniTemplater(BaseTemplater):
     def render_pytest_ini(self, tools) -> str:
         return self.render("pytest.ini.jinja2", tools=tools)
+
+
+class PtVenvImageTemplater(BaseTemplater):
+    def render_dockerfile(self, base_image: str, config, requirements, locked: bool, venv_dir: str) -> str:
+        return self.render("test-image.Dockerfile.jinja2", base_image=base_image, config=config, requirements=requirements, locked=locked, venv_dir=venv_dir)
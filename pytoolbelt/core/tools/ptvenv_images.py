@@ -0,0 +1,106 @@
+import hashlib
+import io
+import tarfile
+from typing import TYPE_CHECKING, Optional
+
+from docker.errors import ImageNotFound
+
+from pytoolbelt.core.project.ptvenv_lock import PtVenvLock, lock_platform
+from pytoolbelt.core.tools import hash_config
+from pytoolbelt.core.tools.noxtemplating import PtVenvImageTemplater
+from pytoolbelt.environment.config import get_logger
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+    from pytoolbelt.core.project.toolbelt_manifest import ManifestEntry
+
+logger = get_logger(__name__)
+
+IMAGE_REPOSITORY = "pytoolbelt-test"
+VENV_DIR = "/opt/pytoolbelt/venv"
+
+
+class PtVenvImageBuilder:
+    """
+    Builds a test image per ptvenv, derived from the test image of the toolbelt with pytest and the requirements
+    of the ptvenv installed. The tag of an image is a hash of the ptvenv definition (hash_config, covering its lock)
+    and of the test image, so an image is only built again when either of them changes.
+    """
+
+    def __init__(self, docker_client: "DockerClient", base_image: str, base_image_id: str) -> None:
+        self.docker_client = docker_client
+        self.base_image = base_image
+        self.base_image_id = base_image_id
+
+    @property
+    def platform(self) -> str:
+        attrs = self.docker_client.images.get(self.base_image).attrs
+        return lock_platform(attrs.get("Os"), attrs.get("Architecture"))
+
+    @staticmethod
+    def read_lock(ptvenv: "ManifestEntry") -> Optional[str]:
+        lock_file = ptvenv.path / f"{ptvenv.name}.lock"
+        return lock_file.read_text() if lock_file.exists() else None
+
+    def tag(self, ptvenv: "ManifestEntry") -> str:
+        config_hash = hash_config(ptvenv.config, self.read_lock(ptvenv))
+        image_hash = hashlib.sha256(f"{config_hash}:{self.base_image_id}".encode("utf-8")).hexdigest()
+        return f"{IMAGE_REPOSITORY}/{ptvenv.config.name}:{image_hash[:16]}"
+
+    def exists(self, tag: str) -> bool:
+        try:
+            self.docker_client.images.get(tag)
+        except ImageNotFound:
+            return False
+        return True
+
+    def get_build_context(self, ptvenv: "ManifestEntry") -> io.BytesIO:
+        lock_text = self.read_lock(ptvenv)
+        requirements = ptvenv.config.requirements
+        if lock_text is not None:
+            lock = PtVenvLock.from_text(lock_text)
+            lock.raise_if_stale(ptvenv.config)
+            if lock.platform:
+                lock.raise_if_wrong_platform(ptvenv.config, self.platform)
+            requirements = lock.pins
+
+        dockerfile = PtVenvImageTemplater().render_dockerfile(
+            base_image=self.base_image,
+            config=ptvenv.config,
+            requirements=requirements,
+            locked=lock_text is not None,
+            venv_dir=VENV_DIR,
+        )
+
+        context = io.BytesIO()
+        with tarfile.open(fileobj=context, mode="w") as tar:
+            for name, content in (("Dockerfile", dockerfile), ("requirements.txt", "\n".join(requirements) + "\n")):
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        context.seek(0)
+        return context
+
+    def build(self, ptvenv: "ManifestEntry") -> str:
+        """
+        used to get the test image of a ptvenv, building it if it does not exist yet.
+        Args:
+            ptvenv: manifest entry of the ptvenv
+        Returns: the tag of the image
+        """
+        tag = self.tag(ptvenv)
+        if self.exists(tag):
+            logger.debug(f"Test image {tag} of ptvenv {ptvenv.config.name} is up to date.")
+            return tag
+
+        logger.info(f"Building test image {tag} for ptvenv {ptvenv.config.name}.")
+        self.docker_client.images.build(
+            fileobj=self.get_build_context(ptvenv),
+            custom_context=True,
+            tag=tag,
+            rm=True,
+            labels={"pytoolbelt.ptvenv": ptvenv.config.name, "pytoolbelt.base-image": self.base_image},
+        )
+        return tag
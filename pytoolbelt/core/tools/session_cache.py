@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from pytoolbelt.environment.config import PYTOOLBELT_TEST_RESULT_CACHE_DIR, get_logger
+
+logger = get_logger(__name__)
+
+# name of a session of the generated noxfile, <ptvenv>-<python version> with (<tool>) for the session of each tool.
+SESSION_NAME = re.compile(r"^(?P<ptvenv>.+?)-(?P<python>\d+(?:\.\d+)*)(?:\((?P<tool>.+)\))?$")
+
+
+def parse_session_name(session: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    used to find the ptvenv and tool a session of the generated noxfile tests
+    Args:
+        session: name of the nox session
+    Returns: the name of the ptvenv and of the tool (None for a session without tools), or None for any other session
+    """
+    match = SESSION_NAME.match(session)
+    if not match:
+        return None
+    return match.group("ptvenv"), match.group("tool")
+
+
+class SessionResultCache:
+    """
+    The nox sessions known to pass, keyed by everything a session depends on: the content hash of the tool,
+    the hash of its ptvenv definition, the test image and the noxfile. A session whose key is in the cache
+    would run the same tests against the same code in the same environment, so it does not need to run again.
+    Only passing sessions are stored, one file per key, so concurrent sessions never write the same file.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        self.cache_dir = cache_dir or PYTOOLBELT_TEST_RESULT_CACHE_DIR
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def entry_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def has(self, key: str) -> bool:
+        return self.entry_file(key).exists()
+
+    def add(self, key: str, session: str) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{key}.", dir=self.cache_dir)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"session": session, "passed_at": time.time()}, f)
+            os.replace(tmp_path, self.entry_file(key))
+        except OSError as e:
+            # without the entry the session simply runs again next time.
+            logger.debug(f"Unable to cache the result of session {session} :: {e}")
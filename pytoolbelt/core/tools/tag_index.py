@@ -0,0 +1,180 @@
+import datetime
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from git import Repo
+from semver import Version
+
+from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
+from pytoolbelt.core.error_handling.exceptions import CliArgumentError
+from pytoolbelt.environment.config import get_logger
+
+logger = get_logger(__name__)
+
+RELEASE_KINDS = ("ptvenv", "tool")
+
+# tab separated, as tagger names may contain spaces. Annotated tags only have the date of the tagged commit when peeled.
+REF_FORMAT = "%09".join(
+    [
+        "%(refname:short)",
+        "%(objectname)",
+        "%(*objectname)",
+        "%(committerdate:iso-strict)",
+        "%(*committerdate:iso-strict)",
+        "%(taggername)",
+    ]
+)
+
+
+@dataclass
+class ReleaseRef:
+    tag: str
+    name: str
+    version: str
+    sha: str
+    date: str
+    tagger: str = ""
+
+    @property
+    def release_date(self) -> datetime.date:
+        return datetime.datetime.fromisoformat(self.date).date()
+
+
+class TagIndex:
+    """
+    An on-disk index of the release tags in a toolbelt repo, mapping kind -> name -> releases sorted by version,
+    with the commit sha of every release. The index is stored in .git/pytoolbelt and is keyed by the state of
+    packed-refs and refs/tags, so it is only rebuilt (with a single git for-each-ref) when the tags change.
+    """
+
+    FILENAME = "tag_index.json"
+    # bumped whenever the stored release fields change, so older index files are rebuilt.
+    FORMAT_VERSION = 2
+
+    def __init__(self, repo: Repo) -> None:
+        self.repo = repo
+        self.git_dir = Path(repo.git_dir)
+        self.path = self.git_dir / "pytoolbelt" / self.FILENAME
+        self._releases: Optional[Dict[str, Dict[str, List[Dict[str, str]]]]] = None
+
+    def get_key(self) -> str:
+        # creating, moving or deleting a loose tag changes the mtime of refs/tags, and packing refs rewrites packed-refs.
+        parts = [f"v{self.FORMAT_VERSION}"]
+        for path in (self.git_dir / "packed-refs", self.git_dir / "refs" / "tags"):
+            try:
+                stat = path.stat()
+                parts.append(f"{stat.st_mtime_ns}-{stat.st_size}")
+            except FileNotFoundError:
+                parts.append("none")
+        return ":".join(parts)
+
+    def read_refs(self) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+        """
+        used to read every release tag of the repo with one git for-each-ref call.
+        Returns: releases by kind and name, each sorted by version from oldest to newest
+        """
+        output = self.repo.git.for_each_ref("refs/tags", format=REF_FORMAT)
+
+        releases = {kind: {} for kind in RELEASE_KINDS}
+        versions = {}
+        for line in output.splitlines():
+            tag, sha, peeled_sha, date, peeled_date, tagger = line.split("\t")
+            # tags of other tools in the repo may not follow the release tag format at all.
+            if tag.split("-", 1)[0] not in releases:
+                continue
+
+            try:
+                meta = ComponentMetadata.from_release_tag(tag)
+            except (ValueError, CliArgumentError):
+                logger.debug(f"Skipping tag {tag}, it is not a valid release tag.")
+                continue
+
+            # annotated tags point at a tag object, the peeled sha and date are those of the commit it tags.
+            releases[meta.kind].setdefault(meta.name, []).append(
+                {
+                    "tag": tag,
+                    "name": meta.name,
+                    "version": str(meta.version),
+                    "sha": peeled_sha or sha,
+                    "date": peeled_date or date,
+                    "tagger": tagger,
+                }
+            )
+            versions[tag] = meta.version
+
+        for kind in releases.values():
+            for name_releases in kind.values():
+                name_releases.sort(key=lambda r: versions[r["tag"]])
+        return releases
+
+    def save(self, key: str, releases: Dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.FILENAME}.", dir=self.path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"key": key, "releases": releases}, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+        key = self.get_key()
+        try:
+            data = json.loads(self.path.read_text())
+            if data["key"] == key:
+                return data["releases"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        logger.debug(f"Rebuilding release tag index of {self.git_dir}")
+        return self.refresh(key)
+
+    def refresh(self, key: Optional[str] = None) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+        key = key or self.get_key()
+        releases = self.read_refs()
+        try:
+            self.save(key, releases)
+        except OSError as e:
+            # the index is only an optimization, a read only repo still works without it.
+            logger.debug(f"Unable to write the release tag index :: {e}")
+        self._releases = releases
+        return releases
+
+    @property
+    def releases(self) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+        if self._releases is None:
+            self._releases = self.load()
+        return self._releases
+
+    def get_releases(self, kind: str, name: Optional[str] = None) -> List[Dict[str, str]]:
+        by_name = self.releases.get(kind, {})
+        if name:
+            return list(by_name.get(name, []))
+        return [release for name in sorted(by_name) for release in by_name[name]]
+
+    def release_refs(self, kind: str, name: Optional[str] = None) -> List[ReleaseRef]:
+        """
+        used to get the release tags of a kind of component with the commit, commit date and tagger of each release.
+        Args:
+            kind: ptvenv or tool
+            name: optional name of the component, all components of the kind are returned when None
+        Returns: ReleaseRefs sorted by component name and version
+        """
+        return [ReleaseRef(**release) for release in self.get_releases(kind, name)]
+
+    def release_tags(self, kind: str, name: Optional[str] = None) -> List[str]:
+        return [release["tag"] for release in self.get_releases(kind, name)]
+
+    def latest_release(self, kind: str, name: str) -> Optional[ComponentMetadata]:
+        """
+        used to get the newest release of a component that is not a prerelease.
+        Args:
+            kind: ptvenv or tool
+            name: name of the component
+        Returns: ComponentMetadata of the latest release, or None if the component has never been released
+        """
+        for release in reversed(self.releases.get(kind, {}).get(name, [])):
+            if not Version.parse(release["version"]).prerelease:
+                return ComponentMetadata(name, Version.parse(release["version"]), kind)
+        return None
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from pytoolbelt.environment.config import (
+    PYTOOLBELT_WHEEL_CACHE_DIR,
+    PYTOOLBELT_WHEEL_CACHE_MAX_SIZE,
+)
+
+
+@dataclass
+class WheelCacheEntry:
+    key: str
+    path: Path
+    size: int
+    wheels: int
+    last_used: float
+
+
+class WheelCache:
+    """
+    A content addressed store of built wheels shared by every ptvenv build. Each entry is keyed by
+    the hash of a requirement set and the interpreter / platform it was built for, so that a later build
+    of the same requirements can install fully offline with pip's --no-index --find-links options.
+    """
+
+    COMPLETE_MARKER = ".complete"
+
+    def __init__(self, root: Optional[Path] = None, max_size: Optional[int] = None) -> None:
+        self.root = root or PYTOOLBELT_WHEEL_CACHE_DIR
+        self.max_size = max_size if max_size is not None else PYTOOLBELT_WHEEL_CACHE_MAX_SIZE * 1024 * 1024
+
+    @staticmethod
+    def get_key(python_version: str, requirements: List[str]) -> str:
+        payload = json.dumps(
+            {
+                "python_version": python_version,
+                "platform": sys.platform,
+                "machine": platform.machine(),
+                "requirements": sorted(requirements),
+            }
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def dir_size(directory: Path) -> int:
+        return sum(f.stat().st_size for f in directory.rglob("*") if f.is_file())
+
+    def entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def has(self, key: str) -> bool:
+        return (self.entry_dir(key) / self.COMPLETE_MARKER).exists()
+
+    def touch(self, key: str) -> None:
+        if self.has(key):
+            os.utime(self.entry_dir(key) / self.COMPLETE_MARKER)
+
+    def create_staging_dir(self, key: str) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.root))
+
+    def discard(self, staging_dir: Path) -> None:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def commit(self, key: str, staging_dir: Path) -> None:
+        (staging_dir / self.COMPLETE_MARKER).touch()
+        try:
+            staging_dir.rename(self.entry_dir(key))
+        except OSError:
+            # another build populated the same entry first, keep theirs.
+            self.discard(staging_dir)
+
+    def entries(self) -> List[WheelCacheEntry]:
+        if not self.root.exists():
+            return []
+
+        entries = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or not self.has(entry.name):
+                continue
+            entries.append(
+                WheelCacheEntry(
+                    key=entry.name,
+                    path=entry,
+                    size=self.dir_size(entry),
+                    wheels=len(list(entry.glob("*.whl"))),
+                    last_used=(entry / self.COMPLETE_MARKER).stat().st_mtime,
+                )
+            )
+        return sorted(entries, key=lambda e: e.last_used, reverse=True)
+
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.entries())
+
+    def remove(self, key: str) -> None:
+        shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+
+    def prune(self, max_size: Optional[int] = None) -> List[WheelCacheEntry]:
+        """
+        used to evict the least recently used entries until the cache fits in max_size bytes.
+        Args:
+            max_size: size cap in bytes, defaults to the configured cache size
+        Returns: the evicted entries
+        """
+        max_size = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        total = sum(entry.size for entry in entries)
+
+        evicted = []
+        for entry in reversed(entries):
+            if total <= max_size:
+                break
+            self.remove(entry.key)
+            total -= entry.size
+            evicted.append(entry)
+        return evicted
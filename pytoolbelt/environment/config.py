@@ -45,6 +45,29 @@ PYTOOLBELT_LOG_MSG_FORMAT = "%(levelname)s :: %(asctime)s :: %(name)s :: %(messa
 PYTOOLBELT_STREAM_FORMAT = "%(message)s"
 PYTOOLBELT_LOG_DATE_FORMAT = "%Y-%m-%d %I:%M:%S %p"
 
+# shared cache directories used to speed up ptvenv builds. The wheel cache is size capped (in MB)
+# and least recently used entries are evicted once the cap is exceeded.
+PYTOOLBELT_CACHE_DIR = Path(os.getenv("PYTOOLBELT_CACHE_DIR", Path.home() / ".pytoolbelt" / "cache"))
+PYTOOLBELT_WHEEL_CACHE_DIR = PYTOOLBELT_CACHE_DIR / "wheels"
+PYTOOLBELT_WHEEL_CACHE_MAX_SIZE = int(os.getenv("PYTOOLBELT_WHEEL_CACHE_MAX_SIZE", "2048"))
+
+# identical files across installed ptvenv versions are linked to a single copy in the dedup pool.
+PYTOOLBELT_DEDUP_POOL_DIR = PYTOOLBELT_CACHE_DIR / "pool"
+PYTOOLBELT_DEDUP_PTVENVS = os.getenv("PYTOOLBELT_DEDUP_PTVENVS", "true").lower() == "true"
+
+# parsed tool and ptvenv configs of a toolbelt can be persisted between runs of commands that read all of them.
+PYTOOLBELT_CONFIG_CACHE_DIR = PYTOOLBELT_CACHE_DIR / "configs"
+PYTOOLBELT_CONFIG_DISK_CACHE = os.getenv("PYTOOLBELT_CONFIG_DISK_CACHE", "false").lower() == "true"
+
+# compiled jinja templates are kept between runs, so templating commands do not parse the templates again.
+PYTOOLBELT_TEMPLATE_CACHE_DIR = PYTOOLBELT_CACHE_DIR / "templates"
+
+# nox sessions that passed, keyed by the content of the tool, its ptvenv definition and the test image.
+PYTOOLBELT_TEST_RESULT_CACHE_DIR = PYTOOLBELT_CACHE_DIR / "test-results"
+
+# seconds a fetch of a toolbelt remote stays fresh, commands within this window do not contact the remote.
+PYTOOLBELT_FETCH_TTL = float(os.getenv("PYTOOLBELT_FETCH_TTL", "60"))
+
 
 def init_home():
     for directory in [
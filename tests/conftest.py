@@ -0,0 +1,40 @@
+import pytest
+from git import Repo
+
+
+@pytest.fixture
+def write_tool():
+    def write(root, name, version, ptvenv):
+        tool_dir = root / "tools" / name
+        tool_dir.mkdir(parents=True)
+        (tool_dir / "config.yml").write_text(f"tool:\n  name: {name}\n  version: {version}\n  ptvenv:\n    name: {ptvenv}\n    version: 0.0.1\n")
+        (tool_dir / "__main__.py").write_text("print('hello')\n")
+
+    return write
+
+
+@pytest.fixture
+def write_ptvenv():
+    def write(root, name, version):
+        ptvenv_dir = root / "ptvenv" / name
+        ptvenv_dir.mkdir(parents=True)
+        (ptvenv_dir / f"{name}.yml").write_text(f"name: {name}\nversion: {version}\npython_version: '3.11'\nrequirements:\n  - six\n")
+
+    return write
+
+
+@pytest.fixture
+def init_repo():
+    """Initializes a git repo with a committer identity, committing the files already in it unless commit is False."""
+
+    def init(root, commit=True, **kwargs):
+        repo = Repo.init(root, **kwargs)
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "pytoolbelt")
+            config.set_value("user", "email", "pytoolbelt@example.com")
+        if commit:
+            repo.git.add("--all")
+            repo.index.commit("initial")
+        return repo
+
+    return init
@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 from jinja2 import PackageLoader
 
+from pytoolbelt.core.bases import base_templater
 from pytoolbelt.core.bases.base_templater import BaseTemplater
 
 
@@ -26,3 +29,31 @@ def test_render_renders_template_with_provided_context(templater):
 def test_render_raises_exception_for_nonexistent_template(templater):
     with pytest.raises(Exception):
         templater.render("nonexistent_template")
+
+
+def test_templaters_share_one_environment(templater):
+    assert BaseTemplater().jinja_env is templater.jinja_env
+
+
+def test_compiled_templates_are_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_templater, "_jinja_env", None)
+    monkeypatch.setattr(base_templater, "PYTOOLBELT_TEMPLATE_CACHE_DIR", tmp_path / "templates")
+
+    assert "Hello, World!" in BaseTemplater().render("sample_template.jinja2", name="World")
+    assert len(list((tmp_path / "templates").iterdir())) == 1
+
+    # a new process starts with an empty environment and loads the compiled template from the cache.
+    monkeypatch.setattr(base_templater, "_jinja_env", None)
+    with patch("jinja2.Environment.compile") as compile_template:
+        assert "Hello, World!" in BaseTemplater().render("sample_template.jinja2", name="World")
+    compile_template.assert_not_called()
+
+
+def test_templates_are_compiled_when_cache_is_unavailable(tmp_path, monkeypatch):
+    (tmp_path / "file").write_text("")
+    monkeypatch.setattr(base_templater, "_jinja_env", None)
+    monkeypatch.setattr(base_templater, "PYTOOLBELT_TEMPLATE_CACHE_DIR", tmp_path / "file" / "templates")
+
+    templater = BaseTemplater()
+    assert templater.jinja_env.bytecode_cache is None
+    assert "Hello, World!" in templater.render("sample_template.jinja2", name="World")
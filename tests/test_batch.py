@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools.batch import BatchTask, run_batch
+
+
+def fail() -> None:
+    raise RuntimeError("boom")
+
+
+def test_run_batch_keeps_task_order():
+    tasks = [BatchTask(name=f"task-{i}", version="0.0.1", func=lambda: None) for i in range(5)]
+    results = run_batch(tasks, jobs=3)
+    assert [r.name for r in results] == [t.name for t in tasks]
+    assert all(r.status == "success" for r in results)
+
+
+def test_run_batch_failure_does_not_stop_other_tasks():
+    tasks = [
+        BatchTask(name="bad", version="0.0.1", func=fail),
+        BatchTask(name="good", version="0.0.1", func=lambda: None),
+    ]
+    bad, good = run_batch(tasks, jobs=1)
+    assert bad.failed
+    assert bad.message == "boom"
+    assert not good.failed
+
+
+def test_run_batch_runs_tasks_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    tasks = [BatchTask(name=name, version="0.0.1", func=barrier.wait) for name in ("a", "b")]
+    assert not any(r.failed for r in run_batch(tasks, jobs=2))
+
+
+def test_run_batch_raises_on_invalid_jobs():
+    with pytest.raises(PytoolbeltError):
+        run_batch([], jobs=0)
+
+
+def test_run_batch_keeps_task_message():
+    (result,) = run_batch([BatchTask(name="a", version="0.0.1", func=lambda: "updated")], jobs=1)
+    assert result.message == "updated"
@@ -0,0 +1,65 @@
+import sys
+
+import pytest
+
+from pytoolbelt.cli import COMMANDS
+from pytoolbelt.cli.controllers.bench_controller import BenchController
+from pytoolbelt.core.error_handling.exceptions import BenchmarkError, PytoolbeltError
+from pytoolbelt.core.project.tool_components import ToolInstaller
+from pytoolbelt.core.tools.benchmark import (
+    BenchmarkResult,
+    benchmark_command,
+    compare_to_baseline,
+    load_baseline,
+    results_to_json,
+)
+
+
+def test_benchmark_command_times_cold_and_warm_runs():
+    result = benchmark_command("python", [sys.executable, "-c", "pass"], runs=3)
+    assert result.cold > 0
+    assert len(result.warm) == 3
+    assert result.min <= result.median <= result.max
+
+
+def test_benchmark_command_raises_on_failing_command():
+    with pytest.raises(BenchmarkError, match="exited with 1"):
+        benchmark_command("fail", [sys.executable, "-c", "raise SystemExit(1)"], runs=1)
+
+
+def test_benchmark_result_without_warm_runs_uses_cold_time():
+    result = BenchmarkResult(name="once", cold=0.5)
+    assert result.to_dict() == {"name": "once", "cold": 0.5, "warm": [], "mean": 0.5, "median": 0.5, "min": 0.5, "max": 0.5}
+
+
+def test_compare_to_baseline_flags_regressions_over_threshold():
+    results = [BenchmarkResult(name="fast", cold=1.0, warm=[1.1]), BenchmarkResult(name="slow", cold=1.0, warm=[1.5]), BenchmarkResult(name="new", cold=1.0)]
+    comparisons = compare_to_baseline(results, {"fast": 1.0, "slow": 1.0}, threshold=20.0)
+
+    assert [c.name for c in comparisons] == ["fast", "slow"]
+    assert not comparisons[0].regressed
+    assert comparisons[1].regressed
+    assert comparisons[1].change == pytest.approx(50.0)
+
+
+def test_results_json_can_be_loaded_as_baseline(tmp_path):
+    results_file = tmp_path / "results.json"
+    results_file.write_text(results_to_json([BenchmarkResult(name="python", cold=0.2, warm=[0.1, 0.3, 0.2])], runs=3))
+    assert load_baseline(results_file) == {"python": 0.2}
+
+
+def test_load_baseline_raises_on_invalid_file(tmp_path):
+    results_file = tmp_path / "results.json"
+    results_file.write_text("not json")
+    with pytest.raises(PytoolbeltError):
+        load_baseline(results_file)
+
+
+def test_bench_controller_covers_every_command():
+    assert [["--version"]] + [[command, "--help"] for command in sorted(COMMANDS)] == BenchController.cli_commands()
+
+
+def test_bench_controller_times_every_tool_install_mode():
+    results = BenchController(runs=0).bench_tools()
+    assert [r.name for r in results] == [f"tool {mode}" for mode in ToolInstaller.INSTALL_MODES] + ["tool dev-mode"]
+    assert all(r.cold > 0 for r in results)
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from typing import List, Set, Tuple
+
+import pytest
+
+from pytoolbelt.cli import COMMANDS, parse_args
+
+# generous enough for slow CI machines, while still catching an eager import of the heavy dependencies.
+IMPORT_TIME_BUDGET_US = 150_000
+
+PROFILE_SCRIPT = """
+import sys
+from pytoolbelt.cli import parse_args
+try:
+    parse_args(sys.argv[1:])
+except SystemExit:
+    pass
+print(",".join(sys.modules))
+"""
+
+
+def profile_imports(argv: List[str]) -> Tuple[int, Set[str]]:
+    """
+    used to run the cli parser in a fresh interpreter with python -X importtime.
+    Returns: the import time of pytoolbelt in microseconds and the names of the imported modules
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROFILE_SCRIPT, *argv], capture_output=True, text=True, check=True)
+    modules = set(result.stdout.strip().splitlines()[-1].split(","))
+
+    # every line is "import time: self | cumulative | name", with nested imports indented. Only top level
+    # imports from the first pytoolbelt import on are counted, as the ones before are interpreter startup.
+    total = 0
+    counting = False
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        if name.startswith("  "):
+            continue
+        counting = counting or name.strip().startswith("pytoolbelt")
+        if counting:
+            total += int(cumulative)
+    return total, modules
+
+
+@pytest.mark.parametrize("argv", [["--version"], ["installed", "--help"]])
+def test_cli_startup_does_not_import_heavy_dependencies(argv):
+    _, modules = profile_imports(argv)
+    assert not {"git", "docker", "jinja2"} & modules
+
+
+def test_cli_version_import_time_budget():
+    total, _ = profile_imports(["--version"])
+    assert total < IMPORT_TIME_BUDGET_US
+
+
+def test_parse_args_only_loads_the_selected_command():
+    cliargs = parse_args(["installed"])
+    assert cliargs.command == "installed"
+    assert callable(cliargs.func)
+
+
+@pytest.mark.parametrize("command", sorted(COMMANDS))
+def test_every_command_parser_configures(command):
+    with pytest.raises(SystemExit) as e:
+        parse_args([command, "--help"])
+    assert e.value.code == 0
@@ -0,0 +1,153 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pytoolbelt.core.tools import config_io
+from pytoolbelt.core.tools.config_io import (
+    disk_cached_configs,
+    dump_yaml,
+    get_disk_cache_file,
+    invalidate,
+    load_yaml,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    invalidate()
+    yield
+    invalidate()
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    file = tmp_path / "config.yml"
+    file.write_text("tool:\n  name: sample\n")
+    return file
+
+
+def test_load_yaml_parses_file_once(config_file):
+    with patch("yaml.load", wraps=config_io.yaml.load) as mock_load:
+        assert load_yaml(config_file) == {"tool": {"name": "sample"}}
+        assert load_yaml(config_file) == {"tool": {"name": "sample"}}
+    mock_load.assert_called_once()
+
+
+def test_load_yaml_returns_copies(config_file):
+    load_yaml(config_file)["tool"]["name"] = "changed"
+    assert load_yaml(config_file) == {"tool": {"name": "sample"}}
+
+
+def test_load_yaml_reparses_when_file_changes(config_file):
+    load_yaml(config_file)
+    config_file.write_text("tool:\n  name: renamed\n")
+    os.utime(config_file, ns=(1, 1))
+    assert load_yaml(config_file) == {"tool": {"name": "renamed"}}
+
+
+def test_dump_yaml_invalidates_cached_data(config_file):
+    load_yaml(config_file)
+    stat = config_file.stat()
+    dump_yaml(config_file, {"tool": {"name": "other"}})
+    # restore the old stat, so only the invalidation on write can make the new data visible.
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_yaml(config_file) == {"tool": {"name": "other"}}
+
+
+def test_load_yaml_expands_vars_separately(tmp_path, monkeypatch):
+    monkeypatch.setenv("PTC_TEST_NAME", "expanded")
+    file = tmp_path / "toolbelt.yml"
+    file.write_text("name: $PTC_TEST_NAME\n")
+    assert load_yaml(file) == {"name": "$PTC_TEST_NAME"}
+    assert load_yaml(file, expand_vars=True) == {"name": "expanded"}
+
+
+def test_disk_cached_configs_persists_entries(tmp_path, config_file):
+    cache_dir = tmp_path / "cache"
+    with disk_cached_configs(tmp_path, enabled=True, cache_dir=cache_dir):
+        load_yaml(config_file)
+    assert get_disk_cache_file(tmp_path, cache_dir).exists()
+
+    invalidate()
+    with patch("yaml.load") as mock_load:
+        with disk_cached_configs(tmp_path, enabled=True, cache_dir=cache_dir):
+            assert load_yaml(config_file) == {"tool": {"name": "sample"}}
+    mock_load.assert_not_called()
+
+
+def test_disk_cached_configs_disabled_writes_nothing(tmp_path, config_file):
+    cache_dir = tmp_path / "cache"
+    with disk_cached_configs(tmp_path, enabled=False, cache_dir=cache_dir):
+        load_yaml(config_file)
+    assert not cache_dir.exists()
+
+
+def test_disk_cached_configs_ignores_corrupt_cache(tmp_path, config_file):
+    cache_dir = tmp_path / "cache"
+    cache_file = get_disk_cache_file(tmp_path, cache_dir)
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_bytes(b"not a pickle")
+    with disk_cached_configs(tmp_path, enabled=True, cache_dir=cache_dir):
+        assert load_yaml(config_file) == {"tool": {"name": "sample"}}
+
+
+TOOL_CONFIG = """tool:
+  name: sample
+  version: 0.0.1
+  ptvenv:
+    name: base
+    version: 0.0.2
+"""
+
+PTVENV_CONFIG = """name: base
+version: 0.0.2
+python_version: '3.11'
+requirements:
+  - requests==2.31.0
+  - pyyaml>=6
+"""
+
+
+def toolbelt_configs(count):
+    return {
+        "repos": {
+            f"toolbelt{i}": {
+                "url": f"git@github.com:owner/toolbelt{i}.git",
+                "owner": "owner",
+                "name": f"toolbelt{i}",
+                "release_branch": "main",
+                "path": f"/home/user/pytoolbelt/toolbelts/toolbelt{i}",
+            }
+            for i in range(count)
+        }
+    }
+
+
+@pytest.mark.parametrize("text", [TOOL_CONFIG, PTVENV_CONFIG])
+def test_loader_matches_pure_python_loader(text):
+    assert config_io.yaml.load(text, Loader=config_io.SafeLoader) == config_io.yaml.safe_load(text)
+
+
+@pytest.mark.parametrize("text", [TOOL_CONFIG, PTVENV_CONFIG])
+def test_indented_configs_round_trip_byte_identical(tmp_path, text):
+    file = tmp_path / "config.yml"
+    file.write_text(text)
+    dump_yaml(file, load_yaml(file), Dumper=config_io.IndentedSafeDumper, sort_keys=False, indent=2)
+    assert file.read_text() == text
+
+
+def test_toolbelt_config_output_matches_pure_python_dumper(tmp_path):
+    file = tmp_path / "toolbelt.yml"
+    data = toolbelt_configs(200)
+    dump_yaml(file, data)
+    assert file.read_text() == config_io.yaml.safe_dump(data)
+    assert load_yaml(file) == data
+
+
+def test_toolbelt_config_round_trip_byte_identical(tmp_path):
+    file = tmp_path / "toolbelt.yml"
+    file.write_text(config_io.yaml.safe_dump(toolbelt_configs(3)))
+    text = file.read_text()
+    dump_yaml(file, load_yaml(file))
+    assert file.read_text() == text
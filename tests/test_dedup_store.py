@@ -0,0 +1,59 @@
+import pytest
+
+from pytoolbelt.core.tools.dedup_store import DedupStore
+
+
+@pytest.fixture
+def dedup_store(tmp_path):
+    return DedupStore(root=tmp_path / "pool", venv_install_dir=tmp_path / "environments")
+
+
+def make_install(tmp_path, version, files):
+    install_version_dir = tmp_path / "environments" / "ptbase" / version
+    venv_dir = install_version_dir / "venv"
+    for name, content in files.items():
+        file = venv_dir / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content)
+    return venv_dir, install_version_dir / DedupStore.MANIFEST_FILENAME
+
+
+def test_deduplicate_links_identical_files(dedup_store, tmp_path):
+    first_dir, first_manifest = make_install(tmp_path, "0.0.1", {"lib/a.py": "a", "lib/b.py": "b"})
+    second_dir, second_manifest = make_install(tmp_path, "0.0.2", {"lib/a.py": "a", "lib/b.py": "changed"})
+
+    first = dedup_store.deduplicate(first_dir, first_manifest)
+    second = dedup_store.deduplicate(second_dir, second_manifest)
+
+    assert first.linked == 0
+    assert second.linked == 1
+    assert (second_dir / "lib/a.py").read_text() == "a"
+    assert (second_dir / "lib/b.py").read_text() == "changed"
+    assert len(second_manifest.read_text().splitlines()) == 2
+
+
+def test_deduplicate_keeps_file_modes_apart(dedup_store, tmp_path):
+    first_dir, first_manifest = make_install(tmp_path, "0.0.1", {"bin/tool": "same"})
+    second_dir, second_manifest = make_install(tmp_path, "0.0.2", {"bin/tool": "same"})
+    (second_dir / "bin/tool").chmod(0o755)
+
+    dedup_store.deduplicate(first_dir, first_manifest)
+    result = dedup_store.deduplicate(second_dir, second_manifest)
+
+    assert result.linked == 0
+    assert (second_dir / "bin/tool").stat().st_mode & 0o777 == 0o755
+
+
+def test_gc_removes_unreferenced_entries_only(dedup_store, tmp_path):
+    first_dir, first_manifest = make_install(tmp_path, "0.0.1", {"a.py": "a"})
+    second_dir, second_manifest = make_install(tmp_path, "0.0.2", {"b.py": "b"})
+    dedup_store.deduplicate(first_dir, first_manifest)
+    dedup_store.deduplicate(second_dir, second_manifest)
+
+    first_manifest.unlink()
+    result = dedup_store.gc()
+
+    assert result.files == 1
+    assert (first_dir / "a.py").read_text() == "a"
+    remaining = [p.name for p in dedup_store.root.glob("*/*")]
+    assert remaining == second_manifest.read_text().splitlines()
@@ -0,0 +1,120 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from git import Git, Repo
+
+from pytoolbelt.core.tools.git_client import GitClient, TemporaryGitClient
+
+
+@pytest.fixture
+def toolbelt_repo(tmp_path, init_repo):
+    root = tmp_path / "toolbelt"
+    for path in ["tools/my_tool/__main__.py", "tools/other_tool/__main__.py", "ptvenv/my_ptvenv/my_ptvenv.yml"]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text("v1")
+
+    repo = init_repo(root, commit=False)
+    repo.index.add(["tools", "ptvenv"])
+    repo.index.commit("initial")
+    repo.create_tag("tool-my_tool-0.0.1")
+
+    (root / "tools/my_tool/__main__.py").write_text("v2")
+    repo.index.add(["tools"])
+    repo.index.commit("change")
+    return root
+
+
+def test_export_writes_only_requested_paths_at_ref(toolbelt_repo):
+    with TemporaryGitClient(toolbelt_repo, "toolbelt") as (tmp_repo, _):
+        export_dir = tmp_repo.export("tool-my_tool-0.0.1", ["tools/my_tool"])
+
+        assert (export_dir / "tools/my_tool/__main__.py").read_text() == "v1"
+        assert not (export_dir / "tools/other_tool").exists()
+        assert not (export_dir / "ptvenv").exists()
+        assert not (export_dir / ".git").exists()
+
+
+def test_export_of_several_refs_share_a_directory(toolbelt_repo):
+    with TemporaryGitClient(toolbelt_repo, "toolbelt") as (tmp_repo, _):
+        tmp_repo.export("tool-my_tool-0.0.1", ["tools/my_tool"])
+        export_dir = tmp_repo.export("HEAD", ["ptvenv/my_ptvenv"])
+
+        assert (export_dir / "tools/my_tool/__main__.py").read_text() == "v1"
+        assert (export_dir / "ptvenv/my_ptvenv/my_ptvenv.yml").exists()
+
+
+def test_temporary_git_client_uses_the_real_repo(toolbelt_repo):
+    (toolbelt_repo / "tools/my_tool/__main__.py").write_text("dirty")
+    with TemporaryGitClient(toolbelt_repo, "toolbelt") as (tmp_repo, git_client):
+        assert git_client.repo.is_dirty()
+    assert not tmp_repo.tmp_dir.exists()
+
+
+@pytest.fixture
+def clone(toolbelt_repo, tmp_path):
+    return GitClient(Repo.clone_from(toolbelt_repo, tmp_path / "clone"))
+
+
+def test_fetch_records_remote_state(clone):
+    assert clone.fetch(ttl=0)
+    assert clone.fetch_state.refs("origin") == clone.remote_refs()
+    assert clone.fetch_state.fetched_at("origin") is not None
+
+
+def test_fetch_is_skipped_while_fresh(clone):
+    clone.fetch(ttl=0)
+    with patch.object(GitClient, "remote_refs") as remote_refs:
+        assert not clone.fetch(ttl=60)
+        remote_refs.assert_not_called()
+
+
+def test_fetch_is_skipped_when_remote_is_unchanged(clone):
+    clone.fetch(ttl=0)
+    with patch.object(Git, "fetch", create=True) as fetch:
+        assert not clone.fetch(ttl=0)
+        fetch.assert_not_called()
+
+
+def test_fetch_picks_up_new_remote_tags(toolbelt_repo, clone):
+    clone.fetch(ttl=0)
+    Repo(toolbelt_repo).create_tag("tool-other_tool-0.0.1")
+    assert clone.fetch(ttl=0)
+    assert "tool-other_tool-0.0.1" in clone.tool_releases(as_names=True)
+
+
+def test_offline_fetch_does_not_contact_remote(clone):
+    with patch.object(GitClient, "remote_refs") as remote_refs:
+        assert not clone.fetch(offline=True)
+        remote_refs.assert_not_called()
+
+
+def test_partial_shallow_sparse_clone(toolbelt_repo, tmp_path):
+    (toolbelt_repo / "docs").mkdir()
+    (toolbelt_repo / "docs/index.md").write_text("docs")
+    repo = Repo(toolbelt_repo)
+    repo.index.add(["docs"])
+    repo.index.commit("docs")
+    repo.config_writer().set_value("uploadpack", "allowFilter", "true").release()
+
+    clone = GitClient.clone_from_url(toolbelt_repo.as_uri(), tmp_path / "clone", clone_filter="blob:none", depth=1, sparse=True)
+    root = Path(clone.repo.working_tree_dir)
+
+    assert (root / "tools/my_tool/__main__.py").read_text() == "v2"
+    assert not (root / "docs").exists()
+    assert len(list(clone.repo.iter_commits())) == 1
+    # the release tag is on an older commit than the one cloned, so it is fetched separately.
+    assert clone.tool_releases(as_names=True) == ["tool-my_tool-0.0.1"]
+
+    with TemporaryGitClient(root, "toolbelt") as (tmp_repo, _):
+        export_dir = tmp_repo.export("tool-my_tool-0.0.1", ["tools/my_tool"])
+        assert (export_dir / "tools/my_tool/__main__.py").read_text() == "v1"
+
+
+def test_get_tag_reference_fetches_missing_tags(toolbelt_repo, clone):
+    Repo(toolbelt_repo).create_tag("tool-other_tool-0.0.1")
+    assert clone.get_tag_reference("tool-other_tool-0.0.1").is_valid()
+    assert clone.tool_releases("other_tool", as_names=True) == ["tool-other_tool-0.0.1"]
+
+    with pytest.raises(IndexError):
+        clone.get_tag_reference("tool-other_tool-9.9.9")
@@ -0,0 +1,52 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools.installers import PipInstaller, UvInstaller, get_installer
+
+
+@pytest.fixture
+def mock_paths():
+    paths = MagicMock()
+    paths.install_dir = Path("/envs/ptbase/1.0.0/venv")
+    paths.python_executable_path = Path("/envs/ptbase/1.0.0/venv/bin/python")
+    paths.pip_executable_path = Path("/envs/ptbase/1.0.0/venv/bin/pip")
+    return paths
+
+
+def test_pip_installer_create_command(mock_paths):
+    command = PipInstaller().create_command("3.10", mock_paths)
+    assert command == ["python3.10", "-m", "venv", "/envs/ptbase/1.0.0/venv", "--clear"]
+
+
+def test_pip_installer_install_command_with_find_links(mock_paths):
+    command = PipInstaller().install_command(mock_paths, ["requests"], find_links=Path("/cache/key"))
+    assert command == ["/envs/ptbase/1.0.0/venv/bin/pip", "install", "--no-index", "--find-links", "/cache/key", "requests"]
+
+
+def test_uv_installer_targets_venv_python(mock_paths):
+    command = UvInstaller().install_command(mock_paths, ["requests"])
+    assert command == ["uv", "pip", "install", "--python", "/envs/ptbase/1.0.0/venv/bin/python", "requests"]
+
+
+def test_uv_installer_does_not_use_wheel_cache(mock_paths):
+    assert not UvInstaller.supports_wheel_cache
+    command = UvInstaller().wheel_command(mock_paths, Path("/cache"), ["requests"])
+    assert command == ["/envs/ptbase/1.0.0/venv/bin/pip", "wheel", "--wheel-dir", "/cache", "requests"]
+
+
+def test_get_installer_returns_pip_installer():
+    assert isinstance(get_installer("pip"), PipInstaller)
+
+
+def test_get_installer_raises_for_unknown_installer():
+    with pytest.raises(PytoolbeltError):
+        get_installer("poetry")
+
+
+@patch("shutil.which", return_value=None)
+def test_get_installer_raises_when_executable_missing(mock_which):
+    with pytest.raises(PytoolbeltError):
+        get_installer("uv")
@@ -0,0 +1,79 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pytoolbelt.cli.controllers import test_controller
+from pytoolbelt.core.tools.nox_runner import NoxContainerRunner, iter_lines, parse_session_list
+
+NOX_LIST_OUTPUT = """Sessions defined in /code/noxfile.py:
+
+* base-3.11(hello)
+* base-3.11(bye) -> Run the tests of bye.
+- lint-3.11
+* other-3.12
+
+sessions marked with * are selected, sessions marked with - are skipped.
+"""
+
+
+def make_container(logs, status_code=0):
+    container = MagicMock()
+    container.logs.return_value = logs
+    container.wait.return_value = {"StatusCode": status_code}
+    return container
+
+
+def test_parse_session_list_reads_selected_sessions():
+    assert parse_session_list(NOX_LIST_OUTPUT) == ["base-3.11(hello)", "base-3.11(bye)", "other-3.12"]
+
+
+def test_iter_lines_joins_chunks_split_mid_line():
+    assert list(iter_lines([b"first li", b"ne\nsecond\nth", b"ird"])) == ["first line", "second", "third"]
+
+
+def test_runner_prefixes_session_output():
+    docker_client = MagicMock()
+    container = make_container([b"collected 1 item\n", b"1 passed\n"], status_code=1)
+    docker_client.containers.run.return_value = container
+    runner = NoxContainerRunner(docker_client, "image", Path("/toolbelt"))
+
+    with patch("pytoolbelt.core.tools.nox_runner.print_prefixed") as print_prefixed:
+        assert runner.run(["base-3.11(hello)"], prefix="base-3.11(hello)") == 1
+
+    assert docker_client.containers.run.call_args.kwargs["command"] == ["nox", "--sessions", "base-3.11(hello)"]
+    assert [c.args for c in print_prefixed.call_args_list] == [("base-3.11(hello)", "collected 1 item"), ("base-3.11(hello)", "1 passed")]
+    container.remove.assert_called_once_with(force=True)
+
+
+@pytest.fixture
+def controller(tmp_path):
+    ptc = MagicMock(test_image="image")
+    toolbelt = MagicMock(path=tmp_path)
+    toolbelt.name = "my-toolbelt"
+    # imported through the module so pytest does not collect TestController as a test class.
+    return test_controller.TestController(ptc, toolbelt)
+
+
+def test_run_with_jobs_runs_each_session_in_a_container(controller):
+    containers = {"base-3.11(hello)": make_container([b"ok\n"]), "other-3.12": make_container([b"failed\n"], status_code=1)}
+
+    def run_container(**kwargs):
+        if kwargs.get("remove"):
+            return NOX_LIST_OUTPUT.replace("* base-3.11(bye) -> Run the tests of bye.\n", "").encode()
+        return containers[kwargs["command"][-1]]
+
+    docker_client = MagicMock()
+    docker_client.containers.run.side_effect = run_container
+
+    with (
+        patch("pytoolbelt.cli.controllers.test_controller.docker.from_env", return_value=docker_client),
+        patch("pytoolbelt.cli.controllers.test_controller.BatchSummaryTableView") as table_view,
+        patch("pytoolbelt.core.tools.nox_runner.print_prefixed"),
+    ):
+        assert controller.run(jobs=2) == 1
+
+    results = {c.args[0].name: c.args[0] for c in table_view.return_value.add_row.call_args_list}
+    assert not results["base-3.11(hello)"].failed
+    assert results["other-3.12"].failed
+    assert results["other-3.12"].message == "nox exited with code 1"
@@ -0,0 +1,80 @@
+import shutil
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pytoolbelt.cli.controllers.ptvenv_controller import PtVenvBatchController
+from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
+from pytoolbelt.core.project.ptvenv_components import PtVenvBuilder, PtVenvConfig, PtVenvPaths
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.tools import hash_config
+
+
+@pytest.fixture
+def toolbelt_root(tmp_path, monkeypatch, write_ptvenv, init_repo):
+    monkeypatch.setattr("pytoolbelt.core.project.toolbelt_components.PYTOOLBELT_VENV_INSTALL_DIR", tmp_path / "environments")
+    root = tmp_path / "toolbelt"
+    for name in ["current", "drifted", "fresh"]:
+        write_ptvenv(root, name, "0.0.1")
+    init_repo(root)
+    return root
+
+
+def install(root, name):
+    # the files a build leaves in the install dir, without building a venv.
+    paths = PtVenvPaths(ComponentMetadata.as_ptvenv(f"{name}==0.0.1"), ToolbeltPaths(root))
+    paths.install_dir.mkdir(parents=True)
+    shutil.copy(paths.ptvenv_config_file, paths.installed_config_file)
+    paths.installed_hash_file.write_text(hash_config(PtVenvConfig.from_file(paths.ptvenv_config_file)))
+
+
+def build(root, **kwargs):
+    toolbelt = MagicMock(path=root)
+    toolbelt.name = "my-toolbelt"
+    with (
+        patch.object(PtVenvBuilder, "build") as builder_build,
+        patch("pytoolbelt.cli.controllers.ptvenv_controller.BatchSummaryTableView") as table_view,
+    ):
+        exit_code = PtVenvBatchController(toolbelt).build(force=False, jobs=2, **kwargs)
+
+    results = {c.args[0].name: c.args[0] for c in table_view.return_value.add_row.call_args_list}
+    return exit_code, results, builder_build.call_count
+
+
+def test_only_up_to_date_ptvenvs_are_skipped(toolbelt_root):
+    install(toolbelt_root, "current")
+    install(toolbelt_root, "drifted")
+    config_file = toolbelt_root / "ptvenv" / "drifted" / "drifted.yml"
+    config_file.write_text(config_file.read_text().replace("- six", "- requests"))
+
+    exit_code, results, builds = build(toolbelt_root, from_config=True)
+
+    assert exit_code == 1
+    assert builds == 1
+    assert results["current"].status == "skipped"
+    assert results["drifted"].status == "failed"
+    assert "has changed since install" in results["drifted"].message
+    assert results["fresh"].status == "success"
+
+
+def test_unreleased_ptvenvs_fail(toolbelt_root):
+    exit_code, results, builds = build(toolbelt_root, from_config=False)
+
+    assert exit_code == 1
+    assert builds == 0
+    assert all(result.failed for result in results.values())
+
+
+def test_wheel_cache_is_pruned_once_after_every_build(toolbelt_root):
+    toolbelt = MagicMock(path=toolbelt_root)
+    toolbelt.name = "my-toolbelt"
+    with (
+        patch("pytoolbelt.cli.controllers.ptvenv_controller.WheelCache") as wheel_cache,
+        patch.object(PtVenvBuilder, "build") as builder_build,
+        patch("pytoolbelt.cli.controllers.ptvenv_controller.BatchSummaryTableView"),
+    ):
+        PtVenvBatchController(toolbelt).build(force=False, from_config=True, jobs=2)
+
+    assert builder_build.call_count == 3
+    assert all(c.kwargs["prune_wheel_cache"] is False for c in builder_build.call_args_list)
+    wheel_cache.return_value.prune.assert_called_once_with()
@@ -71,3 +71,95 @@ def test_ptvenv_paths_copy_config_to_install_dir(mock_copy, mock_ptvenv_paths):
 def test_ptvenv_paths_write_to_config_file(mock_write_text, mock_ptvenv_paths, mock_ptvenv_config):
     mock_ptvenv_paths.write_to_config_file(mock_ptvenv_config)
     mock_write_text.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "requirement, name",
+    [
+        ("requests==2.32.3", "requests"),
+        ("Python_Dotenv>=1.0", "python-dotenv"),
+        ("zope.interface", "zope-interface"),
+        ("pydantic[email]~=2.7", "pydantic"),
+    ],
+)
+def test_ptvenv_builder_requirement_name(requirement, name):
+    assert PtVenvBuilder.requirement_name(requirement) == name
+
+
+def test_ptvenv_builder_incremental_base_none_when_nothing_installed(ptvenv_builder, mock_ptvenv_config):
+    ptvenv_builder.ptvenv = mock_ptvenv_config
+    with patch.object(PtVenvPaths, "get_latest_installed_version", return_value=None):
+        assert ptvenv_builder.get_incremental_base() is None
+
+
+def test_ptvenv_builder_incremental_base_none_when_same_version(ptvenv_builder, mock_ptvenv_config):
+    ptvenv_builder.ptvenv = mock_ptvenv_config
+    with patch.object(PtVenvPaths, "get_latest_installed_version", return_value=Version.parse("1.0.0")):
+        assert ptvenv_builder.get_incremental_base() is None
+
+
+def test_ptvenv_builder_relocate_scripts(ptvenv_builder, tmp_path):
+    new_install_dir = tmp_path / "1.0.0" / "venv"
+    (new_install_dir / "bin").mkdir(parents=True)
+    script = new_install_dir / "bin" / "tool"
+    script.write_text(f"#!{tmp_path}/0.9.0/venv/bin/python\nprint('hello')\n")
+    script.chmod(0o755)
+
+    with patch.object(PtVenvPaths, "install_dir", new_install_dir):
+        ptvenv_builder.relocate_scripts(tmp_path / "0.9.0" / "venv")
+
+    assert script.read_text() == f"#!{new_install_dir}/bin/python\nprint('hello')\n"
+    assert script.stat().st_mode & 0o777 == 0o755
+
+
+@pytest.mark.parametrize("requirements", [["pytest"], ["pytest==8.0", "requests"]])
+def test_ptvenv_builder_incremental_build_is_clean_when_requirements_are_removed_or_changed(ptvenv_builder, mock_ptvenv_config, requirements):
+    ptvenv_builder.ptvenv = mock_ptvenv_config.model_copy(update={"version": Version.parse("1.1.0"), "requirements": requirements})
+    base_config = mock_ptvenv_config.model_copy(update={"requirements": ["pytest", "requests"]})
+
+    with patch.object(ptvenv_builder, "get_incremental_base", return_value=(MagicMock(), base_config)), patch.object(ptvenv_builder, "run") as run:
+        assert ptvenv_builder.build_incremental() is False
+    run.assert_not_called()
+
+
+def test_ptvenv_builder_incremental_build_installs_added_requirements(ptvenv_builder, mock_ptvenv_config):
+    ptvenv_builder.ptvenv = mock_ptvenv_config.model_copy(update={"version": Version.parse("1.1.0"), "requirements": ["pytest", "requests"]})
+
+    with (
+        patch.object(ptvenv_builder, "get_incremental_base", return_value=(MagicMock(), mock_ptvenv_config)),
+        patch.object(ptvenv_builder, "remove_build_on_failure"),
+        patch.object(ptvenv_builder, "relocate_scripts"),
+        patch.object(ptvenv_builder, "run", return_value=0),
+        patch.object(ptvenv_builder, "run_install_requirements", return_value=0) as run_install_requirements,
+        patch("shutil.copytree"),
+        patch.object(PtVenvPaths, "install_version_dir", MagicMock()),
+    ):
+        assert ptvenv_builder.build_incremental() is True
+    run_install_requirements.assert_called_once_with(["requests"])
+
+
+def test_ptvenv_builder_installs_from_wheel_cache_without_pruning_it(mock_ptvenv_paths, mock_ptvenv_config):
+    wheel_cache = MagicMock()
+    wheel_cache.has.return_value = True
+    builder = PtVenvBuilder(paths=mock_ptvenv_paths, wheel_cache=wheel_cache)
+    builder.ptvenv = mock_ptvenv_config
+
+    with patch.object(builder, "run", return_value=0):
+        assert builder.run_install_requirements(["pytest"]) == 0
+    wheel_cache.touch.assert_called_once()
+    wheel_cache.prune.assert_not_called()
+
+
+def test_ptvenv_builder_build_returns_install_dir(ptvenv_builder, mock_ptvenv_config):
+    ptvenv_builder.ptvenv = mock_ptvenv_config
+
+    with (
+        patch.object(ptvenv_builder, "load_config"),
+        patch.object(ptvenv_builder, "build_clean"),
+        patch.object(ptvenv_builder, "deduplicate"),
+        patch.object(ptvenv_builder, "wheel_cache"),
+        patch.object(PtVenvPaths, "copy_config_to_install_dir"),
+        patch.object(PtVenvPaths, "copy_lock_to_install_dir"),
+        patch.object(PtVenvPaths, "installed_hash_file", MagicMock()),
+    ):
+        assert ptvenv_builder.build() == "~/.pytoolbelt/environments/mock_ptvenv/1.0.0"
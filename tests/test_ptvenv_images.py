@@ -0,0 +1,111 @@
+import tarfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docker.errors import ImageNotFound
+
+from pytoolbelt.cli.controllers import test_controller
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.project.ptvenv_lock import PtVenvLock
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.project.toolbelt_manifest import ToolbeltManifest
+from pytoolbelt.core.tools.ptvenv_images import PtVenvImageBuilder
+
+
+@pytest.fixture
+def toolbelt_root(tmp_path, write_tool, write_ptvenv):
+    root = tmp_path / "toolbelt"
+    write_ptvenv(root, "base", "0.0.1")
+    write_tool(root, "hello", "0.0.1", "base")
+    return root
+
+
+def get_ptvenv(root):
+    return ToolbeltManifest.load(ToolbeltPaths(root)).ptvenvs["base"]
+
+
+def read_context(context):
+    with tarfile.open(fileobj=context) as tar:
+        return {member.name: tar.extractfile(member).read().decode() for member in tar.getmembers()}
+
+
+def test_tag_follows_ptvenv_definition_and_base_image(toolbelt_root):
+    builder = PtVenvImageBuilder(MagicMock(), "runner:1", "sha256:one")
+    tag = builder.tag(get_ptvenv(toolbelt_root))
+
+    assert tag.startswith("pytoolbelt-test/base:")
+    assert builder.tag(get_ptvenv(toolbelt_root)) == tag
+    assert PtVenvImageBuilder(MagicMock(), "runner:1", "sha256:two").tag(get_ptvenv(toolbelt_root)) != tag
+
+    config_file = toolbelt_root / "ptvenv" / "base" / "base.yml"
+    config_file.write_text(config_file.read_text().replace("- six", "- requests"))
+    assert builder.tag(get_ptvenv(toolbelt_root)) != tag
+
+
+def test_existing_image_is_not_built_again(toolbelt_root):
+    docker_client = MagicMock()
+    tag = PtVenvImageBuilder(docker_client, "runner:1", "sha256:one").build(get_ptvenv(toolbelt_root))
+
+    docker_client.images.get.assert_called_once_with(tag)
+    docker_client.images.build.assert_not_called()
+
+
+def test_missing_image_is_built_with_ptvenv_requirements(toolbelt_root):
+    docker_client = MagicMock()
+    docker_client.images.get.side_effect = ImageNotFound("missing")
+    tag = PtVenvImageBuilder(docker_client, "runner:1", "sha256:one").build(get_ptvenv(toolbelt_root))
+
+    kwargs = docker_client.images.build.call_args.kwargs
+    assert kwargs["tag"] == tag
+    context = read_context(kwargs["fileobj"])
+    assert context["requirements.txt"] == "six\n"
+    assert context["Dockerfile"].startswith("FROM runner:1\n")
+    assert "python3.11 -m venv" in context["Dockerfile"]
+    assert "ENV PYTOOLBELT_PREBUILT_IMAGE=base" in context["Dockerfile"]
+
+
+def test_prebuilt_run_uses_ptvenv_image_per_session(toolbelt_root):
+    docker_client = MagicMock()
+    docker_client.images.get.return_value.id = "sha256:one"
+    images = []
+
+    def run_container(**kwargs):
+        if kwargs.get("remove"):
+            return b"* base-3.11(hello)\n"
+        images.append(kwargs["image"])
+        container = MagicMock()
+        container.logs.return_value = []
+        container.wait.return_value = {"StatusCode": 0}
+        return container
+
+    docker_client.containers.run.side_effect = run_container
+    toolbelt = MagicMock(path=toolbelt_root)
+    toolbelt.name = "my-toolbelt"
+    # imported through the module so pytest does not collect TestController as a test class.
+    controller = test_controller.TestController(MagicMock(test_image="runner:1"), toolbelt)
+
+    with (
+        patch("pytoolbelt.cli.controllers.test_controller.docker.from_env", return_value=docker_client),
+        patch("pytoolbelt.cli.controllers.test_controller.BatchSummaryTableView"),
+    ):
+        assert controller.run(jobs=1, use_cache=False, prebuilt=True) == 0
+
+    assert images == [PtVenvImageBuilder(docker_client, "runner:1", "sha256:one").tag(get_ptvenv(toolbelt_root))]
+
+
+@pytest.mark.parametrize("lock_platform, builds", [("linux-amd64", True), ("darwin-arm64", False)])
+def test_platform_lock_must_match_base_image(toolbelt_root, lock_platform, builds):
+    ptvenv = get_ptvenv(toolbelt_root)
+    lock = PtVenvLock(python_version="3.11", requirements_hash=PtVenvLock.hash_requirements(["six"]), pins=["six==1.16.0 --hash=sha256:aaa"])
+    lock.platform = lock_platform
+    lock.write(ptvenv.path / "base.lock")
+
+    docker_client = MagicMock()
+    docker_client.images.get.return_value.attrs = {"Os": "linux", "Architecture": "amd64"}
+    builder = PtVenvImageBuilder(docker_client, "runner:1", "sha256:one")
+
+    if builds:
+        assert "--require-hashes" in read_context(builder.get_build_context(ptvenv))["Dockerfile"]
+    else:
+        with pytest.raises(PytoolbeltError, match="can not install on linux-amd64"):
+            builder.get_build_context(ptvenv)
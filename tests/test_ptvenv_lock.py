@@ -0,0 +1,168 @@
+import json
+from pathlib import Path
+from subprocess import CompletedProcess
+from unittest.mock import MagicMock, patch
+
+import pytest
+from semver import Version
+
+from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.project.ptvenv_components import PtVenvBuilder, PtVenvConfig, PtVenvPaths
+from pytoolbelt.core.project.ptvenv_lock import PtVenvLock, lock_platform
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.tools import hash_config
+from pytoolbelt.core.tools.installers import PipInstaller, UvInstaller
+
+PINS = ["certifi==2024.2.2 --hash=sha256:aaa", "requests==2.32.3 --hash=sha256:bbb"]
+
+
+@pytest.fixture
+def config():
+    return PtVenvConfig(name="ptbase", version=Version.parse("1.0.0"), python_version="3.10", requirements=["requests==2.32.3"])
+
+
+@pytest.fixture
+def lock(config):
+    return PtVenvLock(python_version="3.10", requirements_hash=PtVenvLock.hash_requirements(config.requirements), pins=PINS)
+
+
+@pytest.fixture
+def ptvenv_paths(tmp_path, config):
+    toolbelt_paths = ToolbeltPaths(tmp_path / "toolbelt")
+    paths = PtVenvPaths(ComponentMetadata(name="ptbase", version=config.version, kind="ptvenv"), toolbelt_paths)
+    paths.ptvenv_dir.mkdir(parents=True)
+    paths.write_to_config_file(config)
+    return paths
+
+
+def test_lock_round_trip(lock):
+    assert PtVenvLock.from_text(lock.to_text()) == lock
+
+
+def test_platform_lock_round_trip(lock):
+    lock.platform = "darwin-arm64"
+    assert "# platform: darwin-arm64" in lock.to_text()
+    assert PtVenvLock.from_text(lock.to_text()) == lock
+
+
+def test_lock_platform_uses_docker_architecture_names():
+    assert lock_platform("linux", "x86_64") == lock_platform("Linux", "amd64") == "linux-amd64"
+    assert lock_platform("linux", "aarch64") == "linux-arm64"
+
+
+def test_lock_without_headers_is_invalid():
+    with pytest.raises(PytoolbeltError, match="header is missing"):
+        PtVenvLock.from_text("\n".join(PINS))
+
+
+def test_lock_is_stale_when_definition_changes(lock, config):
+    assert not lock.is_stale(config)
+    assert lock.is_stale(config.model_copy(update={"python_version": "3.12"}))
+    assert lock.is_stale(config.model_copy(update={"requirements": ["requests==2.31.0"]}))
+
+
+def test_create_lock_without_requirements_runs_nothing(config):
+    config.requirements = []
+    with patch("pytoolbelt.core.project.ptvenv_lock.run_command") as run_command:
+        lock = PtVenvLock.create(config, PipInstaller())
+    run_command.assert_not_called()
+    assert lock.pins == []
+
+
+def test_create_lock_resolves_with_installer(config):
+    report = {"install": [{"metadata": {"name": "requests", "version": "2.32.3"}, "download_info": {"archive_info": {"hashes": {"sha256": "bbb"}}}}]}
+
+    def resolve(command):
+        Path(command[command.index("--report") + 1]).write_text(json.dumps(report))
+        return CompletedProcess(command, 0)
+
+    with patch("pytoolbelt.core.project.ptvenv_lock.run_command", side_effect=resolve) as run_command:
+        lock = PtVenvLock.create(config, PipInstaller())
+
+    assert run_command.call_args.args[0][:6] == ["python3.10", "-m", "pip", "install", "--dry-run", "--ignore-installed"]
+    assert lock.pins == ["requests==2.32.3 --hash=sha256:bbb"]
+    assert lock.platform == lock_platform()
+    assert not lock.is_stale(config)
+
+
+def test_pip_installer_reads_report(tmp_path):
+    report = {
+        "install": [
+            {"metadata": {"name": "Requests", "version": "2.32.3"}, "download_info": {"archive_info": {"hashes": {"sha256": "bbb"}}}},
+            {"metadata": {"name": "certifi", "version": "2024.2.2"}, "download_info": {"archive_info": {"hash": "sha256=aaa"}}},
+        ]
+    }
+    output_file = tmp_path / "report.json"
+    output_file.write_text(json.dumps(report))
+    assert PipInstaller().read_lock_output(output_file) == PINS
+
+
+def test_pip_installer_refuses_requirements_without_hash(tmp_path):
+    report = {"install": [{"metadata": {"name": "local", "version": "0.1"}, "download_info": {"dir_info": {}}}]}
+    output_file = tmp_path / "report.json"
+    output_file.write_text(json.dumps(report))
+    with pytest.raises(PytoolbeltError, match="Unable to lock local"):
+        PipInstaller().read_lock_output(output_file)
+
+
+def test_uv_installer_reads_compiled_requirements(tmp_path):
+    output_file = tmp_path / "requirements.txt"
+    output_file.write_text("requests==2.32.3 \\\n    --hash=sha256:bbb\ncertifi==2024.2.2 \\\n    --hash=sha256:aaa\n")
+    assert UvInstaller().read_lock_output(output_file) == PINS
+
+
+def test_hash_config_covers_lock(config, lock):
+    assert hash_config(config) == hash_config(config, None)
+    assert hash_config(config) != hash_config(config, lock.to_text())
+
+
+def test_builder_installs_from_lock(ptvenv_paths, lock):
+    lock.write(ptvenv_paths.ptvenv_lock_file)
+    builder = PtVenvBuilder(ptvenv_paths, installer=PipInstaller())
+    builder.load_config()
+
+    commands = []
+
+    def run(command):
+        commands.append(command)
+        assert Path(command[-1]).read_text().splitlines() == PINS
+        return 0
+
+    with patch.object(builder, "run", side_effect=run), patch.object(builder, "run_install_requirements") as run_install_requirements:
+        builder.install_requirements()
+
+    run_install_requirements.assert_not_called()
+    assert commands[0][1:5] == ["install", "--no-deps", "--require-hashes", "-r"]
+
+
+def test_builder_refuses_stale_lock(ptvenv_paths, config, lock):
+    lock.python_version = "3.12"
+    lock.write(ptvenv_paths.ptvenv_lock_file)
+    builder = PtVenvBuilder(ptvenv_paths, installer=MagicMock())
+    with pytest.raises(PytoolbeltError, match="does not match its definition"):
+        builder.load_config()
+
+
+def test_builder_refuses_lock_of_other_platform(ptvenv_paths, lock):
+    lock.platform = "other-machine"
+    lock.write(ptvenv_paths.ptvenv_lock_file)
+    builder = PtVenvBuilder(ptvenv_paths, installer=MagicMock())
+    with pytest.raises(PytoolbeltError, match="only holds the hashes of the files for other-machine"):
+        builder.load_config()
+
+
+def test_portable_lock_has_no_platform(lock):
+    assert UvInstaller.portable_locks and not PipInstaller.portable_locks
+    lock.raise_if_wrong_platform(MagicMock(), "any-platform")
+
+
+def test_uv_lock_is_universal(tmp_path):
+    command = UvInstaller().lock_command("3.10", tmp_path / "requirements.in", tmp_path / "requirements.txt")
+    assert "--universal" in command
+
+
+def test_uv_installer_keeps_environment_markers(tmp_path):
+    output_file = tmp_path / "requirements.txt"
+    output_file.write_text("colorama==0.4.6 ; sys_platform == 'win32' \\\n    --hash=sha256:ccc\n")
+    assert UvInstaller().read_lock_output(output_file) == ["colorama==0.4.6 ; sys_platform == 'win32' --hash=sha256:ccc"]
@@ -0,0 +1,57 @@
+import pytest
+from git import Repo
+
+from pytoolbelt.core.project.release_plan import ReleasePlan
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.project.toolbelt_manifest import ToolbeltManifest
+from pytoolbelt.core.tools.git_client import GitClient
+
+
+@pytest.fixture
+def toolbelt_root(tmp_path, write_tool, write_ptvenv, init_repo):
+    root = tmp_path / "toolbelt"
+    write_ptvenv(root, "base", "0.0.1")
+    write_tool(root, "hello", "0.0.1", "base")
+    write_tool(root, "bye", "0.0.1", "base")
+    write_tool(root, "fresh", "0.0.1", "base")
+
+    repo = init_repo(root)
+    for tag in ["ptvenv-base-0.0.1", "tool-hello-0.0.1", "tool-bye-0.0.1"]:
+        repo.create_tag(tag)
+    return root
+
+
+def create_plan(root):
+    git_client = GitClient(Repo(root))
+    manifest = ToolbeltManifest.load(ToolbeltPaths(root), git_client)
+    return ReleasePlan.create(manifest, git_client)
+
+
+def statuses(plan):
+    return {entry.component.release_tag: entry.status for entry in plan.entries}
+
+
+def test_plan_of_released_toolbelt(toolbelt_root):
+    assert statuses(create_plan(toolbelt_root)) == {
+        "tool-bye-0.0.1": "unchanged",
+        "tool-fresh-0.0.1": "new",
+        "tool-hello-0.0.1": "unchanged",
+        "ptvenv-base-0.0.1": "unchanged",
+    }
+
+
+def test_plan_detects_changes_without_version_bump(toolbelt_root):
+    (toolbelt_root / "tools" / "hello" / "__main__.py").write_text("print('changed')\n")
+    plan = create_plan(toolbelt_root)
+    assert [entry.component.name for entry in plan.unbumped] == ["hello"]
+    assert [entry.component.name for entry in plan.releases] == ["fresh"]
+
+
+def test_plan_releases_bumped_components(toolbelt_root):
+    config_file = toolbelt_root / "tools" / "bye" / "config.yml"
+    config_file.write_text(config_file.read_text().replace("version: 0.0.1", "version: 0.0.2", 1))
+    plan = create_plan(toolbelt_root)
+    bye = next(entry for entry in plan.entries if entry.component.name == "bye")
+    assert bye.status == "changed"
+    assert bye.last_release == "tool-bye-0.0.1"
+    assert [entry.component.release_tag for entry in plan.releases] == ["tool-bye-0.0.2", "tool-fresh-0.0.1"]
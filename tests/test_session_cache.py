@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pytoolbelt.cli.controllers import test_controller
+from pytoolbelt.core.tools.session_cache import SessionResultCache, parse_session_name
+
+NOX_LIST_OUTPUT = b"""Sessions defined in /code/noxfile.py:
+
+* base-3.11(hello)
+* base-3.11(bye)
+
+sessions marked with * are selected, sessions marked with - are skipped.
+"""
+
+
+@pytest.mark.parametrize(
+    "session, parsed",
+    [
+        ("base-3.11(hello)", ("base", "hello")),
+        ("my-base-3.11(my-tool)", ("my-base", "my-tool")),
+        ("base-3.11", ("base", None)),
+        ("lint", None),
+    ],
+)
+def test_parse_session_name(session, parsed):
+    assert parse_session_name(session) == parsed
+
+
+def test_session_result_cache(tmp_path):
+    cache = SessionResultCache(tmp_path / "cache")
+    key = SessionResultCache.key("tool", "ptvenv", "image", "noxfile")
+    assert key != SessionResultCache.key("tool", "ptvenv", "other-image", "noxfile")
+
+    assert not cache.has(key)
+    cache.add(key, "base-3.11(hello)")
+    assert cache.has(key)
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch, write_tool, write_ptvenv, init_repo):
+    root = tmp_path / "toolbelt"
+    write_ptvenv(root, "base", "0.0.1")
+    write_tool(root, "hello", "0.0.1", "base")
+    write_tool(root, "bye", "0.0.1", "base")
+    init_repo(root, commit=False)
+
+    monkeypatch.setattr("pytoolbelt.core.tools.session_cache.PYTOOLBELT_TEST_RESULT_CACHE_DIR", tmp_path / "cache")
+    toolbelt = MagicMock(path=root)
+    toolbelt.name = "my-toolbelt"
+    # imported through the module so pytest does not collect TestController as a test class.
+    return test_controller.TestController(MagicMock(test_image="image"), toolbelt)
+
+
+def run_sessions(controller, **kwargs):
+    ran = []
+
+    def run_container(**container_kwargs):
+        if container_kwargs.get("remove"):
+            return NOX_LIST_OUTPUT
+        ran.append(container_kwargs["command"][-1])
+        container = MagicMock()
+        container.logs.return_value = [b"1 passed\n"]
+        container.wait.return_value = {"StatusCode": 0}
+        return container
+
+    docker_client = MagicMock()
+    docker_client.containers.run.side_effect = run_container
+    docker_client.images.get.return_value.id = "sha256:image"
+
+    with (
+        patch("pytoolbelt.cli.controllers.test_controller.docker.from_env", return_value=docker_client),
+        patch("pytoolbelt.cli.controllers.test_controller.BatchSummaryTableView"),
+        patch("pytoolbelt.core.tools.nox_runner.print_prefixed"),
+    ):
+        assert controller.run(jobs=2, **kwargs) == 0
+    return sorted(ran)
+
+
+def test_passed_sessions_are_served_from_cache(controller):
+    assert run_sessions(controller) == ["base-3.11(bye)", "base-3.11(hello)"]
+    assert run_sessions(controller) == []
+
+
+def test_changed_tool_runs_again(controller):
+    run_sessions(controller)
+    (controller.toolbelt_paths.tools_dir / "hello" / "__main__.py").write_text("print('changed')\n")
+    assert run_sessions(controller) == ["base-3.11(hello)"]
+
+
+def test_changed_ptvenv_runs_all_its_sessions(controller):
+    run_sessions(controller)
+    config_file = controller.toolbelt_paths.ptvenvs_dir / "base" / "base.yml"
+    config_file.write_text(config_file.read_text().replace("- six", "- requests"))
+    assert run_sessions(controller) == ["base-3.11(bye)", "base-3.11(hello)"]
+
+
+def test_no_cache_runs_every_session(controller):
+    run_sessions(controller)
+    assert run_sessions(controller, use_cache=False) == ["base-3.11(bye)", "base-3.11(hello)"]
+
+
+@pytest.mark.parametrize("harness_file", ["noxfile.py", "pytest.ini", "conftest.py", "pytoolbelt.yml"])
+def test_changed_test_harness_runs_every_session(controller, harness_file):
+    run_sessions(controller)
+    (controller.toolbelt_paths.toolbelt_dir / harness_file).write_text("# changed\n")
+    assert run_sessions(controller) == ["base-3.11(bye)", "base-3.11(hello)"]
@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+
+from pytoolbelt.core.tools.tag_index import TagIndex
+
+
+@pytest.fixture
+def repo(tmp_path, init_repo):
+    (tmp_path / "toolbelt").mkdir()
+    (tmp_path / "toolbelt" / "README.md").write_text("toolbelt")
+    repo = init_repo(tmp_path / "toolbelt")
+
+    for tag in ["tool-my_tool-0.0.1", "tool-my_tool-0.0.10", "tool-my_tool-0.0.2", "tool-my_tool-0.1.0-rc.1", "ptvenv-my_env-1.0.0", "not-a-release"]:
+        repo.create_tag(tag)
+    repo.create_tag("tool-other_tool-0.0.1", message="annotated")
+    return repo
+
+
+def test_releases_are_sorted_by_version(repo):
+    index = TagIndex(repo)
+    assert index.release_tags("tool", "my_tool") == [
+        "tool-my_tool-0.0.1",
+        "tool-my_tool-0.0.2",
+        "tool-my_tool-0.0.10",
+        "tool-my_tool-0.1.0-rc.1",
+    ]
+    assert index.release_tags("ptvenv") == ["ptvenv-my_env-1.0.0"]
+
+
+def test_latest_release_skips_prereleases(repo):
+    latest = TagIndex(repo).latest_release("tool", "my_tool")
+    assert latest.release_tag == "tool-my_tool-0.0.10"
+
+
+def test_latest_release_of_unreleased_component(repo):
+    assert TagIndex(repo).latest_release("tool", "unknown") is None
+
+
+def test_annotated_tags_index_the_tagged_commit(repo):
+    release = TagIndex(repo).get_releases("tool", "other_tool")[0]
+    assert release["sha"] == repo.head.commit.hexsha
+
+
+def test_index_is_reused_until_tags_change(repo):
+    TagIndex(repo).releases
+
+    with patch.object(TagIndex, "read_refs") as read_refs:
+        TagIndex(repo).releases
+        read_refs.assert_not_called()
+
+    repo.create_tag("tool-my_tool-0.0.11")
+    assert TagIndex(repo).latest_release("tool", "my_tool").release_tag == "tool-my_tool-0.0.11"
+
+
+def test_index_follows_packed_refs(repo):
+    TagIndex(repo).releases
+    repo.git.pack_refs("--all")
+    repo.delete_tag(repo.tags["tool-my_tool-0.0.10"])
+    assert TagIndex(repo).latest_release("tool", "my_tool").release_tag == "tool-my_tool-0.0.2"
+
+
+def test_release_refs_include_commit_date_and_tagger(repo):
+    refs = TagIndex(repo).release_refs("tool")
+    assert [ref.tag for ref in refs][-1] == "tool-other_tool-0.0.1"
+
+    commit = repo.head.commit
+    for ref in refs:
+        assert ref.sha == commit.hexsha
+        assert ref.release_date == commit.committed_datetime.date()
+
+    assert refs[0].name == "my_tool"
+    assert refs[0].tagger == ""
+    assert refs[-1].tagger == "pytoolbelt"
+
+
+def test_index_of_older_format_is_rebuilt(repo):
+    index = TagIndex(repo)
+    index.releases
+    key = index.get_key().split(":", 1)[1]
+    index.save(f"v1:{key}", {"tool": {}, "ptvenv": {}})
+    assert TagIndex(repo).release_tags("ptvenv") == ["ptvenv-my_env-1.0.0"]
+
+
+def test_invalid_release_tags_are_skipped(repo):
+    for tag in ["tool-foo.bar-1.0.0", "deploy-prod.eu-1.0.0", "tool-bad@name-1.0.0"]:
+        repo.create_tag(tag)
+
+    index = TagIndex(repo)
+    assert index.release_tags("tool", "my_tool")[-1] == "tool-my_tool-0.1.0-rc.1"
+    assert index.latest_release("tool", "my_tool").release_tag == "tool-my_tool-0.0.10"
+    assert "tool-foo.bar-1.0.0" not in index.release_tags("tool")
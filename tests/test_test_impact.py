@@ -0,0 +1,111 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pytoolbelt.cli.controllers import test_controller
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.project.toolbelt_manifest import ToolbeltManifest
+from pytoolbelt.core.tools.git_client import GitClient
+
+NOX_LIST_OUTPUT = b"""Sessions defined in /code/noxfile.py:
+
+* base-3.11(hello)
+* base-3.11(bye)
+* other-3.11(solo)
+* spare-3.11
+
+sessions marked with * are selected, sessions marked with - are skipped.
+"""
+
+
+@pytest.fixture
+def toolbelt_root(tmp_path, write_tool, write_ptvenv, init_repo):
+    root = tmp_path / "toolbelt"
+    write_ptvenv(root, "base", "0.0.1")
+    write_ptvenv(root, "other", "0.0.1")
+    write_ptvenv(root, "spare", "0.0.1")
+    write_tool(root, "hello", "0.0.1", "base")
+    write_tool(root, "bye", "0.0.1", "base")
+    write_tool(root, "solo", "0.0.1", "other")
+    init_repo(root)
+    return root
+
+
+def get_client(root):
+    return GitClient.from_path(root)
+
+
+def test_changed_paths_include_uncommitted_and_untracked_files(toolbelt_root):
+    (toolbelt_root / "tools" / "hello" / "__main__.py").write_text("print('changed')\n")
+    (toolbelt_root / "tools" / "bye" / "new.py").write_text("")
+
+    assert get_client(toolbelt_root).changed_paths("HEAD") == ["tools/bye/new.py", "tools/hello/__main__.py"]
+
+
+def test_changed_paths_unknown_ref_raises(toolbelt_root):
+    with pytest.raises(PytoolbeltError):
+        get_client(toolbelt_root).changed_paths("does-not-exist")
+
+
+def test_affected_by_includes_dependents_of_changed_ptvenv(toolbelt_root):
+    manifest = ToolbeltManifest.load(ToolbeltPaths(toolbelt_root))
+    affected = manifest.affected_by(["ptvenv/base/base.yml", "tools/hello/__main__.py", "README.md"])
+
+    assert sorted((entry.kind, entry.name) for entry in affected) == [("ptvenv", "base"), ("tool", "bye"), ("tool", "hello")]
+
+
+def run_since(root, since):
+    ran = []
+
+    def run_container(**kwargs):
+        if kwargs.get("remove"):
+            return NOX_LIST_OUTPUT
+        ran.append(kwargs["command"][-1])
+        container = MagicMock()
+        container.logs.return_value = []
+        container.wait.return_value = {"StatusCode": 0}
+        return container
+
+    docker_client = MagicMock()
+    docker_client.containers.run.side_effect = run_container
+    toolbelt = MagicMock(path=root)
+    toolbelt.name = "my-toolbelt"
+    # imported through the module so pytest does not collect TestController as a test class.
+    controller = test_controller.TestController(MagicMock(test_image="image"), toolbelt)
+
+    with (
+        patch("pytoolbelt.cli.controllers.test_controller.docker.from_env", return_value=docker_client),
+        patch("pytoolbelt.cli.controllers.test_controller.BatchSummaryTableView"),
+        patch("pytoolbelt.core.tools.nox_runner.print_prefixed"),
+    ):
+        assert controller.run(jobs=2, use_cache=False, since=since) == 0
+    return sorted(ran)
+
+
+def test_since_runs_only_sessions_of_changed_tools(toolbelt_root):
+    (toolbelt_root / "tools" / "solo" / "__main__.py").write_text("print('changed')\n")
+    assert run_since(toolbelt_root, "HEAD") == ["other-3.11(solo)"]
+
+
+def test_since_runs_sessions_of_tools_using_changed_ptvenv(toolbelt_root):
+    config_file = toolbelt_root / "ptvenv" / "base" / "base.yml"
+    config_file.write_text(config_file.read_text().replace("- six", "- requests"))
+    (toolbelt_root / "ptvenv" / "spare" / "notes.txt").write_text("")
+
+    assert run_since(toolbelt_root, "HEAD") == ["base-3.11(bye)", "base-3.11(hello)", "spare-3.11"]
+
+
+def test_since_without_changes_runs_nothing(toolbelt_root):
+    assert run_since(toolbelt_root, "HEAD") == []
+
+
+@pytest.mark.parametrize("harness_file", ["noxfile.py", "pytest.ini", "conftest.py"])
+def test_since_runs_every_session_when_test_harness_changes(toolbelt_root, harness_file):
+    (toolbelt_root / harness_file).write_text("# changed\n")
+    assert run_since(toolbelt_root, "HEAD") == ["base-3.11(bye)", "base-3.11(hello)", "other-3.11(solo)", "spare-3.11"]
+
+
+def test_since_ignores_nested_files_named_like_the_test_harness(toolbelt_root):
+    (toolbelt_root / "tools" / "solo" / "conftest.py").write_text("")
+    assert run_since(toolbelt_root, "HEAD") == ["other-3.11(solo)"]
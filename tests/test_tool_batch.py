@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pytoolbelt.cli.controllers.ptvenv_controller import PtVenvController
+from pytoolbelt.cli.controllers.tool_controller import ToolBatchController, ToolController
+from pytoolbelt.core.error_handling.exceptions import PythonEnvBuildError, PytoolbeltError
+from pytoolbelt.core.tools.git_client import TemporaryGitClient
+
+
+@pytest.fixture
+def toolbelt_root(tmp_path, monkeypatch, write_tool, write_ptvenv, init_repo):
+    monkeypatch.setattr("pytoolbelt.core.project.toolbelt_components.PYTOOLBELT_VENV_INSTALL_DIR", tmp_path / "environments")
+    root = tmp_path / "toolbelt"
+    write_ptvenv(root, "base", "0.0.1")
+    write_tool(root, "hello", "0.0.1", "base")
+    write_tool(root, "bye", "0.0.1", "base")
+    repo = init_repo(root)
+    repo.create_tag("tool-hello-0.0.1")
+    repo.create_tag("tool-bye-0.0.1")
+
+    # unreleased changes must not be installed.
+    (root / "tools" / "hello" / "__main__.py").write_text("print('unreleased')\n")
+    repo.git.add("--all")
+    repo.index.commit("unreleased")
+    return root
+
+
+def install_ptvenv(tmp_path):
+    (tmp_path / "environments" / "base" / "0.0.1" / "venv").mkdir(parents=True)
+
+
+def install(root, **kwargs):
+    installed = {}
+
+    def run_installer(controller, p, dev_mode, installer=None, mode="zipapp"):
+        if controller.meta.name == "bye":
+            raise PytoolbeltError("bye failed")
+        installed[controller.meta.name] = (installer.paths.tool_dir / "__main__.py").read_text()
+        return 0
+
+    toolbelt = MagicMock(path=root)
+    toolbelt.name = "my-toolbelt"
+    with (
+        patch.object(ToolController, "run_installer", autospec=True, side_effect=run_installer),
+        patch("pytoolbelt.cli.controllers.tool_controller.BatchSummaryTableView") as table_view,
+    ):
+        exit_code = ToolBatchController(toolbelt).install(dev_mode=False, from_config=False, jobs=2, **kwargs)
+
+    results = {c.args[0].name: c.args[0] for c in table_view.return_value.add_row.call_args_list}
+    return exit_code, results, installed
+
+
+def test_releases_are_exported_once_per_tag(toolbelt_root, tmp_path):
+    install_ptvenv(tmp_path)
+    with patch.object(TemporaryGitClient, "export", autospec=True, side_effect=TemporaryGitClient.export) as export:
+        _, _, installed = install(toolbelt_root)
+
+    assert sorted(c.args[1:] for c in export.call_args_list) == [("tool-bye-0.0.1", ["tools/bye"]), ("tool-hello-0.0.1", ["tools/hello"])]
+    assert installed == {"hello": "print('hello')\n"}
+
+
+def test_failed_tools_set_exit_code(toolbelt_root, tmp_path):
+    install_ptvenv(tmp_path)
+    exit_code, results, _ = install(toolbelt_root)
+
+    assert exit_code == 1
+    assert results["hello"].status == "success"
+    assert results["bye"].message == "bye failed"
+
+
+def test_tools_of_missing_ptvenv_fail(toolbelt_root):
+    exit_code, results, installed = install(toolbelt_root)
+
+    assert exit_code == 1
+    assert installed == {}
+    assert results["hello"].message == "ptvenv base version 0.0.1 is not installed."
+
+
+def test_tools_of_ptvenv_that_failed_to_build_fail(toolbelt_root):
+    with patch.object(PtVenvController, "build", side_effect=PythonEnvBuildError("Failed to install requirements")):
+        exit_code, results, installed = install(toolbelt_root, install_ptvenvs=True)
+
+    assert exit_code == 1
+    assert installed == {}
+    assert results["hello"].message == "ptvenv base version 0.0.1 failed to install :: Failed to install requirements"
+    assert results["bye"].failed
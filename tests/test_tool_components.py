@@ -1,8 +1,12 @@
+import subprocess
+import sys
+import zipfile
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 
+from pytoolbelt.cli.controllers.tool_controller import ToolController
 from pytoolbelt.core.data_classes.component_metadata import ComponentMetadata
 from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
 from pytoolbelt.core.project.tool_components import (
@@ -46,7 +50,7 @@ tool:
     with (
         patch("builtins.open", mock_open(read_data=yaml_content)),
         patch(
-            "yaml.safe_load",
+            "pytoolbelt.core.project.tool_components.load_yaml",
             return_value={
                 "tool": {
                     "name": "SampleTool",
@@ -232,3 +236,58 @@ def test_install(mock_symlink_to, mock_chmod, mock_open, mock_create_archive, to
     mock_symlink_to.assert_called_once()
     mock_chmod.assert_called_once_with(0o755)
     assert result == 0
+
+
+@pytest.fixture
+def real_tool_paths(tmp_path):
+    toolbelt_paths = ToolbeltPaths(tmp_path / "toolbelt")
+    paths = ToolPaths(ComponentMetadata("hello", "0.0.1", "tool"), toolbelt_paths)
+    paths.tool_code_dir.mkdir(parents=True)
+    paths.package_init_file.write_text("")
+    paths.dunder_main_file.write_text("def main():\n    print('hello from', __spec__.origin)\n    return 0\n")
+    return paths
+
+
+def test_build_rejects_unknown_install_mode(real_tool_paths, tmp_path):
+    with pytest.raises(PytoolbeltError):
+        ToolInstaller(real_tool_paths).build(sys.executable, "unknown", tmp_path / "hello", tmp_path / ".hello")
+
+
+def test_build_compiled_zipapp_holds_bytecode(real_tool_paths, tmp_path):
+    target = tmp_path / "hello"
+    ToolInstaller(real_tool_paths).build(sys.executable, "compiled", target, tmp_path / ".hello")
+
+    assert "hello/__main__.pyc" in zipfile.ZipFile(target).namelist()
+    result = subprocess.run([target], capture_output=True, text=True, check=True)
+    assert "__main__.pyc" in result.stdout
+
+
+def test_build_extracted_writes_read_only_copy_and_launcher(real_tool_paths, tmp_path):
+    target = tmp_path / "hello"
+    extract_dir = tmp_path / ".hello==0.0.1"
+    installer = ToolInstaller(real_tool_paths)
+    installer.build(sys.executable, "extracted", target, extract_dir)
+    # rebuilding the same version replaces the read-only copy
+    installer.build(sys.executable, "extracted", target, extract_dir)
+
+    assert (extract_dir / "hello").stat().st_mode & 0o777 == 0o555
+    assert (extract_dir / "hello" / "__main__.py").stat().st_mode & 0o777 == 0o444
+    assert list((extract_dir / "hello" / "__pycache__").glob("__main__.*.pyc"))
+    result = subprocess.run([target], capture_output=True, text=True, check=True)
+    assert extract_dir.as_posix() in result.stdout
+    installer.remove_extracted(extract_dir)
+    assert not extract_dir.exists()
+
+
+def test_remove_deletes_read_only_extracted_copy(real_tool_paths, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    real_tool_paths.install_path.parent.mkdir(parents=True)
+    ToolInstaller(real_tool_paths).install(sys.executable, mode="extracted")
+    extract_dir = real_tool_paths.extracted_install_dir
+    assert extract_dir.is_dir()
+
+    toolbelt = MagicMock(path=tmp_path / "toolbelt")
+    assert ToolController(real_tool_paths.meta, toolbelt, paths=real_tool_paths).remove() == 0
+
+    assert not real_tool_paths.install_path.exists()
+    assert not extract_dir.exists()
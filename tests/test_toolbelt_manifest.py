@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+
+from pytoolbelt.core.project.toolbelt_components import ToolbeltPaths
+from pytoolbelt.core.project.toolbelt_manifest import ToolbeltManifest
+from pytoolbelt.core.tools.git_client import GitClient
+
+
+@pytest.fixture
+def toolbelt_root(tmp_path, write_tool, write_ptvenv):
+    root = tmp_path / "toolbelt"
+    write_ptvenv(root, "base", "0.0.1")
+    write_ptvenv(root, "other", "0.0.2")
+    write_tool(root, "hello", "0.0.1", "base")
+    write_tool(root, "bye", "0.1.0", "base")
+    write_tool(root, "lonely", "1.0.0", "other")
+    (root / "tools" / ".gitkeep").touch()
+    return root
+
+
+@pytest.fixture
+def git_client(toolbelt_root, init_repo):
+    return GitClient(init_repo(toolbelt_root))
+
+
+def test_scan_finds_components_and_dependencies(toolbelt_root):
+    manifest = ToolbeltManifest.scan(ToolbeltPaths(toolbelt_root))
+    assert list(manifest.tools) == ["bye", "hello", "lonely"]
+    assert list(manifest.ptvenvs) == ["base", "other"]
+    assert manifest.dependency_graph == {"base": ["bye", "hello"], "other": ["lonely"]}
+    assert manifest.ptvenv_of("lonely").name == "other"
+    assert [c.release_tag for c in manifest.components] == [
+        "tool-bye-0.1.0",
+        "tool-hello-0.0.1",
+        "tool-lonely-1.0.0",
+        "ptvenv-base-0.0.1",
+        "ptvenv-other-0.0.2",
+    ]
+
+
+def test_scan_without_git_has_no_content_hashes(toolbelt_root):
+    manifest = ToolbeltManifest.load(ToolbeltPaths(toolbelt_root))
+    assert all(c.content_hash is None for c in manifest.components)
+
+
+def test_content_hashes_are_git_tree_ids(toolbelt_root, git_client):
+    manifest = ToolbeltManifest.load(ToolbeltPaths(toolbelt_root), git_client)
+    assert manifest.tools["hello"].content_hash == git_client.repo.git.rev_parse("HEAD:tools/hello")
+    assert manifest.ptvenvs["base"].content_hash == git_client.repo.git.rev_parse("HEAD:ptvenv/base")
+
+
+def test_content_hash_includes_uncommitted_changes(toolbelt_root, git_client):
+    (toolbelt_root / "tools" / "hello" / "__main__.py").write_text("print('changed')\n")
+    manifest = ToolbeltManifest.load(ToolbeltPaths(toolbelt_root), git_client)
+    assert manifest.tools["hello"].content_hash != git_client.repo.git.rev_parse("HEAD:tools/hello")
+    assert manifest.tools["bye"].content_hash == git_client.repo.git.rev_parse("HEAD:tools/bye")
+    assert not git_client.repo.is_dirty(index=True, working_tree=False)
+
+
+def test_cached_manifest_is_reused_until_the_tree_changes(toolbelt_root, git_client, write_tool):
+    paths = ToolbeltPaths(toolbelt_root)
+    ToolbeltManifest.load(paths, git_client)
+
+    with patch.object(ToolbeltManifest, "scan", wraps=ToolbeltManifest.scan) as mock_scan:
+        cached = ToolbeltManifest.load(paths, git_client)
+        mock_scan.assert_not_called()
+        assert cached.tools["bye"].config.ptvenv.name == "base"
+        assert str(cached.ptvenvs["other"].version) == "0.0.2"
+
+        write_tool(toolbelt_root, "new", "0.0.1", "other")
+        manifest = ToolbeltManifest.load(paths, git_client)
+        mock_scan.assert_called_once()
+    assert "new" in manifest.tools
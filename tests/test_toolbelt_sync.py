@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+import pytest
+from git import Repo
+
+from pytoolbelt.cli.controllers.toolbelt_controller import ToolbeltController
+from pytoolbelt.core.data_classes.toolbelt_config import ToolbeltConfig, ToolbeltConfigs
+from pytoolbelt.core.error_handling.exceptions import PytoolbeltError
+from pytoolbelt.core.tools.batch import BatchResult
+from pytoolbelt.core.tools.git_client import GitClient
+
+
+def commit(root, path, content):
+    (root / path).parent.mkdir(parents=True, exist_ok=True)
+    (root / path).write_text(content)
+    repo = Repo(root)
+    repo.index.add([path])
+    repo.index.commit(f"update {path}")
+
+
+@pytest.fixture
+def remotes(tmp_path, init_repo):
+    roots = []
+    for name in ["alpha-toolbelt", "beta-toolbelt"]:
+        root = tmp_path / "remotes" / name
+        init_repo(root, commit=False, initial_branch="main")
+        commit(root, "tools/hello/__main__.py", "v1")
+        roots.append(root)
+    return roots
+
+
+def toolbelt_config(remote, tmp_path):
+    return ToolbeltConfig(url=remote.as_uri(), owner="owner", name=remote.name, path=tmp_path / "toolbelts" / remote.name)
+
+
+def sync(toolbelts, **kwargs):
+    configs = ToolbeltConfigs(repos={toolbelt.name: toolbelt for toolbelt in toolbelts})
+    with (
+        patch.object(ToolbeltConfigs, "load", return_value=configs),
+        patch.object(ToolbeltConfigs, "save"),
+        patch("pytoolbelt.cli.controllers.toolbelt_controller.BatchSummaryTableView.add_row") as add_row,
+        patch("pytoolbelt.cli.controllers.toolbelt_controller.BatchSummaryTableView.print_table"),
+    ):
+        exit_code = ToolbeltController().sync(jobs=2, **kwargs)
+    results = {call.args[0].name: call.args[0] for call in add_row.call_args_list}
+    assert all(isinstance(result, BatchResult) for result in results.values())
+    return exit_code, results
+
+
+def test_sync_clones_missing_toolbelts(remotes, tmp_path):
+    toolbelts = [toolbelt_config(remote, tmp_path) for remote in remotes]
+    exit_code, results = sync(toolbelts)
+
+    assert exit_code == 0
+    assert all(result.message.startswith("cloned") for result in results.values())
+    for toolbelt in toolbelts:
+        assert (toolbelt.path / "tools/hello/__main__.py").read_text() == "v1"
+
+
+def test_sync_fast_forwards_existing_toolbelts(remotes, tmp_path):
+    toolbelts = [toolbelt_config(remote, tmp_path) for remote in remotes]
+    sync(toolbelts)
+    commit(remotes[0], "tools/hello/__main__.py", "v2")
+
+    exit_code, results = sync(toolbelts)
+
+    assert exit_code == 0
+    assert results["alpha-toolbelt"].message.startswith("fast-forwarded")
+    assert results["beta-toolbelt"].message == "up to date"
+    assert (toolbelts[0].path / "tools/hello/__main__.py").read_text() == "v2"
+
+
+def test_sync_slow_remote_does_not_block_the_others(remotes, tmp_path):
+    toolbelts = [toolbelt_config(remote, tmp_path) for remote in remotes]
+    sync(toolbelts)
+    # the remote of alpha never answers, its git commands are killed once the timeout is reached.
+    Repo(toolbelts[0].path).git.config("remote.origin.uploadpack", "exec sleep 30 #")
+    commit(remotes[1], "tools/hello/__main__.py", "v2")
+
+    exit_code, results = sync(toolbelts, timeout=0.5)
+
+    assert exit_code == 1
+    assert results["alpha-toolbelt"].failed
+    assert "Timeout" in results["alpha-toolbelt"].message
+    assert results["alpha-toolbelt"].duration < 10
+    assert results["beta-toolbelt"].message.startswith("fast-forwarded")
+
+
+def test_sync_does_not_clone_over_existing_files(remotes, tmp_path):
+    toolbelt = toolbelt_config(remotes[0], tmp_path)
+    toolbelt.path.mkdir(parents=True)
+    (toolbelt.path / "notes.txt").write_text("mine")
+
+    exit_code, results = sync([toolbelt])
+
+    assert exit_code == 1
+    assert "is not a git repo" in results["alpha-toolbelt"].message
+
+
+def test_fast_forward_refuses_diverged_branch(remotes, tmp_path, init_repo):
+    toolbelt = toolbelt_config(remotes[0], tmp_path)
+    sync([toolbelt])
+    commit(remotes[0], "tools/hello/__main__.py", "remote")
+    init_repo(toolbelt.path, commit=False)
+    commit(toolbelt.path, "tools/hello/__main__.py", "local")
+
+    git_client = GitClient.from_path(toolbelt.path)
+    git_client.fetch(ttl=0)
+    with pytest.raises(PytoolbeltError, match="Unable to fast-forward"):
+        git_client.fast_forward()
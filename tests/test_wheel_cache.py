@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from pytoolbelt.core.tools.wheel_cache import WheelCache
+
+
+@pytest.fixture
+def wheel_cache(tmp_path):
+    return WheelCache(root=tmp_path / "wheels", max_size=100)
+
+
+def populate(wheel_cache, key, size, last_used):
+    staging_dir = wheel_cache.create_staging_dir(key)
+    (staging_dir / f"{key}-1.0.0-py3-none-any.whl").write_bytes(b"x" * size)
+    wheel_cache.commit(key, staging_dir)
+    os.utime(wheel_cache.entry_dir(key) / WheelCache.COMPLETE_MARKER, (last_used, last_used))
+
+
+def test_get_key_ignores_requirement_order():
+    assert WheelCache.get_key("3.10", ["a==1", "b==2"]) == WheelCache.get_key("3.10", ["b==2", "a==1"])
+
+
+def test_get_key_depends_on_python_version():
+    assert WheelCache.get_key("3.10", ["a==1"]) != WheelCache.get_key("3.11", ["a==1"])
+
+
+def test_commit_makes_entry_available(wheel_cache):
+    assert not wheel_cache.has("key")
+    populate(wheel_cache, "key", 10, 1000)
+    assert wheel_cache.has("key")
+    assert wheel_cache.entries()[0].wheels == 1
+
+
+def test_discarded_staging_dir_is_not_an_entry(wheel_cache):
+    staging_dir = wheel_cache.create_staging_dir("key")
+    wheel_cache.discard(staging_dir)
+    assert not wheel_cache.has("key")
+    assert wheel_cache.entries() == []
+
+
+def test_commit_keeps_existing_entry(wheel_cache):
+    populate(wheel_cache, "key", 10, 1000)
+    staging_dir = wheel_cache.create_staging_dir("key")
+    wheel_cache.commit("key", staging_dir)
+    assert not staging_dir.exists()
+    assert wheel_cache.has("key")
+
+
+def test_prune_evicts_least_recently_used_entries(wheel_cache):
+    populate(wheel_cache, "oldest", 60, 1000)
+    populate(wheel_cache, "middle", 30, 2000)
+    populate(wheel_cache, "newest", 30, 3000)
+
+    evicted = wheel_cache.prune()
+
+    assert [entry.key for entry in evicted] == ["oldest"]
+    assert not wheel_cache.has("oldest")
+    assert wheel_cache.has("middle") and wheel_cache.has("newest")
+
+
+def test_prune_to_zero_empties_cache(wheel_cache):
+    populate(wheel_cache, "a", 10, 1000)
+    populate(wheel_cache, "b", 10, 2000)
+    wheel_cache.prune(max_size=0)
+    assert wheel_cache.entries() == []